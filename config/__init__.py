@@ -1 +1,2 @@
-from config.experiment_config import ExperimentConfig
+from config.experiment_config import ExperimentConfig, FULL_BEAM_SEGMENTS, COARSE_BEAM_SEGMENTS, DEFAULT_TIMESTEP, FINE_FIDELITY, COARSE_FIDELITY
+from config.load_profile import LoadProfile, LOAD_PROFILES, create_load_profile
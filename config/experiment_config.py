@@ -1,6 +1,16 @@
 from dataclasses import dataclass
 from warnings import warn
 
+# Number of beam elements each strand segment (between two layers) is discretized into.
+# Coarse runs are much cheaper to solve and are used to screen a sweep before confirming at full resolution.
+FULL_BEAM_SEGMENTS = 10
+COARSE_BEAM_SEGMENTS = 3
+
+DEFAULT_TIMESTEP = 0.01
+
+FINE_FIDELITY = "fine"
+COARSE_FIDELITY = "coarse"
+
 @dataclass
 class ExperimentConfig:
 	experiment_id: int
@@ -12,12 +22,22 @@ class ExperimentConfig:
 	force_in_z_direction: float = 0.0
 	torsional_force: float = 0.0
 
+	num_beam_segments: int = FULL_BEAM_SEGMENTS
+	timestep: float = DEFAULT_TIMESTEP
+
 	is_non_experiment_run: bool = False
+	is_stiffness_run: bool = False
+	is_probe_run: bool = False  # headless pre-flight run, returns its result instead of storing it
+	store_results: bool = True  # False returns the experiment record instead of inserting it
 	run_forever: bool = False
 	will_visualize: bool = False
 	will_record_video: bool = False
 
 
+	@property
+	def fidelity(self):
+		return FINE_FIDELITY if self.num_beam_segments >= FULL_BEAM_SEGMENTS else COARSE_FIDELITY
+
 	def __post_init__(self):
 		if self.force_in_y_direction > 0:
 			warn("⚠️: force_in_y_direction is positive which means that it puts upwards against gravity. Are you sure? ⚠️")
@@ -0,0 +1,178 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+STEP_PROFILE = "step"
+RAMP_PROFILE = "ramp"
+CYCLIC_PROFILE = "cyclic"
+HOLD_RELEASE_PROFILE = "hold_release"
+
+LOAD_PROFILES = (STEP_PROFILE, RAMP_PROFILE, CYCLIC_PROFILE, HOLD_RELEASE_PROFILE)
+
+# Width of the "instant" transitions of step-like schedules. The breakpoints are linearly
+# interpolated, so two points are needed for a jump. This is far below the simulation timestep.
+INSTANT_TRANSITION_SECONDS = 1e-6
+
+
+@dataclass
+class LoadProfile:
+	"""
+	Time schedule that scales the nodal forces of an experiment (scale 1.0 = full force).
+
+	The schedule is expressed as piecewise-linear breakpoints (time, scale), which is what
+	Chrono's ChFunctionInterp evaluates natively inside the solver.
+
+	- step:         full force from `start_seconds` and onwards
+	- ramp:         linear increase from 0 to full force over `ramp_seconds`, then hold
+	- hold_release: full force until `release_after_seconds`, then no force
+	- cyclic:       `num_cycles` load/unload cycles of `cycle_period_seconds` each.
+	                Every cycle ramps up, holds, ramps down and rests for equal parts of the period.
+	                Cycle i peaks at `cycle_amplitudes[i % len(cycle_amplitudes)]` of the full force.
+	"""
+	kind: str = STEP_PROFILE
+	start_seconds: float = 0.0
+	ramp_seconds: float = 0.0
+	release_after_seconds: Optional[float] = None
+	cycle_period_seconds: float = 1.0
+	num_cycles: int = 1
+	cycle_amplitudes: List[float] = field(default_factory=lambda: [1.0])
+
+	def validate(self):
+		errors = []
+		if self.kind not in LOAD_PROFILES:
+			errors.append(f"Load profile must be one of: {', '.join(LOAD_PROFILES)}.")
+		if self.start_seconds < 0:
+			errors.append("Load profile start must not be negative.")
+		if self.ramp_seconds is not None and self.ramp_seconds < 0:
+			errors.append("Load ramp seconds must not be negative.")
+		if self.kind == HOLD_RELEASE_PROFILE and self.release_after_seconds is None:
+			errors.append("A hold_release load profile needs 'reset_force_after_seconds'.")
+		if self.kind == CYCLIC_PROFILE:
+			if self.cycle_period_seconds is None or self.cycle_period_seconds <= 0:
+				errors.append("A cyclic load profile needs a cycle period greater than 0.")
+			if self.num_cycles is None or self.num_cycles < 1:
+				errors.append("A cyclic load profile needs at least 1 cycle.")
+			elif self.cycle_period_seconds and 2 * self._cycle_ramp_seconds() > self.cycle_period_seconds:
+				errors.append("The load ramps of a cycle must fit within the cycle period.")
+			if not self.cycle_amplitudes or any(amplitude <= 0 for amplitude in self.cycle_amplitudes):
+				errors.append("Cycle amplitudes must be positive fractions of the applied force.")
+		return errors
+
+	@property
+	def release_seconds(self):
+		"""Time from which the structure is permanently unloaded, None if the load is never removed"""
+		if self.kind == HOLD_RELEASE_PROFILE:
+			return self.release_after_seconds
+		if self.kind == CYCLIC_PROFILE:
+			return self.start_seconds + self.num_cycles * self.cycle_period_seconds
+		return None
+
+	def cycle_amplitude(self, cycle_index):
+		return self.cycle_amplitudes[cycle_index % len(self.cycle_amplitudes)]
+
+	def cycle_bounds(self, cycle_index):
+		"""(start, end) time of a load/unload cycle of a cyclic profile"""
+		cycle_start = self.start_seconds + cycle_index * self.cycle_period_seconds
+		return cycle_start, cycle_start + self.cycle_period_seconds
+
+	def cycle_index_at(self, time_seconds):
+		"""Index of the cycle running at the given time, None outside of the cycles"""
+		if self.kind != CYCLIC_PROFILE or time_seconds < self.start_seconds:
+			return None
+		cycle_index = int((time_seconds - self.start_seconds) // self.cycle_period_seconds)
+		return cycle_index if cycle_index < self.num_cycles else None
+
+	def breakpoints(self) -> List[Tuple[float, float]]:
+		if self.kind == RAMP_PROFILE:
+			points = self._ramp_breakpoints()
+		elif self.kind == HOLD_RELEASE_PROFILE:
+			points = self._hold_release_breakpoints()
+		elif self.kind == CYCLIC_PROFILE:
+			points = self._cyclic_breakpoints()
+		else:
+			points = self._step_breakpoints()
+		return _deduplicate_breakpoints(points)
+
+	def scale_at(self, time_seconds):
+		"""Evaluate the schedule in Python, with the same semantics as the native interpolation"""
+		points = self.breakpoints()
+		if time_seconds <= points[0][0]:
+			return points[0][1]
+		for (t0, s0), (t1, s1) in zip(points, points[1:]):
+			if time_seconds <= t1:
+				return s0 + (s1 - s0) * (time_seconds - t0) / (t1 - t0)
+		return points[-1][1]
+
+	def _step_breakpoints(self):
+		if self.start_seconds <= 0:
+			return [(0.0, 1.0)]
+		return [(0.0, 0.0), (self.start_seconds, 0.0), (self.start_seconds + INSTANT_TRANSITION_SECONDS, 1.0)]
+
+	def _ramp_breakpoints(self):
+		ramp = max(self.ramp_seconds or 0.0, INSTANT_TRANSITION_SECONDS)
+		return [(0.0, 0.0), (self.start_seconds, 0.0), (self.start_seconds + ramp, 1.0)]
+
+	def _hold_release_breakpoints(self):
+		points = self._step_breakpoints()
+		release = max(self.release_after_seconds, points[-1][0])
+		return points + [(release, 1.0), (release + INSTANT_TRANSITION_SECONDS, 0.0)]
+
+	def _cycle_ramp_seconds(self):
+		if self.ramp_seconds:
+			return self.ramp_seconds
+		return self.cycle_period_seconds / 4
+
+	def _cyclic_breakpoints(self):
+		ramp = max(self._cycle_ramp_seconds(), INSTANT_TRANSITION_SECONDS)
+		plateau = (self.cycle_period_seconds - 2 * ramp) / 2
+
+		points = [(0.0, 0.0)]
+		for cycle in range(self.num_cycles):
+			cycle_start, _ = self.cycle_bounds(cycle)
+			amplitude = self.cycle_amplitude(cycle)
+			points.append((cycle_start, 0.0))
+			points.append((cycle_start + ramp, amplitude))
+			points.append((cycle_start + ramp + plateau, amplitude))
+			points.append((cycle_start + 2 * ramp + plateau, 0.0))
+
+		return points
+
+
+def _deduplicate_breakpoints(points):
+	deduplicated = []
+	for time_seconds, scale in points:
+		if deduplicated and time_seconds <= deduplicated[-1][0]:
+			deduplicated[-1] = (deduplicated[-1][0], scale)
+			continue
+		deduplicated.append((time_seconds, scale))
+	return deduplicated
+
+
+def parse_cycle_amplitudes(cycle_amplitudes):
+	"""Parse a comma separated list of amplitudes such as "0.25, 0.5, 1.0" """
+	if not cycle_amplitudes:
+		return [1.0]
+	try:
+		return [float(amplitude) for amplitude in str(cycle_amplitudes).split(",") if amplitude.strip()]
+	except ValueError:
+		return []
+
+
+def create_load_profile(experiment_series):
+	"""
+	Build the load profile of an experiment series.
+
+	Series without an explicit profile keep the original behaviour: the force is applied
+	from the start and, if 'reset_force_after_seconds' is set, removed at that time.
+	"""
+	kind = experiment_series.load_profile
+	if not kind:
+		kind = HOLD_RELEASE_PROFILE if experiment_series.reset_force_after_seconds is not None else STEP_PROFILE
+
+	return LoadProfile(
+		kind=kind,
+		ramp_seconds=experiment_series.load_ramp_seconds or 0.0,
+		release_after_seconds=experiment_series.reset_force_after_seconds,
+		cycle_period_seconds=experiment_series.load_cycle_period_seconds if experiment_series.load_cycle_period_seconds is not None else 1.0,
+		num_cycles=experiment_series.num_load_cycles if experiment_series.num_load_cycles is not None else 1,
+		cycle_amplitudes=parse_cycle_amplitudes(experiment_series.load_cycle_amplitudes),
+	)
@@ -20,7 +20,7 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 from database.models.base import Base
 # Import all models to ensure Alembic autogeneration detects them
-from database.models import experiment_model, experiment_series_model
+from database.models import experiment_model, experiment_series_model, experiment_cycle_model, experiment_job_model, simulation_cache_model, series_summary_model, data_version_model
 
 target_metadata = Base.metadata
 
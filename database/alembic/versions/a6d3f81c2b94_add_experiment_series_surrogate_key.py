@@ -0,0 +1,131 @@
+"""add experiment series surrogate key
+
+Revision ID: a6d3f81c2b94
+Revises: f38c2a6b9d15
+Create Date: 2026-10-19 18:02:13.514630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3f81c2b94'
+down_revision: Union[str, None] = 'f38c2a6b9d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Reflected foreign keys are unnamed in SQLite, named here so batch mode can replace them
+naming_convention = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+}
+
+
+def _other_columns(table_name, excluded):
+    """Reflected columns, so the rebuilt tables keep every column the database has at this revision"""
+    columns = sa.inspect(op.get_bind()).get_columns(table_name)
+    return [column for column in columns if column['name'] not in excluded]
+
+
+def _copy(columns):
+    return [sa.Column(column['name'], column['type'], nullable=column['nullable']) for column in columns]
+
+
+def _names(columns, prefix=''):
+    return ', '.join(f"{prefix}{column['name']}" for column in columns)
+
+
+def upgrade() -> None:
+    # SQLite cannot change a primary key in place: the tables are rebuilt and swapped in
+    series_columns = _other_columns('experiment_series', ['experiment_series_name'])
+    experiment_columns = _other_columns('experiments', ['id', 'experiment_id', 'experiment_series_name'])
+
+    op.create_table('experiment_series_new',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('experiment_series_name', sa.String(), nullable=False),
+        *_copy(series_columns),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('experiment_series_name')
+    )
+    op.execute(f"""
+        INSERT INTO experiment_series_new (experiment_series_name, {_names(series_columns)})
+        SELECT experiment_series_name, {_names(series_columns)} FROM experiment_series ORDER BY experiment_series_name
+    """)
+
+    op.create_table('experiments_new',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('experiment_id', sa.Integer(), autoincrement=False, nullable=True),
+        sa.Column('experiment_series_id', sa.Integer(), nullable=False),
+        *_copy(experiment_columns),
+        sa.ForeignKeyConstraint(['experiment_series_id'], ['experiment_series.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('experiment_series_id', 'experiment_id', name='uq_experiments_series_experiment_id')
+    )
+    op.execute(f"""
+        INSERT INTO experiments_new (id, experiment_id, experiment_series_id, {_names(experiment_columns)})
+        SELECT experiments.id, experiments.experiment_id, experiment_series_new.id, {_names(experiment_columns, 'experiments.')}
+        FROM experiments JOIN experiment_series_new ON experiment_series_new.experiment_series_name = experiments.experiment_series_name
+    """)
+
+    op.drop_table('experiments')
+    op.drop_table('experiment_series')
+    op.rename_table('experiment_series_new', 'experiment_series')
+    op.rename_table('experiments_new', 'experiments')
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_index(op.f('ix_experiment_series_group_name'), 'experiment_series', ['group_name'], unique=False)
+    op.create_index(op.f('ix_experiments_config_fingerprint'), 'experiments', ['config_fingerprint'], unique=False)
+    # Jobs still reference the series by name, they follow a rename
+    with op.batch_alter_table('experiment_jobs', recreate='always', naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_experiment_jobs_experiment_series_name_experiment_series', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'fk_experiment_jobs_experiment_series_name_experiment_series', 'experiment_series',
+            ['experiment_series_name'], ['experiment_series_name'], onupdate='CASCADE'
+        )
+    # ### end Alembic commands ###
+
+
+def downgrade() -> None:
+    series_columns = _other_columns('experiment_series', ['id', 'experiment_series_name'])
+    experiment_columns = _other_columns('experiments', ['id', 'experiment_id', 'experiment_series_id'])
+
+    with op.batch_alter_table('experiment_jobs', recreate='always', naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_experiment_jobs_experiment_series_name_experiment_series', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'fk_experiment_jobs_experiment_series_name_experiment_series', 'experiment_series',
+            ['experiment_series_name'], ['experiment_series_name']
+        )
+
+    op.create_table('experiment_series_old',
+        sa.Column('experiment_series_name', sa.String(), nullable=False),
+        *_copy(series_columns),
+        sa.PrimaryKeyConstraint('experiment_series_name'),
+        sa.UniqueConstraint('experiment_series_name')
+    )
+    op.execute(f"""
+        INSERT INTO experiment_series_old (experiment_series_name, {_names(series_columns)})
+        SELECT experiment_series_name, {_names(series_columns)} FROM experiment_series
+    """)
+
+    op.create_table('experiments_old',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('experiment_id', sa.Integer(), autoincrement=False, nullable=True),
+        sa.Column('experiment_series_name', sa.String(), nullable=False),
+        *_copy(experiment_columns),
+        sa.ForeignKeyConstraint(['experiment_series_name'], ['experiment_series.experiment_series_name'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('experiment_series_name', 'experiment_id', name='uq_experiments_series_experiment_id')
+    )
+    op.execute(f"""
+        INSERT INTO experiments_old (id, experiment_id, experiment_series_name, {_names(experiment_columns)})
+        SELECT experiments.id, experiments.experiment_id, experiment_series.experiment_series_name, {_names(experiment_columns, 'experiments.')}
+        FROM experiments JOIN experiment_series ON experiment_series.id = experiments.experiment_series_id
+    """)
+
+    op.drop_table('experiments')
+    op.drop_table('experiment_series')
+    op.rename_table('experiment_series_old', 'experiment_series')
+    op.rename_table('experiments_old', 'experiments')
+    op.create_index(op.f('ix_experiments_config_fingerprint'), 'experiments', ['config_fingerprint'], unique=False)
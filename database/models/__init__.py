@@ -1,2 +1,7 @@
 from database.models.experiment_series_model import ExperimentSeries
 from database.models.experiment_model import Experiment
+from database.models.experiment_cycle_model import ExperimentCycle
+from database.models.experiment_job_model import ExperimentJob
+from database.models.simulation_cache_model import SimulationCacheEntry
+from database.models.series_summary_model import SeriesSummary
+from database.models.data_version_model import DataVersion
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, DateTime
+from database.models.base import Base
+from datetime import datetime
+
+class DataVersion(Base):
+	"""
+	Single row counter bumped in the same transaction as every change to the experiments or the
+	series, so in-memory copies of the data (see experiment_dataset_queries.py) know when to reload.
+	"""
+	__tablename__ = 'data_version'
+
+	id = Column(Integer, primary_key=True)
+	version = Column(Integer, default=0, nullable=False)
+	updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
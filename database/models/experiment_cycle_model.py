@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Float, Integer, ForeignKey
+from database.models.base import Base
+
+class ExperimentCycle(Base):
+	"""One load/unload cycle of an experiment run with a cyclic load profile"""
+	__tablename__ = 'experiment_cycles'
+
+	id = Column(Integer, primary_key=True, autoincrement=True)
+	experiment_row_id = Column(Integer, ForeignKey('experiments.id', ondelete='CASCADE'), nullable=False, index=True)
+
+	cycle_index = Column(Integer, nullable=False)
+	amplitude = Column(Float)  # fraction of the experiment force reached in this cycle
+	peak_force = Column(Float)  # total vertical force at the peak of the cycle (N)
+
+	min_height = Column(Float)
+	peak_compression = Column(Float)  # height at the start of the experiment - min_height (m)
+	residual_height = Column(Float)  # height at the end of the cycle, after unloading and resting
+	dissipated_energy = Column(Float)  # area of the force/displacement hysteresis loop (J)
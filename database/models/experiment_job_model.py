@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Float, Integer, String, Text, DateTime, ForeignKey, Index
+from database.models.base import Base
+from datetime import datetime
+
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+
+class ExperimentJob(Base):
+	"""
+	One experiment of a campaign waiting to be run by a job worker (see experiments/job_worker.py).
+
+	A worker claims a job by taking a lease on it and keeps the lease alive with heartbeats.
+	A job whose lease expired (the worker died or lost its host) can be claimed again.
+	"""
+	__tablename__ = 'experiment_jobs'
+
+	id = Column(Integer, primary_key=True, autoincrement=True)
+	campaign_id = Column(String, nullable=False, index=True)
+
+	experiment_series_name = Column(String, ForeignKey('experiment_series.experiment_series_name', onupdate='CASCADE'), nullable=False)
+	experiment_id = Column(Integer, nullable=False)
+	config_json = Column(Text, nullable=False)  # the ExperimentConfig of the experiment
+	priority = Column(Float, default=0.0)  # estimated cost, the longest jobs are claimed first
+
+	status = Column(String, default=JOB_PENDING, nullable=False)
+	attempts = Column(Integer, default=0, nullable=False)
+	worker_id = Column(String)
+	lease_expires_at = Column(DateTime)
+	heartbeat_at = Column(DateTime)
+	error = Column(Text)
+
+	created_at = Column(DateTime, default=datetime.utcnow)
+	finished_at = Column(DateTime)
+
+	__table_args__ = (
+		Index('ix_experiment_jobs_status_priority', 'status', 'priority'),
+	)
@@ -1,7 +1,32 @@
-from sqlalchemy import Column, Float, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Float, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, event, select
+from sqlalchemy.ext.hybrid import hybrid_property, Comparator
+from sqlalchemy.orm import relationship
 from database.models.base import Base
+from database.models.experiment_series_model import ExperimentSeries
 from datetime import datetime
 
+
+def _experiment_series_id(experiment_series_name):
+	return select(ExperimentSeries.id).where(ExperimentSeries.experiment_series_name == experiment_series_name).scalar_subquery()
+
+
+class ExperimentSeriesNameComparator(Comparator):
+	"""
+	Filters by name resolve the series id once (uncorrelated subquery), so they use the
+	(experiment_series_id, experiment_id) index instead of looking up the name of every row
+	"""
+
+	def __eq__(self, other):
+		return Experiment.experiment_series_id == _experiment_series_id(other)
+
+	def __ne__(self, other):
+		return Experiment.experiment_series_id != _experiment_series_id(other)
+
+	def in_(self, other):
+		return Experiment.experiment_series_id.in_(
+			select(ExperimentSeries.id).where(ExperimentSeries.experiment_series_name.in_(other))
+		)
+
 class Experiment(Base):
 	__tablename__ = 'experiments'
 
@@ -11,7 +36,10 @@ class Experiment(Base):
 	# since the experiments are parallelized, they end up saved out of order otherwise.
 	experiment_id = Column(Integer, primary_key=False, autoincrement=False)
 
-	experiment_series_name = Column(String, ForeignKey('experiment_series.experiment_series_name'), nullable=False)
+	experiment_series_id = Column(Integer, ForeignKey('experiment_series.id', ondelete='CASCADE'), nullable=False)
+	# Loaded on access, not joined into every experiment query (the series table is wide), the
+	# experiments of a series share one loaded series through the identity map
+	series = relationship(ExperimentSeries, lazy='select')
 	timestamp = Column(DateTime, default=datetime.utcnow)
 
 	# Force applied
@@ -35,3 +63,45 @@ class Experiment(Base):
 	height_under_load = Column(Float)
 	# while this is the height after the load and the force is removed
 	final_height = Column(Float)
+
+	# Mesh resolution the experiment was solved at (beam elements per strand segment)
+	num_beam_segments = Column(Integer, default=10)
+	fidelity = Column(String, default='fine')  # 'coarse' screening run or 'fine' (full resolution)
+
+	# Hash of every input that affects the physics (see experiments/fingerprint.py),
+	# a row whose fingerprint no longer matches its series is stale and rerun by resumed runs
+	config_fingerprint = Column(String, index=True)
+
+	__table_args__ = (
+		# Also the index of the lookups by series ordered by experiment_id
+		UniqueConstraint('experiment_series_id', 'experiment_id', name='uq_experiments_series_experiment_id'),
+	)
+
+	# The series is still addressed by name: Experiment(experiment_series_name=...) and
+	# filters on Experiment.experiment_series_name work as before the surrogate key
+	@hybrid_property
+	def experiment_series_name(self):
+		if self.series is not None:
+			return self.series.experiment_series_name
+		return getattr(self, '_pending_experiment_series_name', None)
+
+	@experiment_series_name.setter
+	def experiment_series_name(self, experiment_series_name):
+		self._pending_experiment_series_name = experiment_series_name
+
+	@experiment_series_name.comparator
+	def experiment_series_name(cls):
+		return ExperimentSeriesNameComparator(
+			select(ExperimentSeries.experiment_series_name).where(ExperimentSeries.id == cls.experiment_series_id).scalar_subquery()
+		)
+
+
+@event.listens_for(Experiment, 'before_insert')
+def _resolve_experiment_series_id(mapper, connection, experiment):
+	# Fallback for single rows created by name, batch inserts set experiment_series_id
+	# themselves (see select_experiment_series_ids) instead of one SELECT per row
+	if experiment.experiment_series_id is None and experiment.series is None:
+		experiment_series_name = getattr(experiment, '_pending_experiment_series_name', None)
+		experiment.experiment_series_id = connection.execute(
+			select(ExperimentSeries.id).where(ExperimentSeries.experiment_series_name == experiment_series_name)
+		).scalar_one()
@@ -1,11 +1,14 @@
 from sqlalchemy import Column, Float, Integer, String, Boolean, DateTime, ForeignKey
 from database.models.base import Base
+from config.load_profile import create_load_profile
 
 class ExperimentSeries(Base):
 	__tablename__ = 'experiment_series'
 
-	experiment_series_name = Column(String, primary_key=True, unique=True, nullable=False)
-	group_name = Column(String, default='')
+	# Experiments reference the integer id, so renaming a series only updates this row
+	id = Column(Integer, primary_key=True, autoincrement=True)
+	experiment_series_name = Column(String, unique=True, nullable=False)
+	group_name = Column(String, default='', index=True)
 	description = Column(String, default='')
 
 	# Simulation configuration
@@ -30,6 +33,14 @@ class ExperimentSeries(Base):
 	torsional_force = Column(Float, default=0.0)
 	reset_force_after_seconds = Column(Integer)
 
+	# Load profile (step, ramp, cyclic or hold_release), evaluated natively by the solver
+	# when empty it is hold_release if reset_force_after_seconds is set, otherwise step
+	load_profile = Column(String, default=None)
+	load_ramp_seconds = Column(Float, default=None)
+	load_cycle_period_seconds = Column(Float, default=None)
+	num_load_cycles = Column(Integer, default=None)
+	load_cycle_amplitudes = Column(String, default=None)  # comma separated fractions of the force per cycle, e.g. "0.25,0.5,1.0"
+
 	# Braided structure configuration
 	num_strands = Column(Integer, default=8)
 	num_layers = Column(Integer, default=5)
@@ -41,6 +52,11 @@ class ExperimentSeries(Base):
 	weight_kg = Column(Float, default=None)
 	height_m = Column(Float, default=None)
 
+	# Tangent stiffness at the settled state, measured by a single stiffness analysis run
+	axial_stiffness = Column(Float, default=None)  # N/m
+	lateral_stiffness = Column(Float, default=None)  # N/m
+	torsional_stiffness = Column(Float, default=None)  # N·m/rad
+
 	# Meta
 	is_experiments_outdated = Column(Boolean, default=False) # Used to know that the values in this table have been changed without rerunning the experiments
 
@@ -62,6 +78,7 @@ class ExperimentSeries(Base):
 			errors.append("Strand radius must be greater than 0.")
 		if self.material_youngs_modulus is not None and self.material_youngs_modulus <= 0:
 			errors.append("Material Young's modulus must be greater than 0.")
+		errors.extend(create_load_profile(self).validate())
 		forces_vary = (
 			self.initial_force_applied_in_y_direction != self.final_force_in_y_direction or
 			self.initial_top_nodes_force_in_y_direction != self.final_top_nodes_force_in_y_direction or
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Float, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from database.models.base import Base
+from database.models.experiment_series_model import ExperimentSeries
+from datetime import datetime
+
+class SeriesSummary(Base):
+	"""
+	Per-series metrics derived from its experiments, refreshed whenever the experiments or the
+	series change (see database/queries/series_summary_queries.py), so pages and aggregate
+	graphs read one row per series instead of rescanning the experiments.
+	"""
+	__tablename__ = 'series_summary'
+
+	experiment_series_id = Column(Integer, ForeignKey('experiment_series.id', ondelete='CASCADE'), primary_key=True)
+	series = relationship(ExperimentSeries, lazy='joined', innerjoin=True)
+
+	num_experiments = Column(Integer, default=0, nullable=False)
+
+	# Absolute force of the non-exploded experiment closest to (at or above) TARGET_HEIGHT_REDUCTION_PERCENT,
+	# for each force direction
+	target_force_in_y_direction = Column(Float)
+	target_force_in_x_direction = Column(Float)
+	target_force_in_z_direction = Column(Float)
+	target_force_top_nodes_in_y_direction = Column(Float)
+	target_torsional_force = Column(Float)
+	met_target = Column(Boolean, default=False, nullable=False)
+
+	# Largest force survived without exploding and the compression (%) at that force
+	max_survivable_force = Column(Float)
+	max_survivable_compression_pct = Column(Float)
+
+	# force_no_force metrics, over the experiments before structural compromise (filter_force_no_force_experiments)
+	num_valid_experiments = Column(Integer, default=0, nullable=False)
+	avg_height_loss = Column(Float)  # final_height - initial height, shown as "recovery"
+	avg_final_height = Column(Float)
+	avg_equilibrium_time = Column(Float)
+	avg_compression_pct = Column(Float)  # under load
+	max_compression_pct = Column(Float)
+	min_compression_pct = Column(Float)
+	avg_sweep_stiffness = Column(Float)  # mean F/Δx over the force sweep (N/m)
+	avg_final_compression_pct = Column(Float)  # after release, only with at least 2 valid experiments
+	std_final_compression_pct = Column(Float)
+	min_final_compression_pct = Column(Float)
+	max_final_compression_pct = Column(Float)
+	max_valid_force = Column(Float)
+
+	updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
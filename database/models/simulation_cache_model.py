@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from database.models.base import Base
+from datetime import datetime
+
+class SimulationCacheEntry(Base):
+	"""
+	Result of a simulation keyed by the fingerprint of its physics inputs (see experiments/fingerprint.py).
+
+	The same geometry, material and forces show up in several series, a cached result is
+	copied into a new experiment row instead of simulating it again.
+	"""
+	__tablename__ = 'simulation_cache'
+
+	config_fingerprint = Column(String, primary_key=True)
+	result_json = Column(Text, nullable=False)  # experiment record and cycles, without series name and experiment id
+	# Experiment the result was first simulated for, its final screenshot is reused
+	source_experiment_series_name = Column(String)
+	source_experiment_id = Column(Integer)
+
+	created_at = Column(DateTime, default=datetime.utcnow)
+	last_used_at = Column(DateTime, default=datetime.utcnow, index=True)  # for least recently used eviction
+	hit_count = Column(Integer, default=0, nullable=False)
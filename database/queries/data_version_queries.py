@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from database.models.data_version_model import DataVersion
+
+DATA_VERSION_ID = 1
+
+
+def select_data_version(session):
+	version = session.query(DataVersion.version).filter_by(id=DATA_VERSION_ID).scalar()
+	return version or 0
+
+
+def bump_data_version(session):
+	"""Increment the data version without committing, the caller commits it with its changes"""
+	updated = session.query(DataVersion).filter_by(id=DATA_VERSION_ID).update(
+		{DataVersion.version: DataVersion.version + 1, DataVersion.updated_at: datetime.utcnow()},
+		synchronize_session=False
+	)
+	if not updated:
+		session.add(DataVersion(id=DATA_VERSION_ID, version=1))
+		session.flush()
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, select
+
+from database.models.experiment_series_model import ExperimentSeries
+from database.models.experiment_model import Experiment
+from database.queries.data_version_queries import select_data_version
+
+EXPERIMENT_COLUMNS = [column for column in Experiment.__table__.columns if column.key not in ("id", "experiment_series_id")]
+FLOAT_EXPERIMENT_COLUMNS = [column.key for column in EXPERIMENT_COLUMNS if isinstance(column.type, Float)]
+
+# (database url, data version, dataset) of the last loaded dataset
+_cached_dataset = None
+
+
+class ExperimentDataset:
+	"""
+	All experiments and series, read once into columnar pandas frames without ORM objects.
+
+	`experiments` has one row per experiment, sorted by series name and experiment_id, with
+	NaN for missing values. `series` has one row per series, indexed by name, with None for
+	missing values like the ORM attributes. The experiments of a series are a contiguous slice.
+	"""
+
+	def __init__(self, series, experiments):
+		self.series = series
+		self.experiments = experiments
+
+		names = experiments["experiment_series_name"].to_numpy()
+		unique_names, starts = np.unique(names, return_index=True)
+		stops = np.append(starts[1:], len(names))
+		self._slices = {name: slice(start, stop) for name, start, stop in zip(unique_names, starts, stops)}
+
+	def series_in_group(self, group_name_part):
+		"""Series whose group name contains `group_name_part`, like group_name LIKE '%part%'"""
+		group_names = self.series["group_name"].fillna("")
+		return self.series[group_names.str.contains(group_name_part, regex=False)]
+
+	def experiments_of(self, experiment_series_name):
+		return self.experiments.iloc[self._slices.get(experiment_series_name, slice(0, 0))]
+
+
+def load_experiment_dataset(session):
+	series_name = ExperimentSeries.__table__.c.experiment_series_name
+	rows = session.execute(
+		select(series_name, *EXPERIMENT_COLUMNS)
+		.join_from(Experiment.__table__, ExperimentSeries.__table__)
+		.order_by(series_name, Experiment.__table__.c.experiment_id)
+	).all()
+	experiments = pd.DataFrame.from_records(rows, columns=["experiment_series_name"] + [column.key for column in EXPERIMENT_COLUMNS])
+	experiments[FLOAT_EXPERIMENT_COLUMNS] = experiments[FLOAT_EXPERIMENT_COLUMNS].astype(float)
+
+	series_columns = list(ExperimentSeries.__table__.columns)
+	series = pd.DataFrame.from_records(
+		session.execute(select(*series_columns).order_by(series_name)).all(),
+		columns=[column.key for column in series_columns]
+	)
+	series = series.astype(object).where(series.notna(), None)
+	series.index = series["experiment_series_name"]
+
+	return ExperimentDataset(series, experiments)
+
+
+def get_experiment_dataset(session):
+	"""The dataset of the session's database, reloaded only when its data version changed"""
+	global _cached_dataset
+	database_url = str(session.get_bind().url)
+	data_version = select_data_version(session)
+	if _cached_dataset is None or _cached_dataset[:2] != (database_url, data_version):
+		_cached_dataset = (database_url, data_version, load_experiment_dataset(session))
+	return _cached_dataset[2]
@@ -1,5 +1,9 @@
 from database.models.experiment_series_model import ExperimentSeries
 from database.models.experiment_model import Experiment
+from database.models.series_summary_model import SeriesSummary
+from database.queries.series_summary_queries import refresh_series_summary
+from database.queries.data_version_queries import bump_data_version
+from sqlalchemy import inspect
 from sqlalchemy.exc import SQLAlchemyError
 
 def sqlalchemy_model_to_dict(model):
@@ -7,6 +11,11 @@ def sqlalchemy_model_to_dict(model):
 		return None
 	return {key: value for key, value in model.__dict__.items() if key != "_sa_instance_state"}
 
+def experiment_series_snapshot(experiment_series):
+	"""Transient copy of the column values, can be pickled to a worker and used without a database session"""
+	columns = inspect(ExperimentSeries).column_attrs
+	return ExperimentSeries(**{column.key: getattr(experiment_series, column.key) for column in columns})
+
 def select_all_experiment_series(session):
 	experiment_series = session.query(ExperimentSeries).order_by(ExperimentSeries.experiment_series_name).all()
 	return experiment_series
@@ -43,6 +52,7 @@ def insert_experiment_series(session, experiment_series):
 			raise ValueError(f"Validation failed: {errors}")
 
 		session.add(experiment_series)
+		bump_data_version(session)
 		session.commit()
 		return experiment_series
 	except SQLAlchemyError:
@@ -60,6 +70,7 @@ def insert_experiment_series_default(session, experiment_series_name):
 			raise ValueError(f"Validation failed: {errors}")
 
 		session.add(instance)
+		bump_data_version(session)
 		session.commit()
 		return instance
 	except SQLAlchemyError:
@@ -75,26 +86,62 @@ def update_experiment_series(session, experiment_series_name, updates):
 	if not experiment_series:
 		return
 
+	errors = []
 	for field, value in updates.items():
 		column = ExperimentSeries.__table__.columns.get(field)
 		if column is not None:
 			try:
 				py_type = column.type.python_type
-				value = py_type(value)
-			except (TypeError, ValueError, NotImplementedError):
-				pass
+			except NotImplementedError:
+				py_type = None
+			if py_type in (int, float) and isinstance(value, str):
+				# An emptied number input of the page clears the field
+				if not value.strip():
+					value = None
+				else:
+					try:
+						value = py_type(value)
+					except ValueError:
+						errors.append(f"'{field}' must be a number.")
+						continue
+			elif py_type is not None and value is not None:
+				try:
+					value = py_type(value)
+				except (TypeError, ValueError):
+					pass
 		setattr(experiment_series, field, value)
 
-	errors = experiment_series.validate() if hasattr(experiment_series, 'validate') else None
+	errors = errors or (experiment_series.validate() if hasattr(experiment_series, 'validate') else None)
 	if errors:
 		session.rollback()
 		return None, errors
 
+	refresh_series_summary(session, experiment_series_name)
 	session.commit()
 	return experiment_series, None
 
 
+def rename_experiment_series(session, old_experiment_series_name, new_experiment_series_name):
+	"""Experiments reference the series by id, only the series row changes. False if old is missing or new is taken"""
+	experiment_series = select_experiment_series_by_name(session, old_experiment_series_name)
+	if experiment_series is None or not is_experiment_series_name_unique(session, new_experiment_series_name):
+		return False
+
+	try:
+		experiment_series.experiment_series_name = new_experiment_series_name
+		bump_data_version(session)
+		session.commit()
+		return True
+	except SQLAlchemyError:
+		session.rollback()
+		raise
+
+
 def delete_experiment_series(session, experiment_series_name):
 	session.query(Experiment).filter_by(experiment_series_name=experiment_series_name).delete()
+	session.query(SeriesSummary).filter(SeriesSummary.experiment_series_id.in_(
+		session.query(ExperimentSeries.id).filter_by(experiment_series_name=experiment_series_name)
+	)).delete(synchronize_session=False)
 	session.query(ExperimentSeries).filter_by(experiment_series_name=experiment_series_name).delete()
+	bump_data_version(session)
 	session.commit()
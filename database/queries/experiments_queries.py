@@ -1,5 +1,9 @@
 from sqlalchemy.exc import SQLAlchemyError
 from database.models.experiment_model import Experiment
+from database.models.experiment_series_model import ExperimentSeries
+from database.models.experiment_cycle_model import ExperimentCycle
+from database.queries.series_summary_queries import refresh_series_summary, refresh_series_summaries
+from config.experiment_config import FULL_BEAM_SEGMENTS, FINE_FIDELITY
 
 
 def select_experiment_by_series_name_and_id(session, experiment_series_name, experiment_id):
@@ -18,7 +22,8 @@ def select_all_experiments_by_series_name(session, experiment_series_name):
 def insert_experiment(session, experiment_id, experiment_series_name, 
 					  force_in_y_direction, force_top_nodes_in_y_direction, force_in_x_direction, force_in_z_direction, torsional_force, equilibrium_after_seconds,
 					  time_to_bounding_box_explosion, max_bounding_box_volume, time_to_beam_strain_exceed_explosion, max_beam_strain, time_to_node_velocity_spike_explosion, max_node_velocity, 
-					  height_under_load, final_height):
+					  height_under_load, final_height, num_beam_segments=FULL_BEAM_SEGMENTS, fidelity=FINE_FIDELITY, config_fingerprint=None):
+	"""Does not refresh the series summary, the caller refreshes it once per run (see refresh_series_summaries)"""
 	try:
 		experiment = Experiment(
 			experiment_id=experiment_id,
@@ -38,7 +43,10 @@ def insert_experiment(session, experiment_id, experiment_series_name,
 			time_to_node_velocity_spike_explosion=time_to_node_velocity_spike_explosion,
 			max_node_velocity=max_node_velocity,
 			height_under_load=height_under_load,
-			final_height=final_height
+			final_height=final_height,
+			num_beam_segments=num_beam_segments,
+			fidelity=fidelity,
+			config_fingerprint=config_fingerprint
 		)
 		session.add(experiment)
 		session.commit()
@@ -48,6 +56,106 @@ def insert_experiment(session, experiment_id, experiment_series_name,
 		raise
 
 
+def insert_experiment_cycles(session, experiment_row_id, cycles):
+	try:
+		session.add_all([
+			ExperimentCycle(
+				experiment_row_id=experiment_row_id,
+				cycle_index=cycle.cycle_index,
+				amplitude=cycle.amplitude,
+				peak_force=cycle.peak_force,
+				min_height=cycle.min_height,
+				peak_compression=cycle.peak_compression,
+				residual_height=cycle.residual_height,
+				dissipated_energy=cycle.dissipated_energy
+			)
+			for cycle in cycles
+		])
+		session.commit()
+	except SQLAlchemyError:
+		session.rollback()
+		raise
+
+
+def select_experiment_series_ids(session, experiment_series_names):
+	"""{experiment_series_name: id} of the series, in one query"""
+	return dict(session.query(ExperimentSeries.experiment_series_name, ExperimentSeries.id).filter(
+		ExperimentSeries.experiment_series_name.in_(set(experiment_series_names))
+	).all())
+
+
+def insert_experiment_record(session, record, cycle_records=(), experiment_series_id=None):
+	"""
+	Insert an experiment returned by a worker as a record (see ExperimentConfig.store_results).
+	Callers inserting many records pass the `experiment_series_id`, otherwise it is looked up by name.
+	Does not refresh the series summary, the caller refreshes it once per batch (see refresh_series_summaries).
+	"""
+	try:
+		experiment = Experiment(**record)
+		if experiment_series_id is not None:
+			experiment.experiment_series_id = experiment_series_id
+		session.add(experiment)
+		session.flush()
+		session.add_all([ExperimentCycle(experiment_row_id=experiment.id, **cycle) for cycle in cycle_records])
+		session.commit()
+		return experiment
+	except SQLAlchemyError:
+		session.rollback()
+		raise
+
+
+def add_experiment_records(session, results):
+	"""
+	Add the experiments returned by workers ({"experiment": record, "cycles": cycle_records}) without committing,
+	so the caller writes a whole batch in one transaction
+	"""
+	# One id lookup per series instead of one per row at insert
+	experiment_series_names = {result["experiment"]["experiment_series_name"] for result in results}
+	experiment_series_ids = select_experiment_series_ids(session, experiment_series_names)
+	experiments = []
+	for result in results:
+		experiment = Experiment(**result["experiment"])
+		experiment.experiment_series_id = experiment_series_ids.get(result["experiment"]["experiment_series_name"])
+		experiments.append(experiment)
+	session.add_all(experiments)
+	session.flush()
+	session.add_all([
+		ExperimentCycle(experiment_row_id=experiment.id, **cycle)
+		for experiment, result in zip(experiments, results)
+		for cycle in result["cycles"]
+	])
+	refresh_series_summaries(session, experiment_series_names)
+	return experiments
+
+
+def select_experiment_cycles_by_series_name(session, experiment_series_name):
+	"""All cycles of a series as (experiment, cycle) pairs, ordered by experiment_id and cycle_index"""
+	rows = session.query(Experiment, ExperimentCycle).join(
+		ExperimentCycle, ExperimentCycle.experiment_row_id == Experiment.id
+	).filter(
+		Experiment.experiment_series_name == experiment_series_name
+	).order_by(Experiment.experiment_id, ExperimentCycle.cycle_index).all()
+	return rows
+
+
+def select_experiment_fingerprints_by_series_name(session, experiment_series_name):
+	"""{experiment_id: config_fingerprint} of the experiments stored for a series"""
+	rows = session.query(Experiment.experiment_id, Experiment.config_fingerprint).filter(
+		Experiment.experiment_series_name == experiment_series_name
+	).all()
+	return {experiment_id: config_fingerprint for experiment_id, config_fingerprint in rows}
+
+
+def delete_experiments_by_series_name_and_ids(session, experiment_series_name, experiment_ids):
+	session.query(Experiment).filter(
+		Experiment.experiment_series_name == experiment_series_name,
+		Experiment.experiment_id.in_(experiment_ids)
+	).delete(synchronize_session=False)
+	refresh_series_summary(session, experiment_series_name)
+	session.commit()
+
+
 def delete_experiments_by_series_name(session, experiment_series_name):
 	session.query(Experiment).filter_by(experiment_series_name=experiment_series_name).delete()
+	refresh_series_summary(session, experiment_series_name)
 	session.commit()
@@ -0,0 +1,60 @@
+import hashlib
+import json
+
+from sqlalchemy import select
+
+from database.models.experiment_series_model import ExperimentSeries
+from database.models.experiment_model import Experiment
+from database.models.experiment_cycle_model import ExperimentCycle
+
+series_table = ExperimentSeries.__table__
+experiments_table = Experiment.__table__
+cycles_table = ExperimentCycle.__table__
+
+# Row ids change when experiments are run again with the same results, they are not graph inputs
+SERIES_COLUMNS = [column for column in series_table.columns if column.key != "id"]
+EXPERIMENT_COLUMNS = [column for column in experiments_table.columns if column.key not in ("id", "experiment_series_id")]
+CYCLE_COLUMNS = [column for column in cycles_table.columns if column.key not in ("id", "experiment_row_id")]
+
+
+def _name_filter(experiment_series_names):
+	return [] if experiment_series_names is None else [series_table.c.experiment_series_name.in_(list(experiment_series_names))]
+
+
+def select_series_input_fingerprints(session, experiment_series_names=None):
+	"""
+	{series name: SHA-256 of the series row, its experiments and their cycles}, everything the graphs
+	of a series can read. Three ordered queries, the rows are hashed as they stream in.
+	"""
+	name = series_table.c.experiment_series_name
+	hashers = {}
+
+	for row in session.execute(select(*SERIES_COLUMNS).where(*_name_filter(experiment_series_names)).order_by(name)):
+		hashers[row.experiment_series_name] = hashlib.sha256(repr(tuple(row)).encode("utf-8"))
+
+	experiments = session.execute(
+		select(name.label("series_name"), *EXPERIMENT_COLUMNS)
+		.join_from(experiments_table, series_table)
+		.where(*_name_filter(experiment_series_names))
+		.order_by(name, experiments_table.c.experiment_id, experiments_table.c.id)
+	)
+	for row in experiments:
+		hashers[row.series_name].update(b"e" + repr(tuple(row)[1:]).encode("utf-8"))
+
+	cycles = session.execute(
+		select(name.label("series_name"), experiments_table.c.experiment_id, *CYCLE_COLUMNS)
+		.join_from(cycles_table, experiments_table, cycles_table.c.experiment_row_id == experiments_table.c.id)
+		.join(series_table, experiments_table.c.experiment_series_id == series_table.c.id)
+		.where(*_name_filter(experiment_series_names))
+		.order_by(name, experiments_table.c.experiment_id, cycles_table.c.cycle_index)
+	)
+	for row in cycles:
+		hashers[row.series_name].update(b"c" + repr(tuple(row)[1:]).encode("utf-8"))
+
+	return {series_name: hasher.hexdigest() for series_name, hasher in hashers.items()}
+
+
+def combine_fingerprints(fingerprints, **extra):
+	"""SHA-256 of a {series name: fingerprint} selection and of `extra` settings, independent of the order"""
+	canonical = json.dumps({"series": fingerprints, **extra}, sort_keys=True, separators=(",", ":"))
+	return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -1,11 +1,91 @@
-from sqlalchemy import and_
+from contextlib import contextmanager
+from functools import wraps
+
+from sqlalchemy import and_, func
 from sqlalchemy.orm import aliased
 from collections import defaultdict
+import numpy as np
+import pandas as pd
 
 from database.models.experiment_series_model import ExperimentSeries
-from database.models.experiment_model import Experiment
+from database.models.series_summary_model import SeriesSummary
+from database.queries.series_summary_queries import select_series_summaries
+from database.queries.experiment_dataset_queries import get_experiment_dataset
+
+# {dataset function name: dataset} while a graph build shares the datasets between its graphs
+_dataset_memo = None
+
+
+def memoized_dataset(function):
+	"""Inside dataset_memo(), the dataset is computed once and then shared by every graph that reads it"""
+	@wraps(function)
+	def wrapper(session):
+		if _dataset_memo is None:
+			return function(session)
+		if function.__name__ not in _dataset_memo:
+			_dataset_memo[function.__name__] = function(session)
+		return _dataset_memo[function.__name__]
+	return wrapper
+
+
+@contextmanager
+def dataset_memo(datasets=None):
+	"""Memoizes the datasets read inside the block, starting from the already computed `datasets`"""
+	global _dataset_memo
+	previous_memo = _dataset_memo
+	_dataset_memo = dict(datasets or {})
+	try:
+		yield _dataset_memo
+	finally:
+		_dataset_memo = previous_memo
+
+
+def force_no_force_valid_mask(series_codes, initial_heights, height_under_load, final_height, exploded):
+	"""
+	Vectorized force_no_force filter over the experiments of any number of series at once.
 
-from graphs import TARGET_HEIGHT_REDUCTION_PERCENT
+	All arguments are arrays with one entry per experiment, sorted by series then experiment_id:
+	the series of the experiment (any sortable code), the initial height of its series (NaN if
+	unknown), its heights (NaN if missing) and whether it exploded by any criterion.
+	Returns a boolean mask of the valid experiments, see filter_force_no_force_experiments.
+	"""
+	series_codes = np.asarray(series_codes)
+	initial_heights = np.asarray(initial_heights, dtype=float)
+	height_under_load = np.asarray(height_under_load, dtype=float)
+	final_height = np.asarray(final_height, dtype=float)
+
+	# Filters 1 and 2 skip an experiment, the others stop its series
+	candidates = (
+		~np.asarray(exploded, dtype=bool) & ~np.isnan(height_under_load) & ~np.isnan(final_height) &
+		~np.isnan(initial_heights) & (initial_heights != 0)
+	)
+	valid = np.zeros(len(candidates), dtype=bool)
+	if not candidates.any():
+		return valid
+
+	groups = series_codes[candidates]
+	initial = initial_heights[candidates]
+	heights = pd.Series(height_under_load[candidates])
+	finals = final_height[candidates]
+
+	# Filter 3: height under load above the lowest one of the previous experiments (1% tolerance)
+	previous_min_height = heights.groupby(groups).cummin().groupby(groups).shift(1).fillna(np.inf).to_numpy()
+	compression_broken = heights.to_numpy() > previous_min_height * 1.01
+
+	# Filter 4: recovery more than 10% above the previous one, once it has plateaued above 70%
+	denominators = initial - heights.to_numpy()
+	compressed = denominators > 0
+	recoveries = pd.Series(np.divide(finals - heights.to_numpy(), denominators, out=np.full(len(finals), np.nan), where=compressed))
+	previous_recoveries = recoveries.groupby(groups).shift(1).groupby(groups).ffill().to_numpy()
+	with np.errstate(invalid='ignore'):
+		recovery_broken = compressed & (previous_recoveries > 0.7) & (recoveries.to_numpy() > previous_recoveries * 1.10)
+
+	# Filter 5: final height above the initial height
+	integrity_broken = finals - initial > 0
+
+	broken = pd.Series(compression_broken | recovery_broken | integrity_broken)
+	valid[candidates] = ~broken.groupby(groups).cummax().to_numpy()
+	return valid
 
 
 def filter_force_no_force_experiments(experiments, initial_height):
@@ -20,6 +100,8 @@ def filter_force_no_force_experiments(experiments, initial_height):
 	5. Structural integrity - stops when final height exceeds initial height
 
 	Returns only valid experiments up to the point of structural compromise.
+	The filters run vectorized in force_no_force_valid_mask, meta/verify_force_no_force_filter.py
+	checks them against the sequential definition.
 	"""
 	if not experiments or not initial_height:
 		return []
@@ -27,57 +109,52 @@ def filter_force_no_force_experiments(experiments, initial_height):
 	# Sort by experiment_id to ensure sequential processing
 	sorted_experiments = sorted(experiments, key=lambda e: e.experiment_id)
 
-	valid_experiments = []
-	min_height_under_load = float('inf')
-	prev_recovery = None
+	heights, final_heights, exploded = _force_no_force_arrays(sorted_experiments)
+	mask = force_no_force_valid_mask(
+		np.zeros(len(sorted_experiments), dtype=int), np.full(len(sorted_experiments), initial_height, dtype=float),
+		heights, final_heights, exploded
+	)
+	return [exp for exp, is_valid in zip(sorted_experiments, mask) if is_valid]
 
-	for exp in sorted_experiments:
-		# Filter 1: Skip explosions
-		if (exp.time_to_bounding_box_explosion is not None or
-			exp.time_to_beam_strain_exceed_explosion is not None or
-			exp.time_to_node_velocity_spike_explosion is not None):
-			continue
 
-		# Filter 2: Skip missing data
-		if exp.height_under_load is None or exp.final_height is None:
-			continue
+def filter_force_no_force_experiments_by_series(experiments, initial_heights):
+	"""
+	filter_force_no_force_experiments for the experiments of many series in one pass.
+	`experiments` are sorted by experiment_series_id then experiment_id, `initial_heights` maps
+	experiment_series_id to the height of the series. Returns {experiment_series_id: valid experiments}.
+	"""
+	series_ids = [exp.experiment_series_id for exp in experiments]
+	heights, final_heights, exploded = _force_no_force_arrays(experiments)
+	mask = force_no_force_valid_mask(
+		series_ids, [initial_heights.get(series_id) or np.nan for series_id in series_ids],
+		heights, final_heights, exploded
+	)
+
+	valid_experiments = defaultdict(list)
+	for exp, is_valid in zip(experiments, mask):
+		if is_valid:
+			valid_experiments[exp.experiment_series_id].append(exp)
+	return valid_experiments
 
-		# Filter 3: Non-monotonic compression
-		# If height under load starts increasing, structure is compromised - stop here
-		# Use 1% tolerance to account for measurement noise
-		if exp.height_under_load > min_height_under_load * 1.01:
-			break  # All subsequent experiments are invalid
-
-		# Filter 4: Non-monotonic recovery
-		# Recovery naturally increases during initial compression, then plateaus.
-		# A sudden large increase after plateau indicates anomalous data.
-		# Only check after recovery has stabilized (>70%), then flag if it
-		# increases by more than 10% relative to the previous value.
-		denominator = initial_height - exp.height_under_load
-		if denominator > 0:
-			recovery = (exp.final_height - exp.height_under_load) / denominator
-			if prev_recovery is not None and prev_recovery > 0.7:
-				if recovery > prev_recovery * 1.10:
-					break  # Sudden recovery increase - anomalous data
-			prev_recovery = recovery
-
-		# Filter 5: Structural integrity
-		# Positive height loss (final_height > initial_height) indicates structural damage
-		height_loss = exp.final_height - initial_height
-		if height_loss > 0:
-			break  # Material gained height after unloading - structure is damaged
-
-		# Update minimum height and add to valid list
-		min_height_under_load = min(min_height_under_load, exp.height_under_load)
-		valid_experiments.append(exp)
 
-	return valid_experiments
+def _force_no_force_arrays(experiments):
+	"""Heights (NaN if missing) and explosion flags of ORM experiments, for force_no_force_valid_mask"""
+	heights = np.array([np.nan if exp.height_under_load is None else exp.height_under_load for exp in experiments], dtype=float)
+	final_heights = np.array([np.nan if exp.final_height is None else exp.final_height for exp in experiments], dtype=float)
+	exploded = np.array([
+		exp.time_to_bounding_box_explosion is not None or
+		exp.time_to_beam_strain_exceed_explosion is not None or
+		exp.time_to_node_velocity_spike_explosion is not None
+		for exp in experiments
+	], dtype=bool)
+	return heights, final_heights, exploded
 
 
 def get_weight_for_series(session, experiment_series_name):
 	series = session.query(ExperimentSeries).filter_by(experiment_series_name=experiment_series_name).first()
 	return series.weight_kg if series else None
 
+@memoized_dataset
 def get_strand_radius_vs_weight_chart_values(session):
     values = session.query(
         ExperimentSeries.experiment_series_name,
@@ -95,116 +172,41 @@ def get_strand_radius_vs_weight_chart_values(session):
     ]
 
 
+@memoized_dataset
 def get_strand_radius_vs_force_chart_values(session):
-    series_map = {
-        row.experiment_series_name: row
-        for row in session.query(ExperimentSeries).filter(ExperimentSeries.group_name.like('%strand_thickness%')).all()
-    }
-
-    experiments = session.query(Experiment).order_by(
-        Experiment.experiment_series_name,
-        Experiment.experiment_id
-    ).all()
-
-    grouped = defaultdict(list)
-    for experiment in experiments:
-        grouped[experiment.experiment_series_name].append(experiment)
-
     results = []
-    target_height_reduction = TARGET_HEIGHT_REDUCTION_PERCENT / 100
-
-    for series_name, experiments in grouped.items():
-        series = series_map.get(series_name)
-        if not series or not series.height_m or not series.strand_radius:
+    for series, summary in select_series_summaries(session, group_name_like='%strand_thickness%'):
+        if not series.height_m or not series.strand_radius or summary.target_force_in_y_direction is None:
             continue
 
-        best_experiment = None
-
-        for experiment in experiments:
-            if experiment.time_to_bounding_box_explosion is not None:
-                continue
-
-            if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-                continue
-
-            height_reduction = (series.height_m - experiment.height_under_load) / series.height_m
-
-            if height_reduction >= target_height_reduction:
-                if best_experiment is None:
-                    best_experiment = experiment
-                else:
-                    best_height_reduction = (series.height_m - best_experiment.height_under_load) / series.height_m
-                    if abs(height_reduction - target_height_reduction) < abs(best_height_reduction - target_height_reduction):
-                        best_experiment = experiment
-
-        if best_experiment:
-            results.append({
-                "experiment_series_name": series_name,
-                "strand_radius": series.strand_radius,
-                "force": abs(best_experiment.force_in_y_direction)
-            })
+        results.append({
+            "experiment_series_name": series.experiment_series_name,
+            "strand_radius": series.strand_radius,
+            "force": summary.target_force_in_y_direction
+        })
 
     return results
 
 
+@memoized_dataset
 def get_strand_radius_vs_efficiency_chart_values(session):
 	"""Get strand thickness vs. specific load capacity (structural efficiency)"""
-	series_map = {
-		row.experiment_series_name: row
-		for row in session.query(ExperimentSeries).filter(ExperimentSeries.group_name.like('%strand_thickness%')).all()
-	}
-
-	experiments = session.query(Experiment).order_by(
-		Experiment.experiment_series_name,
-		Experiment.experiment_id
-	).all()
-
-	grouped = defaultdict(list)
-	for experiment in experiments:
-		grouped[experiment.experiment_series_name].append(experiment)
-
 	results = []
-	target_height_reduction = TARGET_HEIGHT_REDUCTION_PERCENT / 100
-
-	for series_name, experiments in grouped.items():
-		series = series_map.get(series_name)
-		if not series or not series.height_m or not series.strand_radius or not series.weight_kg:
+	for series, summary in select_series_summaries(session, group_name_like='%strand_thickness%'):
+		if not series.height_m or not series.strand_radius or not series.weight_kg or summary.target_force_in_y_direction is None:
 			continue
 
-		best_experiment = None
-
-		for experiment in experiments:
-			if experiment.time_to_bounding_box_explosion is not None:
-				continue
-
-			if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-				continue
-
-			height_reduction = (series.height_m - experiment.height_under_load) / series.height_m
-
-			if height_reduction >= target_height_reduction:
-				if best_experiment is None:
-					best_experiment = experiment
-				else:
-					best_height_reduction = (series.height_m - best_experiment.height_under_load) / series.height_m
-					if abs(height_reduction - target_height_reduction) < abs(best_height_reduction - target_height_reduction):
-						best_experiment = experiment
-
-		if best_experiment:
-			force_value = abs(best_experiment.force_in_y_direction)
-			weight_force = series.weight_kg * 9.81
-			specific_load_capacity = force_value / weight_force if weight_force else None
-
-			if specific_load_capacity is not None:
-				results.append({
-					"experiment_series_name": series_name,
-					"strand_radius": series.strand_radius,
-					"specific_load_capacity": specific_load_capacity
-				})
+		weight_force = series.weight_kg * 9.81
+		results.append({
+			"experiment_series_name": series.experiment_series_name,
+			"strand_radius": series.strand_radius,
+			"specific_load_capacity": summary.target_force_in_y_direction / weight_force
+		})
 
 	return results
 
 
+@memoized_dataset
 def get_layer_count_vs_height_chart_values(session):
 	"""Get layer count vs. height for validation"""
 	values = session.query(
@@ -226,273 +228,148 @@ def get_layer_count_vs_height_chart_values(session):
 	]
 
 
+@memoized_dataset
 def get_layer_count_vs_force_chart_values(session):
 	"""Get layer count vs. load-bearing capacity"""
-	series_map = {
-		row.experiment_series_name: row
-		for row in session.query(ExperimentSeries).filter(ExperimentSeries.group_name.like('%number_of_layers%')).all()
-	}
-
-	experiments = session.query(Experiment).order_by(
-		Experiment.experiment_series_name,
-		Experiment.experiment_id
-	).all()
-
-	grouped = defaultdict(list)
-	for experiment in experiments:
-		grouped[experiment.experiment_series_name].append(experiment)
-
 	results = []
-	target_height_reduction = TARGET_HEIGHT_REDUCTION_PERCENT / 100
-
-	for series_name, experiments in grouped.items():
-		series = series_map.get(series_name)
-		if not series or not series.height_m or not series.num_layers:
+	for series, summary in select_series_summaries(session, group_name_like='%number_of_layers%'):
+		if not series.height_m or not series.num_layers or summary.target_force_in_y_direction is None:
 			continue
 
-		best_experiment = None
-
-		for experiment in experiments:
-			if experiment.time_to_bounding_box_explosion is not None:
-				continue
-
-			if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-				continue
-
-			height_reduction = (series.height_m - experiment.height_under_load) / series.height_m
-
-			if height_reduction >= target_height_reduction:
-				if best_experiment is None:
-					best_experiment = experiment
-				else:
-					best_height_reduction = (series.height_m - best_experiment.height_under_load) / series.height_m
-					if abs(height_reduction - target_height_reduction) < abs(best_height_reduction - target_height_reduction):
-						best_experiment = experiment
-
-		if best_experiment:
-			results.append({
-				"experiment_series_name": series_name,
-				"num_layers": series.num_layers,
-				"force": abs(best_experiment.force_in_y_direction)
-			})
+		results.append({
+			"experiment_series_name": series.experiment_series_name,
+			"num_layers": series.num_layers,
+			"force": summary.target_force_in_y_direction
+		})
 
 	return results
 
 
+@memoized_dataset
 def get_layer_count_vs_efficiency_chart_values(session):
 	"""Get layer count vs. specific load capacity (structural efficiency)"""
-	series_map = {
-		row.experiment_series_name: row
-		for row in session.query(ExperimentSeries).filter(ExperimentSeries.group_name.like('%number_of_layers%')).all()
-	}
-
-	experiments = session.query(Experiment).order_by(
-		Experiment.experiment_series_name,
-		Experiment.experiment_id
-	).all()
-
-	grouped = defaultdict(list)
-	for experiment in experiments:
-		grouped[experiment.experiment_series_name].append(experiment)
-
 	results = []
-	target_height_reduction = TARGET_HEIGHT_REDUCTION_PERCENT / 100
-
-	for series_name, experiments in grouped.items():
-		series = series_map.get(series_name)
-		if not series or not series.height_m or not series.num_layers or not series.weight_kg:
+	for series, summary in select_series_summaries(session, group_name_like='%number_of_layers%'):
+		if not series.height_m or not series.num_layers or not series.weight_kg or summary.target_force_in_y_direction is None:
 			continue
 
-		best_experiment = None
-
-		for experiment in experiments:
-			if experiment.time_to_bounding_box_explosion is not None:
-				continue
-
-			if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-				continue
-
-			height_reduction = (series.height_m - experiment.height_under_load) / series.height_m
-
-			if height_reduction >= target_height_reduction:
-				if best_experiment is None:
-					best_experiment = experiment
-				else:
-					best_height_reduction = (series.height_m - best_experiment.height_under_load) / series.height_m
-					if abs(height_reduction - target_height_reduction) < abs(best_height_reduction - target_height_reduction):
-						best_experiment = experiment
-
-		if best_experiment:
-			force_value = abs(best_experiment.force_in_y_direction)
-			weight_force = series.weight_kg * 9.81
-			specific_load_capacity = force_value / weight_force if weight_force else None
-
-			if specific_load_capacity is not None:
-				results.append({
-					"experiment_series_name": series_name,
-					"num_layers": series.num_layers,
-					"specific_load_capacity": specific_load_capacity
-				})
+		weight_force = series.weight_kg * 9.81
+		results.append({
+			"experiment_series_name": series.experiment_series_name,
+			"num_layers": series.num_layers,
+			"specific_load_capacity": summary.target_force_in_y_direction / weight_force
+		})
 
 	return results
 
 
+@memoized_dataset
 def get_layer_height_reduction_vs_force_data(session):
 	"""Get all experiments from layer series for height reduction vs. force graph"""
-	layer_series = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%number_of_layers%')
-	).all()
-
-	series_map = {s.experiment_series_name: s for s in layer_series}
-
-	experiments = session.query(Experiment).filter(
-		Experiment.experiment_series_name.in_([s.experiment_series_name for s in layer_series])
-	).all()
+	dataset = get_experiment_dataset(session)
 
 	results = []
-	for experiment in experiments:
-		series = series_map.get(experiment.experiment_series_name)
-		if not series or not series.height_m:
+	for series in dataset.series_in_group('number_of_layers').itertuples():
+		if not series.height_m:
 			continue
 
-		if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-			continue
+		experiments = dataset.experiments_of(series.experiment_series_name)
+		experiments = experiments[experiments.height_under_load.notna() & experiments.force_in_y_direction.notna()]
 
-		height_reduction_pct = ((series.height_m - experiment.height_under_load) / series.height_m) * 100
+		height_reduction_pcts = ((series.height_m - experiments.height_under_load) / series.height_m) * 100
+		forces = experiments.force_in_y_direction.abs()
+		exploded = experiments.time_to_bounding_box_explosion.notna()
 
-		results.append({
-			"experiment_series_name": experiment.experiment_series_name,
-			"num_layers": series.num_layers,
-			"force": abs(experiment.force_in_y_direction),
-			"height_reduction_pct": height_reduction_pct,
-			"exploded": experiment.time_to_bounding_box_explosion is not None
-		})
+		for force, height_reduction_pct, has_exploded in zip(forces.tolist(), height_reduction_pcts.tolist(), exploded.tolist()):
+			results.append({
+				"experiment_series_name": series.experiment_series_name,
+				"num_layers": series.num_layers,
+				"force": force,
+				"height_reduction_pct": height_reduction_pct,
+				"exploded": has_exploded
+			})
 
 	return results
 
 
+@memoized_dataset
 def get_strand_height_reduction_vs_force_data(session):
 	"""Get all experiments from strand series for height reduction vs. force graph"""
-	strand_series = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%number_of_strands%')
-	).all()
-
-	series_map = {s.experiment_series_name: s for s in strand_series}
-
-	experiments = session.query(Experiment).filter(
-		Experiment.experiment_series_name.in_([s.experiment_series_name for s in strand_series])
-	).all()
+	dataset = get_experiment_dataset(session)
 
 	results = []
-	for experiment in experiments:
-		series = series_map.get(experiment.experiment_series_name)
-		if not series or not series.height_m:
+	for series in dataset.series_in_group('number_of_strands').itertuples():
+		if not series.height_m:
 			continue
 
-		if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-			continue
+		experiments = dataset.experiments_of(series.experiment_series_name)
+		experiments = experiments[experiments.height_under_load.notna() & experiments.force_in_y_direction.notna()]
 
-		height_reduction_pct = ((series.height_m - experiment.height_under_load) / series.height_m) * 100
+		height_reduction_pcts = ((series.height_m - experiments.height_under_load) / series.height_m) * 100
+		forces = experiments.force_in_y_direction.abs()
+		exploded = experiments.time_to_bounding_box_explosion.notna()
 
-		results.append({
-			"experiment_series_name": experiment.experiment_series_name,
-			"num_strands": series.num_strands,
-			"num_layers": series.num_layers,
-			"force": abs(experiment.force_in_y_direction),
-			"height_reduction_pct": height_reduction_pct,
-			"exploded": experiment.time_to_bounding_box_explosion is not None
-		})
+		for force, height_reduction_pct, has_exploded in zip(forces.tolist(), height_reduction_pcts.tolist(), exploded.tolist()):
+			results.append({
+				"experiment_series_name": series.experiment_series_name,
+				"num_strands": series.num_strands,
+				"num_layers": series.num_layers,
+				"force": force,
+				"height_reduction_pct": height_reduction_pct,
+				"exploded": has_exploded
+			})
 
 	return results
 
 
+@memoized_dataset
 def get_thickness_height_reduction_vs_force_data(session):
 	"""Get all experiments from strand thickness series for height reduction vs. force graph"""
-	thickness_series = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%strand_thickness%')
-	).all()
-
-	series_map = {s.experiment_series_name: s for s in thickness_series}
-
-	experiments = session.query(Experiment).filter(
-		Experiment.experiment_series_name.in_([s.experiment_series_name for s in thickness_series])
-	).all()
+	dataset = get_experiment_dataset(session)
 
 	results = []
-	for experiment in experiments:
-		series = series_map.get(experiment.experiment_series_name)
-		if not series or not series.height_m:
+	for series in dataset.series_in_group('strand_thickness').itertuples():
+		if not series.height_m:
 			continue
 
-		if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-			continue
+		experiments = dataset.experiments_of(series.experiment_series_name)
+		experiments = experiments[experiments.height_under_load.notna() & experiments.force_in_y_direction.notna()]
 
-		height_reduction_pct = ((series.height_m - experiment.height_under_load) / series.height_m) * 100
+		height_reduction_pcts = ((series.height_m - experiments.height_under_load) / series.height_m) * 100
+		forces = experiments.force_in_y_direction.abs()
+		exploded = experiments.time_to_bounding_box_explosion.notna()
 
-		results.append({
-			"experiment_series_name": experiment.experiment_series_name,
-			"strand_radius": series.strand_radius,
-			"force": abs(experiment.force_in_y_direction),
-			"height_reduction_pct": height_reduction_pct,
-			"exploded": experiment.time_to_bounding_box_explosion is not None
-		})
+		for force, height_reduction_pct, has_exploded in zip(forces.tolist(), height_reduction_pcts.tolist(), exploded.tolist()):
+			results.append({
+				"experiment_series_name": series.experiment_series_name,
+				"strand_radius": series.strand_radius,
+				"force": force,
+				"height_reduction_pct": height_reduction_pct,
+				"exploded": has_exploded
+			})
 
 	return results
 
 
+@memoized_dataset
 def get_strand_thickness_max_survivable_force_data(session):
 	"""Get maximum force survived before explosion for each strand thickness"""
-	thickness_series = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%strand_thickness%')
-	).all()
-
-	series_map = {s.experiment_series_name: s for s in thickness_series}
-
-	experiments = session.query(Experiment).filter(
-		Experiment.experiment_series_name.in_([s.experiment_series_name for s in thickness_series])
-	).order_by(
-		Experiment.experiment_series_name,
-		Experiment.experiment_id
-	).all()
-
-	grouped = defaultdict(list)
-	for experiment in experiments:
-		grouped[experiment.experiment_series_name].append(experiment)
-
 	results = []
-	for series_name, experiments in grouped.items():
-		series = series_map.get(series_name)
-		if not series or not series.height_m:
+	for series, summary in select_series_summaries(session, group_name_like='%strand_thickness%'):
+		if not series.height_m or not summary.num_experiments:
 			continue
 
-		max_force = 0
-		max_compression_pct = 0
-
-		for experiment in experiments:
-			# Only consider experiments that did NOT explode
-			if experiment.time_to_bounding_box_explosion is not None:
-				continue
-
-			if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-				continue
-
-			force = abs(experiment.force_in_y_direction)
-			compression_pct = ((series.height_m - experiment.height_under_load) / series.height_m) * 100
-
-			if force > max_force:
-				max_force = force
-				max_compression_pct = compression_pct
-
 		results.append({
-			"experiment_series_name": series_name,
+			"experiment_series_name": series.experiment_series_name,
 			"strand_radius": series.strand_radius,
-			"max_force_survived": max_force,
-			"max_compression_pct": max_compression_pct
+			"max_force_survived": summary.max_survivable_force,
+			"max_compression_pct": summary.max_survivable_compression_pct
 		})
 
 	return results
 
 
+@memoized_dataset
 def get_strand_count_vs_weight_chart_values(session):
 	"""Get strand count vs. weight for validation"""
 	values = session.query(
@@ -511,456 +388,249 @@ def get_strand_count_vs_weight_chart_values(session):
 	]
 
 
+@memoized_dataset
 def get_strand_count_vs_force_chart_values(session):
 	"""Get strand count vs. load-bearing capacity"""
-	series_map = {
-		row.experiment_series_name: row
-		for row in session.query(ExperimentSeries).filter(ExperimentSeries.group_name.like('%number_of_strands%')).all()
-	}
-
-	experiments = session.query(Experiment).order_by(
-		Experiment.experiment_series_name,
-		Experiment.experiment_id
-	).all()
-
-	grouped = defaultdict(list)
-	for experiment in experiments:
-		grouped[experiment.experiment_series_name].append(experiment)
-
 	results = []
-	target_height_reduction = TARGET_HEIGHT_REDUCTION_PERCENT / 100
-
-	for series_name, experiments in grouped.items():
-		series = series_map.get(series_name)
-		if not series or not series.height_m or not series.num_strands:
+	for series, summary in select_series_summaries(session, group_name_like='%number_of_strands%'):
+		if not series.height_m or not series.num_strands or summary.target_force_in_y_direction is None:
 			continue
 
-		best_experiment = None
-
-		for experiment in experiments:
-			if experiment.time_to_bounding_box_explosion is not None:
-				continue
-
-			if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-				continue
-
-			height_reduction = (series.height_m - experiment.height_under_load) / series.height_m
-
-			if height_reduction >= target_height_reduction:
-				if best_experiment is None:
-					best_experiment = experiment
-				else:
-					best_height_reduction = (series.height_m - best_experiment.height_under_load) / series.height_m
-					if abs(height_reduction - target_height_reduction) < abs(best_height_reduction - target_height_reduction):
-						best_experiment = experiment
-
-		if best_experiment:
-			results.append({
-				"experiment_series_name": series_name,
-				"num_strands": series.num_strands,
-				"force": abs(best_experiment.force_in_y_direction)
-			})
+		results.append({
+			"experiment_series_name": series.experiment_series_name,
+			"num_strands": series.num_strands,
+			"force": summary.target_force_in_y_direction
+		})
 
 	return results
 
 
+@memoized_dataset
 def get_strand_count_vs_efficiency_chart_values(session):
 	"""Get strand count vs. specific load capacity (structural efficiency)"""
-	series_map = {
-		row.experiment_series_name: row
-		for row in session.query(ExperimentSeries).filter(ExperimentSeries.group_name.like('%number_of_strands%')).all()
-	}
-
-	experiments = session.query(Experiment).order_by(
-		Experiment.experiment_series_name,
-		Experiment.experiment_id
-	).all()
-
-	grouped = defaultdict(list)
-	for experiment in experiments:
-		grouped[experiment.experiment_series_name].append(experiment)
-
 	results = []
-	target_height_reduction = TARGET_HEIGHT_REDUCTION_PERCENT / 100
-
-	for series_name, experiments in grouped.items():
-		series = series_map.get(series_name)
-		if not series or not series.height_m or not series.num_strands or not series.weight_kg:
+	for series, summary in select_series_summaries(session, group_name_like='%number_of_strands%'):
+		if not series.height_m or not series.num_strands or not series.weight_kg or summary.target_force_in_y_direction is None:
 			continue
 
-		best_experiment = None
-
-		for experiment in experiments:
-			if experiment.time_to_bounding_box_explosion is not None:
-				continue
-
-			if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-				continue
-
-			height_reduction = (series.height_m - experiment.height_under_load) / series.height_m
-
-			if height_reduction >= target_height_reduction:
-				if best_experiment is None:
-					best_experiment = experiment
-				else:
-					best_height_reduction = (series.height_m - best_experiment.height_under_load) / series.height_m
-					if abs(height_reduction - target_height_reduction) < abs(best_height_reduction - target_height_reduction):
-						best_experiment = experiment
-
-		if best_experiment:
-			force_value = abs(best_experiment.force_in_y_direction)
-			weight_force = series.weight_kg * 9.81
-			specific_load_capacity = force_value / weight_force if weight_force else None
-
-			if specific_load_capacity is not None:
-				results.append({
-					"experiment_series_name": series_name,
-					"num_strands": series.num_strands,
-					"specific_load_capacity": specific_load_capacity
-				})
+		weight_force = series.weight_kg * 9.81
+		results.append({
+			"experiment_series_name": series.experiment_series_name,
+			"num_strands": series.num_strands,
+			"specific_load_capacity": summary.target_force_in_y_direction / weight_force
+		})
 
 	return results
 
 
+@memoized_dataset
 def get_force_no_force_recovery_data(session):
 	"""Get elastic recovery data for force_no_force experiments with all parameters"""
-	series_list = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%force_no_force%')
-	).all()
-
 	results = []
-
-	for series in series_list:
-		if not series.height_m or not series.reset_force_after_seconds:
-			continue
-
-		# Get all experiments for this series
-		all_experiments = session.query(Experiment).filter(
-			Experiment.experiment_series_name == series.experiment_series_name
-		).all()
-
-		# Apply comprehensive filtering including monotonicity check
-		valid_experiments = filter_force_no_force_experiments(all_experiments, series.height_m)
-
-		if not valid_experiments:
+	for series, summary in select_series_summaries(session, group_name_like='%force_no_force%'):
+		if not series.height_m or not series.reset_force_after_seconds or not summary.num_valid_experiments:
 			continue
 
-		# Calculate average height loss and final height for this series
-		height_losses = []
-		final_heights = []
-		for exp in valid_experiments:
-			height_loss = exp.final_height - series.height_m
-			height_losses.append(height_loss)
-			final_heights.append(exp.final_height)
-
-		if height_losses:
-			avg_height_loss = sum(height_losses) / len(height_losses)
-			avg_final_height = sum(final_heights) / len(final_heights)
-			results.append({
-				"experiment_series_name": series.experiment_series_name,
-				"strand_radius": series.strand_radius,
-				"num_layers": series.num_layers,
-				"num_strands": series.num_strands,
-				"recovery_percent": avg_height_loss,
-				"avg_final_height": avg_final_height,
-				"weight_kg": series.weight_kg
-			})
+		results.append({
+			"experiment_series_name": series.experiment_series_name,
+			"strand_radius": series.strand_radius,
+			"num_layers": series.num_layers,
+			"num_strands": series.num_strands,
+			"recovery_percent": summary.avg_height_loss,
+			"avg_final_height": summary.avg_final_height,
+			"weight_kg": series.weight_kg
+		})
 
 	return results
 
 
+@memoized_dataset
 def get_force_no_force_equilibrium_data(session):
 	"""Get equilibrium time data for force_no_force experiments with all parameters"""
-	series_list = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%force_no_force%')
-	).all()
-
 	results = []
-
-	for series in series_list:
-		if not series.height_m or not series.reset_force_after_seconds:
+	for series, summary in select_series_summaries(session, group_name_like='%force_no_force%'):
+		if not series.height_m or not series.reset_force_after_seconds or summary.avg_equilibrium_time is None:
 			continue
 
-		# Get all experiments for this series
-		all_experiments = session.query(Experiment).filter(
-			Experiment.experiment_series_name == series.experiment_series_name
-		).all()
-
-		# Apply comprehensive filtering including monotonicity check
-		valid_experiments = filter_force_no_force_experiments(all_experiments, series.height_m)
-
-		# Further filter for equilibrium data
-		experiments_with_equilibrium = [exp for exp in valid_experiments
-										if exp.equilibrium_after_seconds is not None]
-
-		if not experiments_with_equilibrium:
-			continue
+		results.append({
+			"experiment_series_name": series.experiment_series_name,
+			"strand_radius": series.strand_radius,
+			"num_layers": series.num_layers,
+			"num_strands": series.num_strands,
+			"avg_equilibrium_time": summary.avg_equilibrium_time,
+			"weight_kg": series.weight_kg
+		})
 
-		# Calculate average equilibrium time for this series
-		equilibrium_times = [exp.equilibrium_after_seconds for exp in experiments_with_equilibrium]
+	return results
 
-		if equilibrium_times:
-			avg_equilibrium_time = sum(equilibrium_times) / len(equilibrium_times)
-			results.append({
-				"experiment_series_name": series.experiment_series_name,
-				"strand_radius": series.strand_radius,
-				"num_layers": series.num_layers,
-				"num_strands": series.num_strands,
-				"avg_equilibrium_time": avg_equilibrium_time,
-				"weight_kg": series.weight_kg
-			})
 
-	return results
+def _stiffness_result(series, avg_stiffness):
+	return {
+		"experiment_series_name": series.experiment_series_name,
+		"num_layers": series.num_layers,
+		"num_strands": series.num_strands,
+		"avg_stiffness": avg_stiffness,
+		"weight_kg": series.weight_kg
+	}
 
 
+@memoized_dataset
 def get_force_no_force_compression_data(session):
 	"""Get compression data for force_no_force experiments"""
-	series_list = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%force_no_force%')
-	).all()
-
 	results = []
-
-	for series in series_list:
-		if not series.height_m:
-			continue
-
-		# Get all experiments for this series
-		all_experiments = session.query(Experiment).filter(
-			Experiment.experiment_series_name == series.experiment_series_name
-		).all()
-
-		# Apply comprehensive filtering including monotonicity check
-		valid_experiments = filter_force_no_force_experiments(all_experiments, series.height_m)
-
-		# Further filter for force data
-		experiments_with_force = [exp for exp in valid_experiments
-								  if exp.force_in_y_direction is not None]
-
-		if not experiments_with_force:
+	for series, summary in select_series_summaries(session, group_name_like='%force_no_force%'):
+		if not series.height_m or summary.avg_compression_pct is None:
 			continue
 
-		# Calculate compressions
-		compressions = []
-		for exp in experiments_with_force:
-			compression = series.height_m - exp.height_under_load
-			if compression > 0:
-				compression_pct = (compression / series.height_m) * 100
-				compressions.append(compression_pct)
-
-		if compressions:
-			avg_compression = sum(compressions) / len(compressions)
-			max_compression = max(compressions)
-			min_compression = min(compressions)
-			results.append({
-				"experiment_series_name": series.experiment_series_name,
-				"num_layers": series.num_layers,
-				"num_strands": series.num_strands,
-				"avg_compression_pct": avg_compression,
-				"max_compression_pct": max_compression,
-				"min_compression_pct": min_compression,
-				"target_force": abs(series.final_force_in_y_direction)
-			})
+		results.append({
+			"experiment_series_name": series.experiment_series_name,
+			"num_layers": series.num_layers,
+			"num_strands": series.num_strands,
+			"avg_compression_pct": summary.avg_compression_pct,
+			"max_compression_pct": summary.max_compression_pct,
+			"min_compression_pct": summary.min_compression_pct,
+			"target_force": abs(series.final_force_in_y_direction)
+		})
 
 	return results
 
 
+@memoized_dataset
 def get_force_no_force_stiffness_data(session):
 	"""Get effective stiffness data for force_no_force experiments"""
-	series_list = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%force_no_force%')
-	).all()
-
 	results = []
-
-	for series in series_list:
-		if not series.height_m:
-			continue
-
-		# Get all experiments for this series
-		all_experiments = session.query(Experiment).filter(
-			Experiment.experiment_series_name == series.experiment_series_name
-		).all()
-
-		# Apply comprehensive filtering including monotonicity check
-		valid_experiments = filter_force_no_force_experiments(all_experiments, series.height_m)
-
-		# Further filter for force data
-		experiments_with_force = [exp for exp in valid_experiments
-								  if exp.force_in_y_direction is not None]
-
-		if not experiments_with_force:
+	for series, summary in select_series_summaries(session, group_name_like='%force_no_force%'):
+		# A stiffness analysis run measures the tangent stiffness directly, no need for the force sweep
+		avg_stiffness = series.axial_stiffness
+		if avg_stiffness is None and series.height_m and summary.avg_sweep_stiffness is not None:
+			avg_stiffness = summary.avg_sweep_stiffness
+		if avg_stiffness is None:
 			continue
 
-		# Calculate stiffness k = F/Δx for each experiment
-		stiffnesses = []
-		for exp in experiments_with_force:
-			displacement = series.height_m - exp.height_under_load
-			force = abs(exp.force_in_y_direction)
-			if displacement > 0 and force > 0:
-				stiffness = force / displacement  # N/m
-				stiffnesses.append(stiffness)
-
-		if stiffnesses:
-			avg_stiffness = sum(stiffnesses) / len(stiffnesses)
-			results.append({
-				"experiment_series_name": series.experiment_series_name,
-				"num_layers": series.num_layers,
-				"num_strands": series.num_strands,
-				"avg_stiffness": avg_stiffness,
-				"weight_kg": series.weight_kg
-			})
+		results.append(_stiffness_result(series, avg_stiffness))
 
 	return results
 
 
+@memoized_dataset
 def get_force_no_force_recovery_consistency_data(session):
 	"""Get recovery data with variance/consistency metrics as compression percentages"""
-	series_list = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%force_no_force%')
-	).all()
-
 	results = []
-
-	for series in series_list:
-		if not series.height_m or not series.reset_force_after_seconds:
-			continue
-
-		# Get all experiments for this series
-		all_experiments = session.query(Experiment).filter(
-			Experiment.experiment_series_name == series.experiment_series_name
-		).all()
-
-		# Apply comprehensive filtering including monotonicity check
-		valid_experiments = filter_force_no_force_experiments(all_experiments, series.height_m)
-
-		if not valid_experiments:
+	for series, summary in select_series_summaries(session, group_name_like='%force_no_force%'):
+		# Compression % = (initial_height - final_height) / initial_height * 100, over at least 2 experiments
+		if not series.height_m or not series.reset_force_after_seconds or summary.avg_final_compression_pct is None:
 			continue
 
-		# Calculate compression percentages for each experiment
-		# Compression % = (initial_height - final_height) / initial_height * 100
-		compression_pcts = []
-		for exp in valid_experiments:
-			compression_pct = ((series.height_m - exp.final_height) / series.height_m) * 100
-			compression_pcts.append(compression_pct)
-
-		if len(compression_pcts) >= 2:
-			import statistics
-			avg_compression_pct = statistics.mean(compression_pcts)
-			std_compression_pct = statistics.stdev(compression_pcts)
-			min_compression_pct = min(compression_pcts)
-			max_compression_pct = max(compression_pcts)
-
-			results.append({
-				"experiment_series_name": series.experiment_series_name,
-				"num_layers": series.num_layers,
-				"num_strands": series.num_strands,
-				"initial_height": series.height_m,
-				"avg_compression_pct": avg_compression_pct,
-				"std_compression_pct": std_compression_pct,
-				"min_compression_pct": min_compression_pct,
-				"max_compression_pct": max_compression_pct,
-				"sample_size": len(compression_pcts)
-			})
+		results.append({
+			"experiment_series_name": series.experiment_series_name,
+			"num_layers": series.num_layers,
+			"num_strands": series.num_strands,
+			"initial_height": series.height_m,
+			"avg_compression_pct": summary.avg_final_compression_pct,
+			"std_compression_pct": summary.std_final_compression_pct,
+			"min_compression_pct": summary.min_final_compression_pct,
+			"max_compression_pct": summary.max_final_compression_pct,
+			"sample_size": summary.num_valid_experiments
+		})
 
 	return results
 
 
+@memoized_dataset
 def get_strand_count_stiffness_vs_compression_data(session):
 	"""Get stiffness vs. compression data for all strand count series"""
-	strand_series = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%number_of_strands%')
-	).all()
-
-	# Include all strand counts
-	strand_series = [s for s in strand_series if s.num_strands >= 2]
-
-	series_map = {s.experiment_series_name: s for s in strand_series}
-
-	experiments = session.query(Experiment).filter(
-		Experiment.experiment_series_name.in_([s.experiment_series_name for s in strand_series])
-	).order_by(
-		Experiment.experiment_series_name,
-		Experiment.experiment_id
-	).all()
+	dataset = get_experiment_dataset(session)
 
 	results = []
-	for experiment in experiments:
-		series = series_map.get(experiment.experiment_series_name)
-		if not series or not series.height_m:
-			continue
-
-		if experiment.height_under_load is None or experiment.force_in_y_direction is None:
+	for series in dataset.series_in_group('number_of_strands').itertuples():
+		# Include all strand counts
+		if series.num_strands is None or series.num_strands < 2 or not series.height_m:
 			continue
 
+		experiments = dataset.experiments_of(series.experiment_series_name)
+		experiments = experiments[experiments.height_under_load.notna() & experiments.force_in_y_direction.notna()]
 		# Skip the first experiment (zero force)
-		if experiment.experiment_id == 1:
-			continue
+		experiments = experiments[experiments.experiment_id != 1]
 
-		displacement = series.height_m - experiment.height_under_load
-		if displacement <= 0:
-			continue
+		displacements = series.height_m - experiments.height_under_load
+		experiments = experiments[displacements > 0]
+		displacements = displacements[displacements > 0]
 
-		compression_pct = (displacement / series.height_m) * 100
-		force = abs(experiment.force_in_y_direction)
-		stiffness = force / displacement  # k = F/Δx in N/m
+		compression_pcts = (displacements / series.height_m) * 100
+		forces = experiments.force_in_y_direction.abs()
+		stiffnesses = forces / displacements  # k = F/Δx in N/m
 
-		results.append({
-			"experiment_series_name": experiment.experiment_series_name,
-			"num_strands": series.num_strands,
-			"experiment_id": experiment.experiment_id,
-			"force": force,
-			"displacement": displacement,
-			"compression_pct": compression_pct,
-			"stiffness": stiffness
-		})
+		for experiment_id, force, displacement, compression_pct, stiffness in zip(
+			experiments.experiment_id.tolist(), forces.tolist(), displacements.tolist(), compression_pcts.tolist(), stiffnesses.tolist()
+		):
+			results.append({
+				"experiment_series_name": series.experiment_series_name,
+				"num_strands": series.num_strands,
+				"experiment_id": experiment_id,
+				"force": force,
+				"displacement": displacement,
+				"compression_pct": compression_pct,
+				"stiffness": stiffness
+			})
 
 	return results
 
 
-def get_strand_count_force_vs_displacement_data(session):
-	"""Get force vs. displacement data for all strand count series"""
+@memoized_dataset
+def get_strand_count_tangent_stiffness_data(session):
+	"""Get the measured tangent stiffness (at 0% compression) of all strand count series"""
 	strand_series = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name.like('%number_of_strands%')
+		ExperimentSeries.group_name.like('%number_of_strands%'),
+		ExperimentSeries.axial_stiffness.isnot(None)
 	).all()
 
-	# Include all strand counts
-	strand_series = [s for s in strand_series if s.num_strands >= 2]
+	return [
+		{
+			"experiment_series_name": series.experiment_series_name,
+			"num_strands": series.num_strands,
+			"axial_stiffness": series.axial_stiffness,
+			"lateral_stiffness": series.lateral_stiffness,
+			"torsional_stiffness": series.torsional_stiffness
+		}
+		for series in strand_series
+		if series.num_strands >= 2
+	]
 
-	series_map = {s.experiment_series_name: s for s in strand_series}
 
-	experiments = session.query(Experiment).filter(
-		Experiment.experiment_series_name.in_([s.experiment_series_name for s in strand_series])
-	).order_by(
-		Experiment.experiment_series_name,
-		Experiment.experiment_id
-	).all()
+@memoized_dataset
+def get_strand_count_force_vs_displacement_data(session):
+	"""Get force vs. displacement data for all strand count series"""
+	dataset = get_experiment_dataset(session)
 
 	results = []
-	for experiment in experiments:
-		series = series_map.get(experiment.experiment_series_name)
-		if not series or not series.height_m:
+	for series in dataset.series_in_group('number_of_strands').itertuples():
+		# Include all strand counts
+		if series.num_strands is None or series.num_strands < 2 or not series.height_m:
 			continue
 
-		if experiment.height_under_load is None or experiment.force_in_y_direction is None:
-			continue
+		experiments = dataset.experiments_of(series.experiment_series_name)
+		experiments = experiments[experiments.height_under_load.notna() & experiments.force_in_y_direction.notna()]
 
-		displacement = series.height_m - experiment.height_under_load
-		force = abs(experiment.force_in_y_direction)
-		compression_pct = (displacement / series.height_m) * 100
+		displacements = series.height_m - experiments.height_under_load
+		forces = experiments.force_in_y_direction.abs()
+		compression_pcts = (displacements / series.height_m) * 100
 
-		results.append({
-			"experiment_series_name": experiment.experiment_series_name,
-			"num_strands": series.num_strands,
-			"experiment_id": experiment.experiment_id,
-			"force": force,
-			"displacement": displacement,
-			"compression_pct": compression_pct
-		})
+		for experiment_id, force, displacement, compression_pct in zip(
+			experiments.experiment_id.tolist(), forces.tolist(), displacements.tolist(), compression_pcts.tolist()
+		):
+			results.append({
+				"experiment_series_name": series.experiment_series_name,
+				"num_strands": series.num_strands,
+				"experiment_id": experiment_id,
+				"force": force,
+				"displacement": displacement,
+				"compression_pct": compression_pct
+			})
 
 	return results
 
 
+@memoized_dataset
 def get_load_capacity_ratio_y_chart_values(session):
 	return _get_load_capacity_ratio_chart_values(session, "force_in_y_direction")
 
@@ -978,73 +648,26 @@ def get_load_capacity_ratio_torsional_chart_values(session):
 
 
 def _get_load_capacity_ratio_chart_values(session, force_column):
-	from graphs import TARGET_HEIGHT_REDUCTION_PERCENT
-
-	series_map = {
-		row.experiment_series_name: row
-		for row in session.query(ExperimentSeries).all()
-	}
-
-	experiments = session.query(Experiment).order_by(
-		Experiment.experiment_series_name,
-		Experiment.experiment_id
-	).all()
-
-	grouped = defaultdict(list)
-	for experiment in experiments:
-		grouped[experiment.experiment_series_name].append(experiment)
-
 	results = []
-
-	for series_name, experiments in grouped.items():
-		series = series_map.get(series_name)
-		if not series or not series.height_m:
+	for series, summary in select_series_summaries(session):
+		# Force of the non-exploded experiment closest to the target height reduction
+		force_value = getattr(summary, f"target_{force_column}")
+		if not series.height_m or force_value is None:
 			continue
 
-		# Find experiment with target height reduction that didn't explode
-		best_experiment = None
-		target_height_reduction = TARGET_HEIGHT_REDUCTION_PERCENT / 100
-
-		for experiment in experiments:
-			# Skip experiments that exploded
-			if experiment.time_to_bounding_box_explosion is not None:
-				continue
-
-			# Skip experiments without height data
-			if experiment.height_under_load is None:
-				continue
-
-			force_value = getattr(experiment, force_column)
-			if force_value is None:
-				continue
-
-			# Calculate height reduction percentage
-			height_reduction = (series.height_m - experiment.height_under_load) / series.height_m
-
-			# Select experiment closest to target height reduction
-			if height_reduction >= target_height_reduction:
-				if best_experiment is None:
-					best_experiment = experiment
-				else:
-					# Compare which is closer to target
-					best_height_reduction = (series.height_m - best_experiment.height_under_load) / series.height_m
-					if abs(height_reduction - target_height_reduction) < abs(best_height_reduction - target_height_reduction):
-						best_experiment = experiment
-
-		if best_experiment:
-			force_value = getattr(best_experiment, force_column)
-			# Specific Load Capacity = Force / (Weight × g)
-			# This gives how many times its own weight the structure can support
-			weight_force = series.weight_kg * 9.81  # Convert kg to Newtons
-			ratio = abs(force_value) / weight_force if weight_force else None
-			if ratio is not None:
-				results.append({
-					"experiment_series_name": series_name,
-					"force": abs(force_value),
-					"specific_load_capacity": ratio
-				})
-
-	return [dict(r) for r in results]
+		# Specific Load Capacity = Force / (Weight × g)
+		# This gives how many times its own weight the structure can support
+		weight_force = series.weight_kg * 9.81 if series.weight_kg else None  # Convert kg to Newtons
+		if weight_force:
+			results.append({
+				"experiment_series_name": series.experiment_series_name,
+				"force": force_value,
+				"weight_kg": series.weight_kg,
+				"specific_load_capacity": force_value / weight_force
+			})
+
+	return results
+
 
 def get_models_meeting_target_count(session):
 	"""
@@ -1056,47 +679,8 @@ def get_models_meeting_target_count(session):
 	"""
 	from graphs import TARGET_HEIGHT_REDUCTION_PERCENT
 
-	series_map = {
-		row.experiment_series_name: row
-		for row in session.query(ExperimentSeries).all()
-	}
-
-	experiments = session.query(Experiment).all()
-
-	grouped = defaultdict(list)
-	for experiment in experiments:
-		grouped[experiment.experiment_series_name].append(experiment)
-
-	met_target_count = 0
-	total_count = len(series_map)
-	target_height_reduction = TARGET_HEIGHT_REDUCTION_PERCENT / 100
-
-	for series_name, experiments in grouped.items():
-		series = series_map.get(series_name)
-		if not series or not series.height_m:
-			continue
-
-		# Check if any experiment in this series met the target
-		series_met_target = False
-		for experiment in experiments:
-			# Skip experiments that exploded
-			if experiment.time_to_bounding_box_explosion is not None:
-				continue
-
-			# Skip experiments without height data
-			if experiment.height_under_load is None:
-				continue
-
-			# Calculate height reduction percentage
-			height_reduction = (series.height_m - experiment.height_under_load) / series.height_m
-
-			# Check if met target
-			if height_reduction >= target_height_reduction:
-				series_met_target = True
-				break
-
-		if series_met_target:
-			met_target_count += 1
+	met_target_count = session.query(func.count(SeriesSummary.experiment_series_id)).filter(SeriesSummary.met_target.is_(True)).scalar()
+	total_count = session.query(func.count(ExperimentSeries.id)).scalar()
 
 	return {
 		'met_target': met_target_count,
@@ -1105,56 +689,22 @@ def get_models_meeting_target_count(session):
 	}
 
 
+@memoized_dataset
 def get_load_bearing_parameter_importance_data(session):
 	"""Get load capacity data from force_no_force experiments for parameter importance analysis"""
-	# Query force_no_force experiment series where both strands and layers vary
-	force_no_force_series = session.query(ExperimentSeries).filter(
-		ExperimentSeries.group_name == 'force_no_force'
-	).all()
-
-	series_map = {s.experiment_series_name: s for s in force_no_force_series}
-
-	# Query all experiments from these series
-	all_experiments = session.query(Experiment).filter(
-		Experiment.experiment_series_name.in_([s.experiment_series_name for s in force_no_force_series])
-	).all()
-
-	grouped = defaultdict(list)
-	for experiment in all_experiments:
-		grouped[experiment.experiment_series_name].append(experiment)
-
 	results = []
-
-	for series_name, experiments in grouped.items():
-		series = series_map.get(series_name)
-		if not series or not series.height_m or not series.weight_kg:
+	# force_no_force experiment series where both strands and layers vary
+	for series, summary in select_series_summaries(session, group_name='force_no_force'):
+		# Maximum force achieved under load (before release), over the valid experiments
+		if not series.height_m or not series.weight_kg or summary.max_valid_force is None:
 			continue
 
-		# Apply comprehensive filtering including monotonicity check
-		valid_experiments = filter_force_no_force_experiments(experiments, series.height_m)
-
-		# Find the maximum force achieved under load (before release)
-		max_force = None
-
-		for experiment in valid_experiments:
-			if experiment.force_in_y_direction is None:
-				continue
-
-			force_value = abs(experiment.force_in_y_direction)
-
-			if max_force is None or force_value > max_force:
-				max_force = force_value
-
-		if max_force is not None:
-			weight_force = series.weight_kg * 9.81
-			specific_load_capacity = max_force / weight_force if weight_force else None
-
-			if specific_load_capacity is not None:
-				results.append({
-					"experiment_series_name": series_name,
-					"num_layers": series.num_layers,
-					"num_strands": series.num_strands,
-					"specific_load_capacity": specific_load_capacity
-				})
+		weight_force = series.weight_kg * 9.81
+		results.append({
+			"experiment_series_name": series.experiment_series_name,
+			"num_layers": series.num_layers,
+			"num_strands": series.num_strands,
+			"specific_load_capacity": summary.max_valid_force / weight_force
+		})
 
-	return results
\ No newline at end of file
+	return results
@@ -0,0 +1,179 @@
+import json
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import SQLAlchemyError
+
+from config import ExperimentConfig
+from database.models.experiment_job_model import ExperimentJob, JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED
+
+MAX_JOB_ATTEMPTS = 3
+
+
+def _is_claimable(now):
+	"""Pending jobs, and running jobs whose lease expired, that have attempts left"""
+	return and_(
+		ExperimentJob.attempts < MAX_JOB_ATTEMPTS,
+		or_(
+			ExperimentJob.status == JOB_PENDING,
+			and_(ExperimentJob.status == JOB_RUNNING, ExperimentJob.lease_expires_at < now)
+		)
+	)
+
+
+def experiment_config_from_job(job):
+	return ExperimentConfig(**json.loads(job.config_json))
+
+
+def insert_experiment_jobs(session, campaign_id, scheduled_experiments):
+	"""Enqueue the experiments of a campaign, see experiments.scheduler.schedule_experiments"""
+	try:
+		session.add_all([
+			ExperimentJob(
+				campaign_id=campaign_id,
+				experiment_series_name=scheduled.experiment_series_name,
+				experiment_id=scheduled.experiment_config.experiment_id,
+				config_json=json.dumps(asdict(scheduled.experiment_config)),
+				priority=scheduled.estimated_cost,
+				status=JOB_PENDING,
+				attempts=0
+			)
+			for scheduled in scheduled_experiments
+		])
+		session.commit()
+	except SQLAlchemyError:
+		session.rollback()
+		raise
+
+
+def fail_expired_jobs(session, campaign_id=None):
+	"""
+	Mark the running jobs whose lease expired on their last attempt failed, no worker can claim
+	them again and their worker is gone. Returns the number of jobs failed.
+	"""
+	now = datetime.utcnow()
+	query = session.query(ExperimentJob).filter(
+		ExperimentJob.status == JOB_RUNNING,
+		ExperimentJob.lease_expires_at < now,
+		ExperimentJob.attempts >= MAX_JOB_ATTEMPTS
+	)
+	if campaign_id is not None:
+		query = query.filter(ExperimentJob.campaign_id == campaign_id)
+	failed = query.update({
+		ExperimentJob.status: JOB_FAILED,
+		ExperimentJob.error: f"The lease expired on each of the {MAX_JOB_ATTEMPTS} attempts, the worker stopped without reporting.",
+		ExperimentJob.lease_expires_at: None,
+		ExperimentJob.finished_at: now
+	}, synchronize_session=False)
+	session.commit()
+	return failed
+
+
+def claim_next_job(session, worker_id, lease_seconds, campaign_id=None):
+	"""
+	Claim the highest priority claimable job for this worker, or None when there is nothing to do.
+
+	The claim is an UPDATE guarded by the same condition the job was selected with, so when
+	two workers race for a job only one UPDATE matches a row and the other one tries the next job.
+	Expired jobs out of attempts are failed first, see fail_expired_jobs.
+	"""
+	fail_expired_jobs(session, campaign_id)
+	while True:
+		now = datetime.utcnow()
+		query = session.query(ExperimentJob.id).filter(_is_claimable(now))
+		if campaign_id is not None:
+			query = query.filter(ExperimentJob.campaign_id == campaign_id)
+		candidate = query.order_by(ExperimentJob.priority.desc(), ExperimentJob.id).first()
+		if candidate is None:
+			session.commit()
+			return None
+
+		claimed = session.query(ExperimentJob).filter(
+			ExperimentJob.id == candidate.id,
+			_is_claimable(now)
+		).update({
+			ExperimentJob.status: JOB_RUNNING,
+			ExperimentJob.worker_id: worker_id,
+			ExperimentJob.attempts: ExperimentJob.attempts + 1,
+			ExperimentJob.lease_expires_at: now + timedelta(seconds=lease_seconds),
+			ExperimentJob.heartbeat_at: now
+		}, synchronize_session=False)
+		session.commit()
+
+		if claimed == 1:
+			return session.get(ExperimentJob, candidate.id)
+
+
+def heartbeat_job(session, job_id, worker_id, lease_seconds):
+	"""Extend the lease of a job, returns False if the job is no longer held by this worker"""
+	now = datetime.utcnow()
+	updated = session.query(ExperimentJob).filter(
+		ExperimentJob.id == job_id,
+		ExperimentJob.worker_id == worker_id,
+		ExperimentJob.status == JOB_RUNNING
+	).update({
+		ExperimentJob.lease_expires_at: now + timedelta(seconds=lease_seconds),
+		ExperimentJob.heartbeat_at: now
+	}, synchronize_session=False)
+	session.commit()
+	return updated == 1
+
+
+def complete_job(session, job_id, worker_id):
+	"""
+	Mark the job done, returns False if the job is no longer held by this worker: its lease
+	expired and another worker claimed it again, that worker completes it
+	"""
+	completed = session.query(ExperimentJob).filter(
+		ExperimentJob.id == job_id,
+		ExperimentJob.worker_id == worker_id,
+		ExperimentJob.status == JOB_RUNNING
+	).update({
+		ExperimentJob.status: JOB_DONE,
+		ExperimentJob.lease_expires_at: None,
+		ExperimentJob.error: None,
+		ExperimentJob.finished_at: datetime.utcnow()
+	}, synchronize_session=False)
+	session.commit()
+	return completed == 1
+
+
+def fail_job(session, job_id, worker_id, error):
+	"""Put the job back in the queue, or mark it failed once it is out of attempts. No-op if the job is no longer held by this worker"""
+	job = session.get(ExperimentJob, job_id)
+	if job is None or job.worker_id != worker_id or job.status != JOB_RUNNING:
+		session.rollback()
+		return
+	job.error = error
+	job.lease_expires_at = None
+	if job.attempts >= MAX_JOB_ATTEMPTS:
+		job.status = JOB_FAILED
+		job.finished_at = datetime.utcnow()
+	else:
+		job.status = JOB_PENDING
+	session.commit()
+
+
+def select_campaign_progress(session, campaign_id):
+	"""{experiment_series_name: {status: count}} for a campaign"""
+	rows = session.query(
+		ExperimentJob.experiment_series_name,
+		ExperimentJob.status,
+		func.count(ExperimentJob.id)
+	).filter(
+		ExperimentJob.campaign_id == campaign_id
+	).group_by(
+		ExperimentJob.experiment_series_name,
+		ExperimentJob.status
+	).all()
+
+	progress = {}
+	for experiment_series_name, status, count in rows:
+		progress.setdefault(experiment_series_name, {})[status] = count
+	return progress
+
+
+def delete_campaign_jobs(session, campaign_id):
+	session.query(ExperimentJob).filter_by(campaign_id=campaign_id).delete()
+	session.commit()
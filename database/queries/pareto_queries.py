@@ -0,0 +1,88 @@
+"""
+Pareto front of the designs over the recommendation objectives, from the series summaries.
+"""
+from database.queries.data_version_queries import select_data_version
+from database.queries.recommendation_queries import MAJOR_EXPERIMENT_GROUPS
+from database.queries.series_summary_queries import select_series_summaries
+from util.pareto import ParetoFront
+
+# (objective, maximize): the four recommendation objectives
+PARETO_OBJECTIVES = (
+	("load_bearing", True),  # force at the target height reduction (N)
+	("efficiency", True),  # force / weight force
+	("flexibility", True),  # max compression of the force_no_force experiments (%)
+	("recovery", True),  # -|average height change after unloading| (m), 0 is a full recovery
+)
+
+# (database url, data version, front, {series name: design}) of the last computed front
+_cached_front = None
+
+
+def _design(series, summary):
+	force = summary.target_force_in_y_direction
+	return {
+		"load_bearing": force,
+		"efficiency": force / (series.weight_kg * 9.81) if force is not None and series.weight_kg else None,
+		"flexibility": summary.max_compression_pct,
+		# Distance from a full recovery, a structure ending taller is no better than one ending shorter
+		"recovery": -abs(summary.avg_height_loss) if summary.avg_height_loss is not None else None,
+		"avg_height_loss": summary.avg_height_loss,
+		"num_strands": series.num_strands,
+		"num_layers": series.num_layers,
+		"strand_radius": series.strand_radius,
+		"weight_kg": series.weight_kg,
+	}
+
+
+def select_pareto_designs(session):
+	"""{series name: design} of the series of the major experiment groups with at least one objective"""
+	designs = {}
+	for series, summary in select_series_summaries(session):
+		if not series.group_name or not any(group in series.group_name for group in MAJOR_EXPERIMENT_GROUPS):
+			continue
+		design = _design(series, summary)
+		if any(design[name] is not None for name, _ in PARETO_OBJECTIVES):
+			designs[series.experiment_series_name] = design
+	return designs
+
+
+def get_pareto_front(session):
+	"""
+	The front of the session's database with its designs. When the data version changed, only
+	the designs that were added, changed or removed are compared again.
+	"""
+	global _cached_front
+	database_url = str(session.get_bind().url)
+	data_version = select_data_version(session)
+	if _cached_front is not None and _cached_front[:2] == (database_url, data_version):
+		return _cached_front[2], _cached_front[3]
+
+	if _cached_front is not None and _cached_front[0] == database_url:
+		front, previous_designs = _cached_front[2], _cached_front[3]
+	else:
+		front, previous_designs = ParetoFront(PARETO_OBJECTIVES), {}
+
+	designs = select_pareto_designs(session)
+	front.remove([name for name in previous_designs if name not in designs])
+	front.update({name: design for name, design in designs.items() if previous_designs.get(name) != design})
+	_cached_front = (database_url, data_version, front, designs)
+	return front, designs
+
+
+def get_pareto_recommendations(session):
+	"""
+	All designs with their dominance rank (0 on the front), front first then by load bearing,
+	and the number of fronts
+	"""
+	front, designs = get_pareto_front(session)
+	ranked = [
+		dict(designs[name], series_name=name, rank=front.rank(name))
+		for name in front.keys
+	]
+	ranked.sort(key=lambda design: (design["rank"], -(design["load_bearing"] or 0), design["series_name"]))
+	return {
+		"objectives": [name for name, _ in PARETO_OBJECTIVES],
+		"designs": ranked,
+		"front_size": sum(design["rank"] == 0 for design in ranked),
+		"num_fronts": int(front.ranks.max()) + 1 if len(front) else 0,
+	}
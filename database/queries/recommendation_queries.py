@@ -18,6 +18,7 @@ from database.queries.graph_queries import (
     get_layer_count_vs_force_chart_values,
     get_strand_count_vs_force_chart_values
 )
+from util.design_space_index import DesignSpaceIndex
 
 
 def get_design_recommendations(session: Session):
@@ -46,17 +47,20 @@ def get_design_recommendations(session: Session):
     layer_force = get_layer_count_vs_force_chart_values(session)
     strand_force = get_strand_count_vs_force_chart_values(session)
 
+    # Series attributes for every entry, instead of one query per entry
+    series_index = _load_series_index(session)
+
     recommendations = {
-        'flexibility': _get_compression_recommendations(session, compression_data),
-        'recovery': _get_recovery_recommendations(session, recovery_data),
-        'high_load_bearing': _get_load_bearing_recommendations(session, load_bearing_data,
+        'flexibility': _get_compression_recommendations(series_index, compression_data),
+        'recovery': _get_recovery_recommendations(series_index, recovery_data),
+        'high_load_bearing': _get_load_bearing_recommendations(series_index, load_bearing_data,
                                                                thickness_force, layer_force, strand_force),
-        'best_efficiency': _get_efficiency_recommendations(session, thickness_efficiency,
+        'best_efficiency': _get_efficiency_recommendations(series_index, thickness_efficiency,
                                                            layer_efficiency, strand_efficiency)
     }
 
     # Compute trade-offs for each category
-    _compute_trade_offs(session, recommendations, compression_data, recovery_data,
+    _compute_trade_offs(series_index, recommendations, compression_data, recovery_data,
                         thickness_force + layer_force + strand_force,
                         thickness_efficiency + layer_efficiency + strand_efficiency)
 
@@ -66,61 +70,70 @@ def get_design_recommendations(session: Session):
 MAJOR_EXPERIMENT_GROUPS = ['force_no_force', 'number_of_strands', 'number_of_layers', 'strand_thickness']
 
 
-def _is_major_series(session, series_name):
+def _load_series_index(session):
+    """All series by name, in one query"""
+    return {series.experiment_series_name: series for series in session.query(ExperimentSeries).all()}
+
+
+def _is_major_series(series_index, series_name):
     """Check if a series belongs to one of the 4 major experiment groups"""
-    series = session.query(ExperimentSeries).filter_by(
-        experiment_series_name=series_name
-    ).first()
+    series = series_index.get(series_name)
     if not series or not series.group_name:
         return False
     return any(group in series.group_name for group in MAJOR_EXPERIMENT_GROUPS)
 
 
-def _find_similar_compression(compression_data, strands, layers, material_mm):
-    """Find a similar configuration in compression data based on parameters.
-    Returns the max_compression_pct of the closest match, or None if no data."""
-    if not compression_data:
-        return None
-
-    # Try exact match first
-    for c in compression_data:
-        c_material_mm = c.get('strand_radius', 0) * 1000 if c.get('strand_radius') else None
-        if (c['num_strands'] == strands and c['num_layers'] == layers and
-            c_material_mm is not None and material_mm is not None and
-            abs(c_material_mm - material_mm) < 0.1):
-            return c['max_compression_pct']
-
-    # Try matching strands and layers only
-    for c in compression_data:
-        if c['num_strands'] == strands and c['num_layers'] == layers:
-            return c['max_compression_pct']
-
-    # Try matching just strands (most important factor)
-    matches = [c for c in compression_data if c['num_strands'] == strands]
+def _compression_index(compression_data):
+    """
+    Index of the compression configurations by strands and layers, with their max_compression_pct
+    and the max_compression_pct of every configuration by strand count
+    """
+    configs = {c['experiment_series_name']: c for c in compression_data or []
+               if c.get('max_compression_pct') is not None}
+    values = {name: config['max_compression_pct'] for name, config in configs.items()}
+    values_by_strands = defaultdict(list)
+    for config in configs.values():
+        values_by_strands[config['num_strands']].append(config['max_compression_pct'])
+    index = DesignSpaceIndex(configs, configs.values(), parameters=('num_strands', 'num_layers'))
+    return index, values, values_by_strands
+
+
+def _find_similar_compression(compression_index, config):
+    """Find a similar configuration in compression data based on strands and layers.
+    Returns the max_compression_pct of the first configuration with the same strands and layers,
+    else the mean over the configurations with the same strand count, or None if no data."""
+    index, values, values_by_strands = compression_index
+    design = {'num_strands': config['strands'], 'num_layers': config['layers']}
+
+    # Matching strands and layers, the first one in the compression data on a tie
+    matches = index.within(design, 0)
     if matches:
-        return np.mean([c['max_compression_pct'] for c in matches])
+        return values[matches[0][0]]
+
+    # Matching just strands (most important factor)
+    if values_by_strands.get(config['strands']):
+        return np.mean(values_by_strands[config['strands']])
 
     return None
 
 
-def _compute_trade_offs(session, recommendations, compression_data, recovery_data, force_data, efficiency_data):
+def _compute_trade_offs(series_index, recommendations, compression_data, recovery_data, force_data, efficiency_data):
     """Compute how each recommendation fares on other metrics.
     Only includes data from the 4 major experiment groups:
     force_no_force, number_of_strands, number_of_layers, strand_thickness
     """
 
     # Build lookup maps by series name (filtered to major groups)
+    compression_index = _compression_index(compression_data)
     compression_map = {c['experiment_series_name']: c for c in compression_data
-                       if _is_major_series(session, c['experiment_series_name'])} if compression_data else {}
+                       if _is_major_series(series_index, c['experiment_series_name'])} if compression_data else {}
 
     # Build recovery map with normalized efficiency (filtered to major groups)
     recovery_map = {}
     for config in recovery_data or []:
-        if not _is_major_series(session, config['experiment_series_name']):
+        if not _is_major_series(series_index, config['experiment_series_name']):
             continue
-        series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=config['experiment_series_name']
-        ).first()
+        series = series_index.get(config['experiment_series_name'])
         if series and series.final_force_in_y_direction:
             applied_force = abs(series.final_force_in_y_direction)
             normalized_efficiency = config['recovery_percent'] / applied_force if applied_force > 0 else 0
@@ -132,30 +145,28 @@ def _compute_trade_offs(session, recommendations, compression_data, recovery_dat
 
     # Filter force and efficiency data to major groups only
     force_map = {f['experiment_series_name']: f['force'] for f in force_data
-                 if _is_major_series(session, f['experiment_series_name'])} if force_data else {}
+                 if _is_major_series(series_index, f['experiment_series_name'])} if force_data else {}
     efficiency_map = {e['experiment_series_name']: e['specific_load_capacity'] for e in efficiency_data
-                      if _is_major_series(session, e['experiment_series_name'])} if efficiency_data else {}
+                      if _is_major_series(series_index, e['experiment_series_name'])} if efficiency_data else {}
 
     # Also add force/efficiency from compression_data (force_no_force experiments)
     # These have target_force which is the applied force
     for c in compression_data or []:
         series_name = c['experiment_series_name']
-        if not _is_major_series(session, series_name):
+        if not _is_major_series(series_index, series_name):
             continue
         if series_name not in force_map and 'target_force' in c:
             force_map[series_name] = c['target_force']
         # Calculate efficiency for force_no_force if not already present
         if series_name not in efficiency_map:
-            series = session.query(ExperimentSeries).filter_by(
-                experiment_series_name=series_name
-            ).first()
+            series = series_index.get(series_name)
             if series and series.weight_kg and 'target_force' in c:
                 weight_force = series.weight_kg * 9.81
                 if weight_force > 0:
                     efficiency_map[series_name] = c['target_force'] / weight_force
 
     # Calculate averages for comparison (using only major groups data)
-    major_compression = [c for c in compression_data if _is_major_series(session, c['experiment_series_name'])] if compression_data else []
+    major_compression = [c for c in compression_data if _is_major_series(series_index, c['experiment_series_name'])] if compression_data else []
     avg_compression = np.mean([c['max_compression_pct'] for c in major_compression]) if major_compression else 0
     avg_force = np.mean(list(force_map.values())) if force_map else 0
     avg_efficiency = np.mean(list(efficiency_map.values())) if efficiency_map else 0
@@ -220,12 +231,7 @@ def _compute_trade_offs(session, recommendations, compression_data, recovery_dat
         comp_val = compression_map.get(series_name, {}).get('max_compression_pct')
         # If not found in compression_map, try to find similar config
         if comp_val is None:
-            comp_val = _find_similar_compression(
-                compression_data,
-                top_load['strands'],
-                top_load['layers'],
-                top_load.get('material_thickness_mm')
-            )
+            comp_val = _find_similar_compression(compression_index, top_load)
         eff_val = efficiency_map.get(series_name)
         rec_val = recovery_map.get(series_name)
 
@@ -255,12 +261,7 @@ def _compute_trade_offs(session, recommendations, compression_data, recovery_dat
         comp_val = compression_map.get(series_name, {}).get('max_compression_pct')
         # If not found in compression_map, try to find similar config
         if comp_val is None:
-            comp_val = _find_similar_compression(
-                compression_data,
-                top_eff['strands'],
-                top_eff['layers'],
-                top_eff.get('material_thickness_mm')
-            )
+            comp_val = _find_similar_compression(compression_index, top_eff)
         rec_val = recovery_map.get(series_name)
 
         recommendations['best_efficiency']['trade_offs'] = {
@@ -282,7 +283,7 @@ def _compute_trade_offs(session, recommendations, compression_data, recovery_dat
         }
 
 
-def _get_compression_recommendations(session: Session, compression_data):
+def _get_compression_recommendations(series_index, compression_data):
     """Get top configurations for flexibility (compression percentage)"""
     if not compression_data:
         return {
@@ -298,9 +299,7 @@ def _get_compression_recommendations(session: Session, compression_data):
     # Get top 5 configurations
     top_configs = []
     for config in sorted_data[:5]:
-        series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=config['experiment_series_name']
-        ).first()
+        series = series_index.get(config['experiment_series_name'])
 
         top_configs.append({
             'strands': config['num_strands'],
@@ -334,7 +333,7 @@ def _get_compression_recommendations(session: Session, compression_data):
     }
 
 
-def _get_recovery_recommendations(session: Session, recovery_data):
+def _get_recovery_recommendations(series_index, recovery_data):
     """Get top configurations for elastic recovery (normalized by applied force)"""
     if not recovery_data:
         return {
@@ -347,9 +346,7 @@ def _get_recovery_recommendations(session: Session, recovery_data):
     # Enrich recovery data with force information and calculate normalized metric
     enriched_data = []
     for config in recovery_data:
-        series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=config['experiment_series_name']
-        ).first()
+        series = series_index.get(config['experiment_series_name'])
 
         if series and series.final_force_in_y_direction:
             applied_force = abs(series.final_force_in_y_direction)
@@ -417,7 +414,7 @@ def _get_recovery_recommendations(session: Session, recovery_data):
     }
 
 
-def _get_load_bearing_recommendations(session: Session, load_bearing_data, thickness_force, layer_force, strand_force):
+def _get_load_bearing_recommendations(series_index, load_bearing_data, thickness_force, layer_force, strand_force):
     """Get top configurations for load-bearing capability"""
 
     # Combine all force data
@@ -425,9 +422,7 @@ def _get_load_bearing_recommendations(session: Session, load_bearing_data, thick
 
     # Add thickness data
     for item in thickness_force:
-        series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=item['experiment_series_name']
-        ).first()
+        series = series_index.get(item['experiment_series_name'])
         if series:
             all_force_data.append({
                 'series_name': item['experiment_series_name'],
@@ -440,9 +435,7 @@ def _get_load_bearing_recommendations(session: Session, load_bearing_data, thick
 
     # Add layer data
     for item in layer_force:
-        series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=item['experiment_series_name']
-        ).first()
+        series = series_index.get(item['experiment_series_name'])
         if series:
             all_force_data.append({
                 'series_name': item['experiment_series_name'],
@@ -455,9 +448,7 @@ def _get_load_bearing_recommendations(session: Session, load_bearing_data, thick
 
     # Add strand data
     for item in strand_force:
-        series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=item['experiment_series_name']
-        ).first()
+        series = series_index.get(item['experiment_series_name'])
         if series:
             all_force_data.append({
                 'series_name': item['experiment_series_name'],
@@ -516,7 +507,7 @@ def _get_load_bearing_recommendations(session: Session, load_bearing_data, thick
     }
 
 
-def _get_efficiency_recommendations(session: Session, thickness_efficiency, layer_efficiency, strand_efficiency):
+def _get_efficiency_recommendations(series_index, thickness_efficiency, layer_efficiency, strand_efficiency):
     """Get top configurations for weight-to-payload ratio (structural efficiency)"""
 
     # Combine all efficiency data
@@ -524,9 +515,7 @@ def _get_efficiency_recommendations(session: Session, thickness_efficiency, laye
 
     # Add thickness data
     for item in thickness_efficiency:
-        series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=item['experiment_series_name']
-        ).first()
+        series = series_index.get(item['experiment_series_name'])
         if series:
             all_efficiency_data.append({
                 'series_name': item['experiment_series_name'],
@@ -539,9 +528,7 @@ def _get_efficiency_recommendations(session: Session, thickness_efficiency, laye
 
     # Add layer data
     for item in layer_efficiency:
-        series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=item['experiment_series_name']
-        ).first()
+        series = series_index.get(item['experiment_series_name'])
         if series:
             all_efficiency_data.append({
                 'series_name': item['experiment_series_name'],
@@ -554,9 +541,7 @@ def _get_efficiency_recommendations(session: Session, thickness_efficiency, laye
 
     # Add strand data
     for item in strand_efficiency:
-        series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=item['experiment_series_name']
-        ).first()
+        series = series_index.get(item['experiment_series_name'])
         if series:
             all_efficiency_data.append({
                 'series_name': item['experiment_series_name'],
@@ -0,0 +1,272 @@
+"""
+Per-series aggregates of the experiments computed by SQLite: GROUP BY series, window functions
+for "experiment closest to the target" and for the sequential force_no_force filter.
+Same results as compute_series_summaries, which loads the experiments and loops in Python
+(meta/benchmark_series_aggregates.py compares the two).
+"""
+import math
+from functools import lru_cache
+
+from sqlalchemy import and_, bindparam, case, func, or_, select
+
+from database.models.experiment_series_model import ExperimentSeries
+from database.models.experiment_model import Experiment
+
+FORCE_COLUMNS = (
+	"force_in_y_direction",
+	"force_in_x_direction",
+	"force_in_z_direction",
+	"force_top_nodes_in_y_direction",
+	"torsional_force",
+)
+
+experiments_table = Experiment.__table__
+series_table = ExperimentSeries.__table__
+
+
+# The statements are built once per combination of filters, their construction costs more
+# than running them for a single series (the refresh after every write)
+
+def _series_filter(by_ids, by_group):
+	conditions = []
+	if by_ids:
+		conditions.append(experiments_table.c.experiment_series_id.in_(bindparam("experiment_series_ids", expanding=True)))
+	if by_group:
+		conditions.append(series_table.c.group_name.like(bindparam("group_name_like")))
+	return conditions
+
+
+def _parameters(experiment_series_ids, group_name_like, **parameters):
+	if experiment_series_ids is not None:
+		parameters["experiment_series_ids"] = list(experiment_series_ids)
+	if group_name_like is not None:
+		parameters["group_name_like"] = group_name_like
+	return parameters
+
+
+def _filters(experiment_series_ids, group_name_like):
+	return experiment_series_ids is not None, group_name_like is not None
+
+
+def _experiments_with_height(by_ids, by_group):
+	"""Experiments joined with the height of their series, for the series with a height"""
+	return select(
+		experiments_table.c.experiment_series_id.label("series_id"),
+		series_table.c.height_m,
+		*experiments_table.c
+	).join_from(experiments_table, series_table).where(
+		series_table.c.height_m.isnot(None),
+		series_table.c.height_m != 0,
+		*_series_filter(by_ids, by_group)
+	)
+
+
+@lru_cache(maxsize=None)
+def _experiment_counts_statement(by_ids, by_group):
+	return (
+		select(experiments_table.c.experiment_series_id, func.count())
+		.join_from(experiments_table, series_table)
+		.where(*_series_filter(by_ids, by_group))
+		.group_by(experiments_table.c.experiment_series_id)
+	)
+
+
+def select_experiment_counts(session, experiment_series_ids=None, group_name_like=None):
+	"""{series id: number of experiments}"""
+	rows = session.execute(
+		_experiment_counts_statement(*_filters(experiment_series_ids, group_name_like)),
+		_parameters(experiment_series_ids, group_name_like)
+	).all()
+	return dict(rows)
+
+
+@lru_cache(maxsize=None)
+def _target_force_statement(by_ids, by_group):
+	base = _experiments_with_height(by_ids, by_group).where(
+		experiments_table.c.time_to_bounding_box_explosion.is_(None),
+		experiments_table.c.height_under_load.isnot(None)
+	).subquery()
+
+	height_reduction = (base.c.height_m - base.c.height_under_load) / base.c.height_m
+	reaches_target = height_reduction >= bindparam("target_height_reduction")
+	ranks = []
+	for force_column in FORCE_COLUMNS:
+		force = base.c[force_column]
+		ranks.append(func.row_number().over(
+			partition_by=base.c.series_id,
+			order_by=(
+				case((and_(reaches_target, force.isnot(None)), 0), else_=1),
+				func.abs(height_reduction - bindparam("target_height_reduction")),
+				base.c.experiment_id
+			)
+		).label(f"rank_{force_column}"))
+	max_force_rank = func.row_number().over(
+		partition_by=base.c.series_id,
+		order_by=(case((base.c.force_in_y_direction.isnot(None), 0), else_=1), func.abs(base.c.force_in_y_direction).desc(), base.c.experiment_id)
+	).label("max_force_rank")
+
+	ranked = select(
+		base.c.series_id,
+		base.c.height_m,
+		base.c.height_under_load,
+		*[base.c[force_column] for force_column in FORCE_COLUMNS],
+		case((reaches_target, 1), else_=0).label("reaches_target"),
+		*ranks,
+		max_force_rank
+	).subquery()
+
+	columns = [
+		func.max(case(
+			(and_(ranked.c[f"rank_{force_column}"] == 1, ranked.c.reaches_target == 1, ranked.c[force_column].isnot(None)), func.abs(ranked.c[force_column])),
+		)).label(f"target_{force_column}")
+		for force_column in FORCE_COLUMNS
+	]
+	max_force_row = and_(ranked.c.max_force_rank == 1, ranked.c.force_in_y_direction.isnot(None))
+	return select(
+		ranked.c.series_id,
+		*columns,
+		func.max(ranked.c.reaches_target).label("met_target"),
+		func.max(case((max_force_row, func.abs(ranked.c.force_in_y_direction)))).label("max_survivable_force"),
+		# Only a force above 0 replaces the initial compression of 0
+		func.max(case((and_(max_force_row, func.abs(ranked.c.force_in_y_direction) > 0),
+			((ranked.c.height_m - ranked.c.height_under_load) / ranked.c.height_m) * 100))).label("max_survivable_compression_pct")
+	).group_by(ranked.c.series_id)
+
+
+def select_target_force_aggregates(session, target_height_reduction, experiment_series_ids=None, group_name_like=None):
+	"""
+	{series id: {"target_<force column>": ..., "met_target": ..., "max_survivable_force": ..., "max_survivable_compression_pct": ...}}
+	over the experiments that did not explode (bounding box) and have a height under load.
+	The target experiment of a force column is the first by experiment_id among those closest to the target at or above it.
+	"""
+	rows = session.execute(
+		_target_force_statement(*_filters(experiment_series_ids, group_name_like)),
+		_parameters(experiment_series_ids, group_name_like, target_height_reduction=target_height_reduction)
+	).mappings().all()
+
+	aggregates = {}
+	for row in rows:
+		aggregate = dict(row)
+		series_id = aggregate.pop("series_id")
+		aggregate["met_target"] = bool(aggregate["met_target"])
+		aggregate["max_survivable_force"] = aggregate["max_survivable_force"] or 0
+		aggregate["max_survivable_compression_pct"] = aggregate["max_survivable_compression_pct"] or 0
+		aggregates[series_id] = aggregate
+	return aggregates
+
+
+def force_no_force_valid_experiments_subquery(by_ids=False, by_group=False):
+	"""
+	The experiments kept by filter_force_no_force_experiments, with window functions: the
+	lowest previous height under load, the previous recovery and whether the series broke so far.
+	With `by_ids` and `by_group`, the series are filtered by the experiment_series_ids and
+	group_name_like parameters.
+	"""
+	candidates = _experiments_with_height(by_ids, by_group).where(
+		experiments_table.c.time_to_bounding_box_explosion.is_(None),
+		experiments_table.c.time_to_beam_strain_exceed_explosion.is_(None),
+		experiments_table.c.time_to_node_velocity_spike_explosion.is_(None),
+		experiments_table.c.height_under_load.isnot(None),
+		experiments_table.c.final_height.isnot(None)
+	).subquery()
+	in_order = dict(partition_by=candidates.c.series_id, order_by=candidates.c.experiment_id)
+
+	denominator = candidates.c.height_m - candidates.c.height_under_load
+	recovery = case((denominator > 0, (candidates.c.final_height - candidates.c.height_under_load) / denominator)).label("recovery")
+	with_recovery = select(
+		candidates.c.series_id,
+		candidates.c.experiment_id,
+		candidates.c.height_m,
+		candidates.c.height_under_load,
+		candidates.c.final_height,
+		candidates.c.force_in_y_direction,
+		candidates.c.equilibrium_after_seconds,
+		recovery,
+		func.min(candidates.c.height_under_load).over(rows=(None, -1), **in_order).label("previous_min_height"),
+		# Experiments after a recovery up to the next one share its count
+		func.count(recovery).over(rows=(None, 0), **in_order).label("recovery_count")
+	).subquery()
+
+	with_group_recovery = select(
+		with_recovery,
+		func.max(with_recovery.c.recovery).over(partition_by=(with_recovery.c.series_id, with_recovery.c.recovery_count)).label("group_recovery")
+	).subquery()
+
+	# The previous recovery is the one of the group, or of the previous group for the experiment that starts it
+	previous_recovery = case(
+		(with_group_recovery.c.recovery.is_(None), with_group_recovery.c.group_recovery),
+		else_=func.lag(with_group_recovery.c.group_recovery).over(
+			partition_by=with_group_recovery.c.series_id, order_by=with_group_recovery.c.experiment_id
+		)
+	)
+	broken = case((or_(
+		with_group_recovery.c.height_under_load > with_group_recovery.c.previous_min_height * 1.01,
+		and_(previous_recovery > 0.7, with_group_recovery.c.recovery > previous_recovery * 1.10),
+		with_group_recovery.c.final_height - with_group_recovery.c.height_m > 0
+	), 1), else_=0)
+	with_broken = select(with_group_recovery, broken.label("broken")).subquery()
+
+	with_broken_so_far = select(
+		with_broken,
+		func.max(with_broken.c.broken).over(
+			partition_by=with_broken.c.series_id, order_by=with_broken.c.experiment_id, rows=(None, 0)
+		).label("broken_so_far")
+	).subquery()
+
+	return select(with_broken_so_far).where(with_broken_so_far.c.broken_so_far == 0).subquery()
+
+
+@lru_cache(maxsize=None)
+def _force_no_force_statement(by_ids, by_group):
+	valid = force_no_force_valid_experiments_subquery(by_ids, by_group)
+	final_compression_pct = ((valid.c.height_m - valid.c.final_height) / valid.c.height_m) * 100
+	with_final_compression = select(
+		valid,
+		final_compression_pct.label("final_compression_pct"),
+		func.avg(final_compression_pct).over(partition_by=valid.c.series_id).label("avg_final_compression_pct")
+	).subquery()
+	experiment = with_final_compression.c
+
+	displacement = experiment.height_m - experiment.height_under_load
+	compressed_with_force = and_(experiment.force_in_y_direction.isnot(None), displacement > 0)
+	return select(
+		experiment.series_id,
+		func.count().label("num_valid_experiments"),
+		func.avg(experiment.final_height - experiment.height_m).label("avg_height_loss"),
+		func.avg(experiment.final_height).label("avg_final_height"),
+		func.avg(experiment.equilibrium_after_seconds).label("avg_equilibrium_time"),
+		func.avg(case((compressed_with_force, (displacement / experiment.height_m) * 100))).label("avg_compression_pct"),
+		func.max(case((compressed_with_force, (displacement / experiment.height_m) * 100))).label("max_compression_pct"),
+		func.min(case((compressed_with_force, (displacement / experiment.height_m) * 100))).label("min_compression_pct"),
+		func.avg(case((and_(compressed_with_force, func.abs(experiment.force_in_y_direction) > 0),
+			func.abs(experiment.force_in_y_direction) / displacement))).label("avg_sweep_stiffness"),
+		func.max(func.abs(experiment.force_in_y_direction)).label("max_valid_force"),
+		func.max(experiment.avg_final_compression_pct).label("avg_final_compression_pct"),
+		func.sum((experiment.final_compression_pct - experiment.avg_final_compression_pct) * (experiment.final_compression_pct - experiment.avg_final_compression_pct)).label("squared_deviations"),
+		func.min(experiment.final_compression_pct).label("min_final_compression_pct"),
+		func.max(experiment.final_compression_pct).label("max_final_compression_pct")
+	).group_by(experiment.series_id)
+
+
+def select_force_no_force_aggregates(session, experiment_series_ids=None, group_name_like=None):
+	"""{series id: force_no_force summary metrics} over the valid experiments (see force_no_force_valid_experiments_subquery)"""
+	rows = session.execute(
+		_force_no_force_statement(*_filters(experiment_series_ids, group_name_like)),
+		_parameters(experiment_series_ids, group_name_like)
+	).mappings().all()
+
+	aggregates = {}
+	for row in rows:
+		aggregate = dict(row)
+		series_id = aggregate.pop("series_id")
+		squared_deviations = aggregate.pop("squared_deviations")
+		num_valid_experiments = aggregate["num_valid_experiments"]
+		# The spread of the final compression needs at least 2 experiments
+		if num_valid_experiments >= 2:
+			aggregate["std_final_compression_pct"] = math.sqrt(squared_deviations / (num_valid_experiments - 1))
+		else:
+			for key in ("avg_final_compression_pct", "min_final_compression_pct", "max_final_compression_pct"):
+				aggregate[key] = None
+			aggregate["std_final_compression_pct"] = None
+		aggregates[series_id] = aggregate
+	return aggregates
@@ -0,0 +1,210 @@
+import statistics
+from collections import defaultdict
+
+from sqlalchemy.orm import contains_eager
+
+from database.models.experiment_series_model import ExperimentSeries
+from database.models.experiment_model import Experiment
+from database.models.series_summary_model import SeriesSummary
+from database.queries.data_version_queries import bump_data_version
+from database.queries.series_aggregate_queries import FORCE_COLUMNS, select_experiment_counts, select_target_force_aggregates, select_force_no_force_aggregates
+
+SUMMARY_METRICS = [column.key for column in SeriesSummary.__table__.columns if column.key not in ("experiment_series_id", "updated_at")]
+
+
+def _target_experiment(experiments, height_m, force_column, target_height_reduction):
+	"""Non-exploded experiment with the height reduction closest to the target, at or above it"""
+	best_experiment = None
+	best_height_reduction = None
+	for experiment in experiments:
+		if experiment.time_to_bounding_box_explosion is not None:
+			continue
+		if experiment.height_under_load is None or getattr(experiment, force_column) is None:
+			continue
+
+		height_reduction = (height_m - experiment.height_under_load) / height_m
+		if height_reduction >= target_height_reduction:
+			if best_experiment is None or abs(height_reduction - target_height_reduction) < abs(best_height_reduction - target_height_reduction):
+				best_experiment = experiment
+				best_height_reduction = height_reduction
+	return best_experiment
+
+
+def _mean(values):
+	return sum(values) / len(values) if values else None
+
+
+def compute_series_summary(experiment_series, experiments, valid_experiments):
+	"""
+	Summary metrics of a series, `experiments` ordered by experiment_id and `valid_experiments`
+	the ones kept by filter_force_no_force_experiments
+	"""
+	from graphs.graph_constants import TARGET_HEIGHT_REDUCTION_PERCENT
+
+	summary = dict.fromkeys(SUMMARY_METRICS)
+	summary.update(num_experiments=len(experiments), met_target=False, num_valid_experiments=0)
+
+	height_m = experiment_series.height_m
+	if not height_m:
+		return summary
+
+	target_height_reduction = TARGET_HEIGHT_REDUCTION_PERCENT / 100
+	for force_column in FORCE_COLUMNS:
+		best_experiment = _target_experiment(experiments, height_m, force_column, target_height_reduction)
+		summary[f"target_{force_column}"] = abs(getattr(best_experiment, force_column)) if best_experiment else None
+
+	summary["met_target"] = any(
+		experiment.time_to_bounding_box_explosion is None and experiment.height_under_load is not None and
+		(height_m - experiment.height_under_load) / height_m >= target_height_reduction
+		for experiment in experiments
+	)
+
+	if experiments:
+		max_force = 0
+		max_compression_pct = 0
+		for experiment in experiments:
+			if experiment.time_to_bounding_box_explosion is not None:
+				continue
+			if experiment.height_under_load is None or experiment.force_in_y_direction is None:
+				continue
+			force = abs(experiment.force_in_y_direction)
+			if force > max_force:
+				max_force = force
+				max_compression_pct = ((height_m - experiment.height_under_load) / height_m) * 100
+		summary["max_survivable_force"] = max_force
+		summary["max_survivable_compression_pct"] = max_compression_pct
+
+	summary["num_valid_experiments"] = len(valid_experiments)
+	if not valid_experiments:
+		return summary
+
+	summary["avg_height_loss"] = _mean([experiment.final_height - height_m for experiment in valid_experiments])
+	summary["avg_final_height"] = _mean([experiment.final_height for experiment in valid_experiments])
+	summary["avg_equilibrium_time"] = _mean([
+		experiment.equilibrium_after_seconds for experiment in valid_experiments if experiment.equilibrium_after_seconds is not None
+	])
+
+	experiments_with_force = [experiment for experiment in valid_experiments if experiment.force_in_y_direction is not None]
+	compressions = []
+	stiffnesses = []
+	for experiment in experiments_with_force:
+		displacement = height_m - experiment.height_under_load
+		force = abs(experiment.force_in_y_direction)
+		if displacement > 0:
+			compressions.append((displacement / height_m) * 100)
+			if force > 0:
+				stiffnesses.append(force / displacement)  # N/m
+	if compressions:
+		summary["avg_compression_pct"] = _mean(compressions)
+		summary["max_compression_pct"] = max(compressions)
+		summary["min_compression_pct"] = min(compressions)
+	summary["avg_sweep_stiffness"] = _mean(stiffnesses)
+	if experiments_with_force:
+		summary["max_valid_force"] = max(abs(experiment.force_in_y_direction) for experiment in experiments_with_force)
+
+	final_compression_pcts = [((height_m - experiment.final_height) / height_m) * 100 for experiment in valid_experiments]
+	if len(final_compression_pcts) >= 2:
+		summary["avg_final_compression_pct"] = statistics.mean(final_compression_pcts)
+		summary["std_final_compression_pct"] = statistics.stdev(final_compression_pcts)
+		summary["min_final_compression_pct"] = min(final_compression_pcts)
+		summary["max_final_compression_pct"] = max(final_compression_pcts)
+
+	return summary
+
+
+def compute_series_summaries(session, series_by_id):
+	"""
+	{series id: summary} computed in Python over the loaded experiments, the definition the SQL
+	aggregates of aggregate_series_summaries follow
+	"""
+	from database.queries.graph_queries import filter_force_no_force_experiments_by_series
+
+	experiments = session.query(Experiment).filter(
+		Experiment.experiment_series_id.in_(list(series_by_id))
+	).order_by(Experiment.experiment_series_id, Experiment.experiment_id).all()
+	grouped = defaultdict(list)
+	for experiment in experiments:
+		grouped[experiment.experiment_series_id].append(experiment)
+	valid_experiments = filter_force_no_force_experiments_by_series(
+		experiments, {experiment_series_id: series.height_m for experiment_series_id, series in series_by_id.items()}
+	)
+
+	return {
+		experiment_series_id: compute_series_summary(series, grouped[experiment_series_id], valid_experiments[experiment_series_id])
+		for experiment_series_id, series in series_by_id.items()
+	}
+
+
+def aggregate_series_summaries(session, series_by_id, all_series=False):
+	"""
+	{series id: summary} computed by SQLite with GROUP BY and window functions, without loading
+	the experiments. With `all_series`, the queries scan the whole table instead of filtering by id.
+	"""
+	from graphs.graph_constants import TARGET_HEIGHT_REDUCTION_PERCENT
+
+	experiment_series_ids = None if all_series else list(series_by_id)
+	num_experiments = select_experiment_counts(session, experiment_series_ids)
+	target_force_aggregates = select_target_force_aggregates(session, TARGET_HEIGHT_REDUCTION_PERCENT / 100, experiment_series_ids)
+	force_no_force_aggregates = select_force_no_force_aggregates(session, experiment_series_ids)
+
+	summaries = {}
+	for experiment_series_id, series in series_by_id.items():
+		summary = dict.fromkeys(SUMMARY_METRICS)
+		summary.update(num_experiments=num_experiments.get(experiment_series_id, 0), met_target=False, num_valid_experiments=0)
+		if series.height_m and summary["num_experiments"]:
+			summary.update(max_survivable_force=0, max_survivable_compression_pct=0)
+		summary.update(target_force_aggregates.get(experiment_series_id, {}))
+		summary.update(force_no_force_aggregates.get(experiment_series_id, {}))
+		summaries[experiment_series_id] = summary
+	return summaries
+
+
+def refresh_series_summaries(session, experiment_series_names=None):
+	"""
+	Recompute the summaries of the given series (all series when None) from their experiments
+	and bump the data version, without committing. Called by every query that changes
+	experiments or series metrics, the single-row inserts leave it to their caller, which
+	refreshes once per run or batch.
+	"""
+	query = session.query(ExperimentSeries)
+	if experiment_series_names is not None:
+		experiment_series_names = list(experiment_series_names)
+		if not experiment_series_names:
+			return
+		query = query.filter(ExperimentSeries.experiment_series_name.in_(experiment_series_names))
+	series_by_id = {series.id: series for series in query.all()}
+	if not series_by_id:
+		return
+
+	bump_data_version(session)
+	session.flush()
+	summaries = aggregate_series_summaries(session, series_by_id, all_series=experiment_series_names is None)
+	for experiment_series_id, summary in summaries.items():
+		session.merge(SeriesSummary(experiment_series_id=experiment_series_id, **summary))
+
+
+def refresh_series_summary(session, experiment_series_name):
+	refresh_series_summaries(session, [experiment_series_name])
+
+
+def select_series_summaries(session, group_name_like=None, group_name=None):
+	"""
+	(series, summary) pairs ordered by series name, optionally for the series whose group name matches.
+	A series without a summary row yet (a new series, or a database migrated without
+	`make rebuild_series_summaries`) gets one computed by SQLite, which is not stored.
+	"""
+	query = session.query(ExperimentSeries, SeriesSummary).outerjoin(
+		SeriesSummary, SeriesSummary.experiment_series_id == ExperimentSeries.id
+	).options(contains_eager(SeriesSummary.series))  # not the inner join of the relationship
+	if group_name_like is not None:
+		query = query.filter(ExperimentSeries.group_name.like(group_name_like))
+	if group_name is not None:
+		query = query.filter(ExperimentSeries.group_name == group_name)
+	rows = query.order_by(ExperimentSeries.experiment_series_name).all()
+
+	missing = {series.id: series for series, summary in rows if summary is None}
+	computed = aggregate_series_summaries(session, missing) if missing else {}
+	return [
+		(series, summary if summary is not None else SeriesSummary(experiment_series_id=series.id, **computed[series.id]))
+		for series, summary in rows
+	]
@@ -0,0 +1,114 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from database.models.simulation_cache_model import SimulationCacheEntry
+
+# Least recently used entries beyond this are evicted
+MAX_SIMULATION_CACHE_ENTRIES = 50000
+
+# Fields of an experiment record that belong to the experiment, not to the simulation result
+_EXPERIMENT_IDENTITY_FIELDS = ("experiment_series_name", "experiment_id")
+
+
+def select_cached_result(session, config_fingerprint):
+	"""The cached entry for a fingerprint, or None. A hit refreshes the entry for eviction"""
+	entry = session.get(SimulationCacheEntry, config_fingerprint)
+	if entry is None:
+		return None
+
+	entry.hit_count += 1
+	entry.last_used_at = datetime.utcnow()
+	return entry
+
+
+def cached_result_as_record(entry, experiment_series_name, experiment_id):
+	"""(record, cycle_records) of a cached entry for an experiment of another series"""
+	result = json.loads(entry.result_json)
+	record = {**result["experiment"], "experiment_series_name": experiment_series_name, "experiment_id": experiment_id}
+	return record, result["cycles"]
+
+
+def _new_cache_entry(record, cycle_records):
+	result = {
+		"experiment": {key: value for key, value in record.items() if key not in _EXPERIMENT_IDENTITY_FIELDS},
+		"cycles": list(cycle_records),
+	}
+	return SimulationCacheEntry(
+		config_fingerprint=record["config_fingerprint"],
+		result_json=json.dumps(result, default=str),
+		source_experiment_series_name=record.get("experiment_series_name"),
+		source_experiment_id=record.get("experiment_id"),
+		last_used_at=datetime.utcnow(),
+		hit_count=0
+	)
+
+
+def insert_cached_result(session, record, cycle_records=()):
+	"""Cache the result of an experiment under its config fingerprint (no-op without a fingerprint)"""
+	config_fingerprint = record.get("config_fingerprint")
+	if not config_fingerprint:
+		return
+
+	# Same fingerprint, same result: the first stored entry is kept with its hit statistics
+	if session.get(SimulationCacheEntry, config_fingerprint) is not None:
+		return
+
+	try:
+		session.add(_new_cache_entry(record, cycle_records))
+		session.commit()
+	except SQLAlchemyError:
+		session.rollback()
+		raise
+
+
+def add_cached_results(session, results):
+	"""Add the results returned by workers to the cache without committing (see add_experiment_records)"""
+	fingerprints = {result["experiment"].get("config_fingerprint") for result in results} - {None, ""}
+	if not fingerprints:
+		return
+	cached = {
+		fingerprint for fingerprint, in session.query(SimulationCacheEntry.config_fingerprint).filter(
+			SimulationCacheEntry.config_fingerprint.in_(fingerprints)
+		)
+	}
+	for result in results:
+		config_fingerprint = result["experiment"].get("config_fingerprint")
+		if config_fingerprint in fingerprints and config_fingerprint not in cached:
+			session.add(_new_cache_entry(result["experiment"], result["cycles"]))
+			cached.add(config_fingerprint)
+
+
+def evict_simulation_cache(session, max_entries=MAX_SIMULATION_CACHE_ENTRIES):
+	"""Delete the least recently used entries beyond max_entries, returns how many were evicted"""
+	count = session.query(func.count(SimulationCacheEntry.config_fingerprint)).scalar()
+	if count <= max_entries:
+		return 0
+
+	evicted_fingerprints = select(SimulationCacheEntry.config_fingerprint).order_by(
+		SimulationCacheEntry.last_used_at
+	).limit(count - max_entries)
+	evicted = session.query(SimulationCacheEntry).filter(
+		SimulationCacheEntry.config_fingerprint.in_(evicted_fingerprints)
+	).delete(synchronize_session=False)
+	session.commit()
+	return evicted
+
+
+def select_simulation_cache_statistics(session):
+	entries, total_hits = session.query(
+		func.count(SimulationCacheEntry.config_fingerprint),
+		func.coalesce(func.sum(SimulationCacheEntry.hit_count), 0)
+	).one()
+	return {
+		"entries": entries,
+		"total_hits": total_hits,
+		"max_entries": MAX_SIMULATION_CACHE_ENTRIES,
+	}
+
+
+def delete_simulation_cache(session):
+	session.query(SimulationCacheEntry).delete()
+	session.commit()
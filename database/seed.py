@@ -5,8 +5,9 @@ sys.path.append(str(project_root))
 
 from database.session import SessionLocal
 from database.models import ExperimentSeries
+from database.queries.experiment_series_queries import select_experiment_series_by_name
 
 session = SessionLocal()
-if not session.get(ExperimentSeries, "_default"):
+if not select_experiment_series_by_name(session, "_default"):
 	session.add(ExperimentSeries(experiment_series_name="_default", num_experiments=10, max_simulation_time=5.0, final_force_in_y_direction=-0.5,))
 	session.commit()
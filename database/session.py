@@ -1,15 +1,86 @@
+import atexit
 import os
 from sqlalchemy import create_engine, event
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
 from typing import Optional
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 db_path = os.path.join(project_root, 'database.db')
-engine = create_engine(f"sqlite:///{db_path}", echo=False, future=True)
+
+# With WAL journaling readers see the last committed state while a batch is being written,
+# instead of waiting for the rollback journal of the writer
+SQLITE_PRAGMAS = {
+	"journal_mode": "WAL",
+	"synchronous": "NORMAL",  # durable at checkpoints, safe against corruption in WAL mode
+	"cache_size": -65536,  # negative is KiB: 64 MiB page cache per connection
+	"mmap_size": 268435456,  # 256 MiB of the database file read through mmap
+	"busy_timeout": 30000,  # ms a writer waits for another writer instead of "database is locked"
+	"temp_store": "MEMORY",
+	"foreign_keys": "ON",
+}
+READ_WRITE_POOL_SIZE = 2
+READ_ONLY_POOL_SIZE = 8
+
+
+def _set_pragmas(pragmas):
+	def on_connect(dbapi_connection, connection_record):
+		cursor = dbapi_connection.cursor()
+		for name, value in pragmas.items():
+			cursor.execute(f"PRAGMA {name}={value}")
+		cursor.close()
+	return on_connect
+
+
+def create_database_engine(path, read_only=False, pragmas=None):
+	"""
+	Engine for the SQLite database at `path`.
+
+	The read-write engine keeps a small pool, SQLite allows one writer at a time anyway. The read-only
+	engine has a larger pool for pages and graphs that never write, its connections refuse writes
+	(query_only) without opening the file with mode=ro, which cannot create the WAL index files.
+	"""
+	pragmas = dict(SQLITE_PRAGMAS if pragmas is None else pragmas)
+	if read_only:
+		# The journal mode is a property of the file, set by the read-write engine
+		pragmas.pop("journal_mode", None)
+		pragmas["query_only"] = "ON"
+		pool_size = READ_ONLY_POOL_SIZE
+	else:
+		pool_size = READ_WRITE_POOL_SIZE
+
+	database_engine = create_engine(f"sqlite:///{path}", echo=False, future=True, pool_size=pool_size, max_overflow=pool_size)
+	event.listen(database_engine, "connect", _set_pragmas(pragmas))
+	return database_engine
+
+
+def checkpoint_database(database_engine):
+	"""
+	Copy the commits waiting in the WAL file (database.db-wal) into the database file and
+	truncate the WAL, so database.db alone holds every commit
+	"""
+	try:
+		with database_engine.connect() as connection:
+			connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+	except SQLAlchemyError as error:
+		print(f"⚠️ Could not checkpoint the database, recent commits are still in the WAL file: {error}")
+
+
+engine = create_database_engine(db_path)
+read_only_engine = create_database_engine(db_path, read_only=True)
 SessionLocal = sessionmaker(bind=engine)
+ReadOnlySessionLocal = sessionmaker(bind=read_only_engine)
+
 
-event.listen(engine, "connect", lambda conn, rec: conn.execute("PRAGMA foreign_keys=ON"))
+@atexit.register
+def _dispose_engines():
+	# The database file is versioned, it must not depend on the untracked WAL file. Without
+	# a WAL file there is nothing to checkpoint, and connecting would switch the file to WAL
+	if os.path.exists(f"{db_path}-wal"):
+		checkpoint_database(engine)
+	engine.dispose()
+	read_only_engine.dispose()
 
 
 # Global singleton session instance
@@ -64,3 +135,16 @@ def scoped_session():
 		raise
 	finally:
 		session.close()
+
+
+@contextmanager
+def read_only_session():
+	"""
+	Like scoped_session(), on the read-only engine. Never blocks on a batch being written,
+	it reads the last committed state.
+	"""
+	session = ReadOnlySessionLocal()
+	try:
+		yield session
+	finally:
+		session.close()
@@ -1 +1,6 @@
-from experiments.run_experiments import run_experiments, run_a_single_experiment, run_non_experiment, run_visual_simulation_experiment
\ No newline at end of file
+from experiments.run_experiments import run_experiments, run_a_single_experiment, run_non_experiment, run_stiffness_analysis, run_visual_simulation_experiment
+from experiments.multi_fidelity import run_multi_fidelity_experiments
+from experiments.preflight import run_preflight_probe, PreflightReport
+from experiments.scheduler import run_experiment_campaign
+from experiments.worker_pool import get_worker_pool, shutdown_worker_pool
+from experiments.job_queue import enqueue_campaign, wait_for_campaign, ingest_result_bundles
\ No newline at end of file
@@ -1,12 +1,16 @@
 import pychrono as chrono
+from dataclasses import asdict
 
 from config import ExperimentConfig
 
 from util import  take_model_screenshot, take_final_screenshot, take_video_screenshot, make_video_from_frames, reset_structural_integrity_state
 
 from database.queries.experiment_series_queries import update_experiment_series
-from database.queries.experiments_queries import insert_experiment
+from database.queries.experiments_queries import insert_experiment, insert_experiment_cycles
+from database.queries.series_summary_queries import refresh_series_summary
+from database.queries.simulation_cache_queries import insert_cached_result
 from database.session import get_session, close_global_session
+from experiments.fingerprint import experiment_fingerprint
 
 def experiment_loop(experiment_series, experiment_config: ExperimentConfig):
 
@@ -40,7 +44,7 @@ def experiment_loop(experiment_series, experiment_config: ExperimentConfig):
     from structure import create_floor, create_braid_structure
 
     floor = create_floor(system, floor_material)
-    nodes, node_positions, beam_elements = create_braid_structure(braid_mesh, strand_material, tape_material, experiment_series)
+    nodes, node_positions, beam_elements = create_braid_structure(braid_mesh, strand_material, tape_material, experiment_series, experiment_config.num_beam_segments)
 
 
 
@@ -105,25 +109,70 @@ def experiment_loop(experiment_series, experiment_config: ExperimentConfig):
         
             return
 
+    ####################################################################################################
+    # Stiffness analysis
+    ####################################################################################################
+
+    if experiment_config.is_stiffness_run:
+        from forces import is_in_equilibrium, reset_equilibrium_state, measure_tangent_stiffness
+
+        reset_equilibrium_state()
+        reset_structural_integrity_state()
+
+        # Settle under gravity, then measure the tangent stiffness around the settled state
+        timestep = experiment_config.timestep
+        while system.GetChTime() < experiment_config.max_simulation_time:
+            system.DoStepDynamics(timestep)
+            max_beam_strain = calculate_has_exploded(system.GetChTime(), beam_elements, initial_bounds, experiment_series)[1]
+            if is_in_equilibrium(max_beam_strain):
+                break
+
+        stiffness = measure_tangent_stiffness(system, nodes, beam_elements)
+        print(f"{'Axial stiffness:':25} {stiffness.axial_stiffness} N/m")
+        print(f"{'Lateral stiffness:':25} {stiffness.lateral_stiffness} N/m")
+        print(f"{'Torsional stiffness:':25} {stiffness.torsional_stiffness} N·m/rad")
+
+        update_experiment_series(session, experiment_series_name, stiffness.to_dict())
+        session.commit()
+        close_global_session()
+        return
+
     ####################################################################################################
     # Applying Forces
     ####################################################################################################
 
     # api.projectchrono.org/loads.html
 
-    from forces import apply_loads, reset_loads, is_in_equilibrium, reset_equilibrium_state
+    from forces import attach_load_profile, is_in_equilibrium, reset_equilibrium_state
+    from config import create_load_profile
 
     # Reset all stateful function states for this experiment
     reset_equilibrium_state()
     reset_structural_integrity_state()
-    
-    apply_loads(nodes, experiment_config)
+
+    # The load schedule is evaluated by the solver, so releasing the force needs no per-step work here
+    load_profile = create_load_profile(experiment_series)
+    release_seconds = load_profile.release_seconds
+    _, nodal_forces = attach_load_profile(system, nodes, experiment_config, load_profile)
+
+    # Cyclic experiments measure every load/unload cycle (hysteresis) within this single simulation
+    from config.load_profile import CYCLIC_PROFILE
+    from util import CyclicLoadTracker
+
+    cycle_tracker = None
+    if load_profile.kind == CYCLIC_PROFILE:
+        cycle_tracker = CyclicLoadTracker(
+            load_profile,
+            [node for node, _ in nodal_forces],
+            [force for _, force in nodal_forces],
+            beam_elements
+        )
 
 
     ####################################################################################################
     # Simulation loop
     ####################################################################################################
-    timestep = 0.01
+    timestep = experiment_config.timestep
     
     equilibrium_after_seconds = None
     height_under_load = None
@@ -131,11 +180,12 @@ def experiment_loop(experiment_series, experiment_config: ExperimentConfig):
     while visualization is None or visualization.Run():
         system.DoStepDynamics(timestep)
         time_passed = system.GetChTime()
-        
-        if (experiment_series.reset_force_after_seconds is not None) and (time_passed > experiment_series.reset_force_after_seconds):
-            if height_under_load is None:
-                height_under_load = calculate_model_height(beam_elements)
-            reset_loads(nodes)
+
+        if cycle_tracker is not None:
+            cycle_tracker.update(time_passed)
+
+        if (release_seconds is not None) and (height_under_load is None) and (time_passed > release_seconds):
+            height_under_load = calculate_model_height(beam_elements)
 
 
         (
@@ -155,8 +205,8 @@ def experiment_loop(experiment_series, experiment_config: ExperimentConfig):
         structure_is_in_equilibrium = is_in_equilibrium(max_beam_strain)
 
         if structure_is_in_equilibrium and equilibrium_after_seconds is None:
-            if experiment_series.reset_force_after_seconds is not None:
-                equilibrium_after_seconds = time_passed - experiment_series.reset_force_after_seconds
+            if release_seconds is not None:
+                equilibrium_after_seconds = time_passed - release_seconds
             else:
                 equilibrium_after_seconds = time_passed
             if height_under_load is None:
@@ -170,7 +220,7 @@ def experiment_loop(experiment_series, experiment_config: ExperimentConfig):
             visualization.EndScene()
 
         structure_exploded = time_to_bounding_box_explosion is not None
-        reset_done = (experiment_series.reset_force_after_seconds is None) or (time_passed > experiment_series.reset_force_after_seconds)
+        reset_done = (release_seconds is None) or (time_passed > release_seconds)
         times_up = time_passed > experiment_config.max_simulation_time
 
 
@@ -178,9 +228,26 @@ def experiment_loop(experiment_series, experiment_config: ExperimentConfig):
 
             final_height = calculate_model_height(beam_elements)
 
-            if height_under_load is None and experiment_series.reset_force_after_seconds is None:
+            if height_under_load is None and release_seconds is None:
                 height_under_load = final_height
 
+            cycles = []
+            if cycle_tracker is not None:
+                cycles = cycle_tracker.finish()
+                # For cyclic loading the height under load is the peak compression of the last cycle
+                height_under_load = cycle_tracker.last_cycle_min_height()
+
+            if experiment_config.is_probe_run:
+                close_global_session()
+                return {
+                    "exploded": structure_exploded,
+                    "equilibrium_after_seconds": equilibrium_after_seconds,
+                    "simulated_seconds": time_passed,
+                    "height_under_load": None if structure_exploded else height_under_load,
+                    "max_beam_strain": max_beam_strain,
+                    "max_node_velocity": max_node_velocity,
+                }
+
             if structure_exploded:
                 final_height = None
                 height_under_load = None
@@ -194,26 +261,41 @@ def experiment_loop(experiment_series, experiment_config: ExperimentConfig):
 
             take_final_screenshot(visualization, experiment_series_name, experiment_config.experiment_id)
 
-            insert_experiment(
-                session,
-                experiment_config.experiment_id,
-                experiment_series_name,
-                experiment_config.force_in_y_direction,
-                experiment_config.force_top_nodes_in_y_direction,
-                experiment_config.force_in_x_direction,
-                experiment_config.force_in_z_direction,
-                experiment_config.torsional_force,
-                equilibrium_after_seconds,
-                time_to_bounding_box_explosion,
-                max_bounding_box_volume,
-                time_to_beam_strain_exceed_explosion,
-                max_beam_strain,
-                time_to_node_velocity_spike_explosion,
-                max_node_velocity,
-                height_under_load,
-                final_height
-            )
-            session.commit()
+            record = {
+                "experiment_id": experiment_config.experiment_id,
+                "experiment_series_name": experiment_series_name,
+                "force_in_y_direction": experiment_config.force_in_y_direction,
+                "force_top_nodes_in_y_direction": experiment_config.force_top_nodes_in_y_direction,
+                "force_in_x_direction": experiment_config.force_in_x_direction,
+                "force_in_z_direction": experiment_config.force_in_z_direction,
+                "torsional_force": experiment_config.torsional_force,
+                "equilibrium_after_seconds": equilibrium_after_seconds,
+                "time_to_bounding_box_explosion": time_to_bounding_box_explosion,
+                "max_bounding_box_volume": max_bounding_box_volume,
+                "time_to_beam_strain_exceed_explosion": time_to_beam_strain_exceed_explosion,
+                "max_beam_strain": max_beam_strain,
+                "time_to_node_velocity_spike_explosion": time_to_node_velocity_spike_explosion,
+                "max_node_velocity": max_node_velocity,
+                "height_under_load": height_under_load,
+                "final_height": final_height,
+                "num_beam_segments": experiment_config.num_beam_segments,
+                "fidelity": experiment_config.fidelity,
+                "config_fingerprint": experiment_fingerprint(experiment_series, experiment_config)
+            }
+            cycle_records = [asdict(cycle) for cycle in cycles] if not structure_exploded else []
+
+            result = None
+            if experiment_config.store_results:
+                experiment = insert_experiment(session, **record)
+                if cycles and not structure_exploded:
+                    insert_experiment_cycles(session, experiment.id, cycles)
+                # A standalone run stores a single experiment, the series is refreshed once for it
+                refresh_series_summary(session, experiment_series_name)
+                session.commit()
+                insert_cached_result(session, record, cycle_records)
+            else:
+                # The caller stores the result (e.g. a job worker writing a result bundle)
+                result = {"experiment": record, "cycles": cycle_records}
             close_global_session()
 
             if experiment_config.will_record_video:
@@ -224,5 +306,5 @@ def experiment_loop(experiment_series, experiment_config: ExperimentConfig):
                 device.closeDevice()
                 device.drop()
 
-            break
+            return result
 
@@ -0,0 +1,66 @@
+import hashlib
+import json
+
+from os_specifics import get_solver_name
+
+# Bump when a change to the simulation code changes the results of otherwise identical experiments
+SIMULATION_CODE_VERSION = "1"
+
+# Everything on an experiment series that affects the physics of its experiments.
+# Names, groups, descriptions and the number of experiments do not.
+PHYSICS_SERIES_FIELDS = (
+	"max_simulation_time",
+	"bounding_box_volume_threshold",
+	"beam_strain_threshold",
+	"node_velocity_threshold",
+	"reset_force_after_seconds",
+	"load_profile",
+	"load_ramp_seconds",
+	"load_cycle_period_seconds",
+	"num_load_cycles",
+	"load_cycle_amplitudes",
+)
+
+# The geometry and material of a series, the measured tangent stiffness depends on these alone
+STRUCTURE_SERIES_FIELDS = (
+	"num_strands",
+	"num_layers",
+	"radius",
+	"pitch",
+	"radius_taper",
+	"strand_radius",
+	"material_youngs_modulus",
+)
+PHYSICS_SERIES_FIELDS += STRUCTURE_SERIES_FIELDS
+
+PHYSICS_CONFIG_FIELDS = (
+	"force_in_y_direction",
+	"force_top_nodes_in_y_direction",
+	"force_in_x_direction",
+	"force_in_z_direction",
+	"torsional_force",
+	"num_beam_segments",
+	"timestep",
+)
+
+
+def _canonical_value(value):
+	# Interpolated forces differ in the last bits depending on how they were computed
+	if isinstance(value, float):
+		return float(f"{value:.12g}")
+	return value
+
+
+def physics_inputs(experiment_series, experiment_config):
+	"""The canonical description of everything that determines the result of an experiment"""
+	inputs = {field: _canonical_value(getattr(experiment_series, field)) for field in PHYSICS_SERIES_FIELDS}
+	inputs.update({field: _canonical_value(getattr(experiment_config, field)) for field in PHYSICS_CONFIG_FIELDS})
+	inputs["solver"] = get_solver_name()
+	inputs["code_version"] = SIMULATION_CODE_VERSION
+	return inputs
+
+
+def experiment_fingerprint(experiment_series, experiment_config):
+	"""SHA-256 of the physics inputs, identical experiments have identical fingerprints across series"""
+	canonical = json.dumps(physics_inputs(experiment_series, experiment_config), sort_keys=True, separators=(",", ":"))
+	return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,119 @@
+import glob
+import json
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from database.models.experiment_job_model import JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED
+from database.queries.experiments_queries import insert_experiment_record, select_experiment_series_ids
+from database.queries.series_summary_queries import refresh_series_summary, refresh_series_summaries
+from database.queries.simulation_cache_queries import insert_cached_result
+from database.queries.job_queries import insert_experiment_jobs, select_campaign_progress, fail_expired_jobs
+from database.session import scoped_session
+from experiments.scheduler import schedule_experiments
+
+# Shared directory the job workers drop their result bundles into, when not writing to the database
+RESULT_BUNDLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "job_results")
+INGESTED_DIR_NAME = "ingested"
+
+
+def enqueue_campaign(experiment_series_list, preflight_reports=None, resume=False, use_cache=True):
+	"""
+	Put every experiment of the series in the job queue, longest job first. Returns the campaign id.
+	With `resume`, only the missing and stale experiments are enqueued, with `use_cache`
+	the experiments found in the simulation cache are stored right away.
+	"""
+	campaign_id = f"{datetime.utcnow():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+	scheduled = schedule_experiments(experiment_series_list, preflight_reports, resume, use_cache)
+	with scoped_session() as session:
+		insert_experiment_jobs(session, campaign_id, scheduled)
+	print(f"Enqueued {len(scheduled)} experiments as campaign {campaign_id}")
+	return campaign_id
+
+
+def ingest_result_bundles(results_dir, campaign_id=None):
+	"""Insert the result bundles written by job workers and move them to results_dir/ingested"""
+	pattern = f"{campaign_id}_*.json" if campaign_id else "*.json"
+	paths = sorted(glob.glob(os.path.join(results_dir, pattern)))
+	if not paths:
+		return 0
+
+	ingested_dir = os.path.join(results_dir, INGESTED_DIR_NAME)
+	os.makedirs(ingested_dir, exist_ok=True)
+
+	bundles = []
+	for path in paths:
+		with open(path) as file:
+			bundles.append(json.load(file))
+	ingested_series = {bundle["experiment"]["experiment_series_name"] for bundle in bundles}
+
+	with scoped_session() as session:
+		# One id lookup per series instead of one per bundle
+		experiment_series_ids = select_experiment_series_ids(session, ingested_series)
+		for path, bundle in zip(paths, bundles):
+			experiment_series_id = experiment_series_ids.get(bundle["experiment"]["experiment_series_name"])
+			try:
+				insert_experiment_record(session, bundle["experiment"], bundle["cycles"], experiment_series_id=experiment_series_id)
+			except IntegrityError:
+				# A job whose lease expired is run again, both workers may write a bundle for it
+				print(f"⚠️ Experiment of {os.path.basename(path)} is already stored, skipping it")
+			insert_cached_result(session, bundle["experiment"], bundle["cycles"])
+			shutil.move(path, os.path.join(ingested_dir, os.path.basename(path)))
+
+		# Once per series for the whole batch
+		refresh_series_summaries(session, ingested_series)
+
+	return len(paths)
+
+
+def is_series_finished(status_counts):
+	return not status_counts.get(JOB_PENDING) and not status_counts.get(JOB_RUNNING)
+
+
+def wait_for_campaign(campaign_id, experiment_series_list, results_dir=None, on_series_complete=None, poll_seconds=5, is_alive=None):
+	"""
+	Wait for the job workers to finish a campaign, ingesting result bundles as they arrive and
+	calling the `on_series_complete` hooks as soon as all jobs of a series are done.
+	`is_alive` can report whether any worker is still running, so the wait ends if they all stopped.
+	"""
+	on_series_complete = on_series_complete or []
+	series_by_name = {series.experiment_series_name: series for series in experiment_series_list}
+	completed_series = set()
+
+	while True:
+		# Progress first: a job seen done here already has its bundle on disk for the ingest below
+		with scoped_session() as session:
+			# A job whose worker died on its last attempt is never claimed again, it would stay running
+			fail_expired_jobs(session, campaign_id)
+			progress = select_campaign_progress(session, campaign_id)
+		if results_dir is not None:
+			ingest_result_bundles(results_dir, campaign_id)
+
+		for experiment_series_name, status_counts in progress.items():
+			if experiment_series_name in completed_series or not is_series_finished(status_counts):
+				continue
+			completed_series.add(experiment_series_name)
+			# Workers writing to the database leave the summary to the orchestrator, the hooks read it
+			if results_dir is None:
+				with scoped_session() as session:
+					refresh_series_summary(session, experiment_series_name)
+			failed = status_counts.get(JOB_FAILED, 0)
+			print(f"Completed {experiment_series_name} ({status_counts.get(JOB_DONE, 0)} done, {failed} failed)")
+			for hook in on_series_complete:
+				hook(series_by_name[experiment_series_name])
+
+		total = sum(sum(status_counts.values()) for status_counts in progress.values())
+		finished = sum(status_counts.get(JOB_DONE, 0) + status_counts.get(JOB_FAILED, 0) for status_counts in progress.values())
+		print(f"Campaign {campaign_id}: {finished}/{total} experiments finished")
+
+		if len(completed_series) == len(progress):
+			return progress
+		if is_alive is not None and not is_alive():
+			print(f"⚠️ All workers stopped with {total - finished} experiments left in campaign {campaign_id}")
+			return progress
+
+		time.sleep(poll_seconds)
@@ -0,0 +1,148 @@
+"""
+Standalone experiment worker, pulls experiment jobs from the job queue until it is empty.
+
+	python -m experiments.job_worker [--campaign ID] [--results-dir DIR] [--exit-when-empty]
+
+Any number of workers, on any number of hosts that can reach the database, can work on
+the same campaign. Results go straight into the database, or with --results-dir into
+result bundles (one JSON file per experiment) that the orchestrator ingests.
+"""
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+from dataclasses import replace
+
+from sqlalchemy.exc import IntegrityError
+
+from database.queries.experiments_queries import insert_experiment_record
+from database.queries.series_summary_queries import refresh_series_summaries
+from database.queries.simulation_cache_queries import insert_cached_result
+from database.queries.job_queries import claim_next_job, heartbeat_job, complete_job, fail_job, experiment_config_from_job
+from database.session import scoped_session
+from experiments.run_experiments import run_a_single_experiment
+
+LEASE_SECONDS = 120
+HEARTBEAT_SECONDS = 30
+POLL_SECONDS = 5
+
+
+class JobHeartbeat:
+	"""Keeps the lease of a job alive from a background thread while the experiment runs"""
+
+	def __init__(self, job_id, worker_id, lease_seconds=LEASE_SECONDS, heartbeat_seconds=HEARTBEAT_SECONDS):
+		self.job_id = job_id
+		self.worker_id = worker_id
+		self.lease_seconds = lease_seconds
+		self.heartbeat_seconds = heartbeat_seconds
+		self._stopped = threading.Event()
+		self._thread = threading.Thread(target=self._run, daemon=True)
+
+	def start(self):
+		self._thread.start()
+
+	def stop(self):
+		self._stopped.set()
+		self._thread.join()
+
+	def _run(self):
+		while not self._stopped.wait(self.heartbeat_seconds):
+			try:
+				with scoped_session() as session:
+					if not heartbeat_job(session, self.job_id, self.worker_id, self.lease_seconds):
+						print(f"⚠️ Lost the lease of job {self.job_id}")
+						return
+			except Exception as error:
+				print(f"⚠️ Heartbeat of job {self.job_id} failed: {error}")
+
+
+def write_result_bundle(results_dir, job_id, campaign_id, result):
+	"""Written to a temporary file and renamed, so the orchestrator never reads a partial bundle"""
+	os.makedirs(results_dir, exist_ok=True)
+	bundle = {"job_id": job_id, "campaign_id": campaign_id, **result}
+	path = os.path.join(results_dir, f"{campaign_id}_{job_id}.json")
+	temporary_path = path + ".tmp"
+	with open(temporary_path, "w") as file:
+		json.dump(bundle, file, default=str)
+	os.replace(temporary_path, path)
+	return path
+
+
+def run_job(job_id, campaign_id, experiment_series_name, experiment_config, worker_id, results_dir=None):
+	heartbeat = JobHeartbeat(job_id, worker_id)
+	heartbeat.start()
+	try:
+		result = run_a_single_experiment(experiment_series_name, replace(experiment_config, store_results=False))
+	except Exception:
+		heartbeat.stop()
+		with scoped_session() as session:
+			fail_job(session, job_id, worker_id, traceback.format_exc())
+		return False
+	heartbeat.stop()
+
+	# The result is stored before the job is marked done, so a done job always has its result
+	if results_dir is not None:
+		write_result_bundle(results_dir, job_id, campaign_id, result)
+	else:
+		with scoped_session() as session:
+			try:
+				insert_experiment_record(session, result["experiment"], result["cycles"])
+			except IntegrityError:
+				# Stored by the worker that claimed the job again after this worker's lease expired
+				print(f"⚠️ Experiment of job {job_id} is already stored, skipping it")
+			insert_cached_result(session, result["experiment"], result["cycles"])
+
+	with scoped_session() as session:
+		if not complete_job(session, job_id, worker_id):
+			print(f"⚠️ Lost the lease of job {job_id}, the worker that claimed it again completes it")
+			return False
+	return True
+
+
+def run_job_worker(worker_id=None, campaign_id=None, results_dir=None, exit_when_empty=False, poll_seconds=POLL_SECONDS):
+	worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+	print(f"Job worker {worker_id} started")
+	completed = 0
+	# Series this worker stored experiments of since their summaries were last refreshed
+	written_series = set()
+
+	while True:
+		with scoped_session() as session:
+			job = claim_next_job(session, worker_id, LEASE_SECONDS, campaign_id)
+			if job is not None:
+				claimed = (job.id, job.campaign_id, job.experiment_series_name, experiment_config_from_job(job))
+
+		if job is None:
+			# Once per series when the queue runs dry, not once per experiment
+			if written_series:
+				with scoped_session() as session:
+					refresh_series_summaries(session, written_series)
+				written_series.clear()
+			if exit_when_empty:
+				break
+			time.sleep(poll_seconds)
+			continue
+
+		job_id, job_campaign_id, experiment_series_name, experiment_config = claimed
+		print(f"[{worker_id}] {experiment_series_name} experiment {experiment_config.experiment_id} (job {job_id})")
+		if run_job(job_id, job_campaign_id, experiment_series_name, experiment_config, worker_id, results_dir):
+			completed += 1
+			if results_dir is None:
+				written_series.add(experiment_series_name)
+
+	print(f"Job worker {worker_id} finished after {completed} experiments")
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Run experiment jobs from the job queue")
+	parser.add_argument("--worker-id", default=None)
+	parser.add_argument("--campaign", default=None, help="Only run jobs of this campaign")
+	parser.add_argument("--results-dir", default=None, help="Write result bundles here instead of into the database")
+	parser.add_argument("--exit-when-empty", action="store_true", help="Stop when there are no claimable jobs left")
+	parser.add_argument("--poll-seconds", type=float, default=POLL_SECONDS)
+	args = parser.parse_args()
+
+	run_job_worker(args.worker_id, args.campaign, args.results_dir, args.exit_when_empty, args.poll_seconds)
@@ -0,0 +1,160 @@
+import json
+import os
+from dataclasses import replace
+from datetime import datetime
+
+from config import COARSE_BEAM_SEGMENTS, FULL_BEAM_SEGMENTS
+from database.queries.experiments_queries import select_all_experiments_by_series_name, delete_experiments_by_series_name_and_ids
+from database.session import scoped_session
+from experiments.run_experiments import create_experiment_configs, run_experiment_configs
+from graphs import generate_graphs_after_experiments
+from graphs.graph_constants import TARGET_HEIGHT_REDUCTION_PERCENT
+from util.images_and_recording import get_path_with_experiment_series_name
+
+MESH_CONVERGENCE_REPORT_FILENAME = "mesh_convergence.json"
+
+
+def _has_exploded(experiment):
+	return experiment.time_to_bounding_box_explosion is not None or experiment.height_under_load is None
+
+
+def _compression_pct(experiment, initial_height):
+	if _has_exploded(experiment) or not initial_height:
+		return None
+	return (initial_height - experiment.height_under_load) / initial_height * 100
+
+
+def select_experiments_to_refine(experiments, initial_height, neighbours=1):
+	"""
+	Experiment ids of the coarse sweep that are worth confirming at full resolution:
+	the points around the target compression crossing and around the explosion boundary,
+	plus `neighbours` points on each side of them.
+	"""
+	experiments = sorted(experiments, key=lambda experiment: experiment.experiment_id)
+	boundary_indices = set()
+
+	for index, (previous, current) in enumerate(zip(experiments, experiments[1:])):
+		if _has_exploded(previous) != _has_exploded(current):
+			boundary_indices.update((index, index + 1))
+			continue
+
+		previous_compression = _compression_pct(previous, initial_height)
+		current_compression = _compression_pct(current, initial_height)
+		if previous_compression is None or current_compression is None:
+			continue
+		if (previous_compression - TARGET_HEIGHT_REDUCTION_PERCENT) * (current_compression - TARGET_HEIGHT_REDUCTION_PERCENT) <= 0:
+			boundary_indices.update((index, index + 1))
+
+	refine_indices = set()
+	for index in boundary_indices:
+		for neighbour in range(index - neighbours, index + neighbours + 1):
+			if 0 <= neighbour < len(experiments):
+				refine_indices.add(neighbour)
+
+	return sorted(experiments[index].experiment_id for index in refine_indices)
+
+
+def _relative_difference(coarse, fine):
+	if coarse is None or fine is None or fine == 0:
+		return None
+	return abs(coarse - fine) / abs(fine)
+
+
+def build_mesh_convergence_report(experiment_series, coarse_experiments, fine_experiments, coarse_segments, fine_segments):
+	"""Compare the coarse and full resolution results of the refined points of a sweep"""
+	coarse_by_id = {experiment.experiment_id: experiment for experiment in coarse_experiments}
+
+	points = []
+	for fine in sorted(fine_experiments, key=lambda experiment: experiment.experiment_id):
+		coarse = coarse_by_id.get(fine.experiment_id)
+		if coarse is None:
+			continue
+		points.append({
+			"experiment_id": fine.experiment_id,
+			"force_in_y_direction": fine.force_in_y_direction,
+			"coarse_height_under_load": coarse.height_under_load,
+			"fine_height_under_load": fine.height_under_load,
+			"height_under_load_relative_difference": _relative_difference(coarse.height_under_load, fine.height_under_load),
+			"coarse_final_height": coarse.final_height,
+			"fine_final_height": fine.final_height,
+			"coarse_exploded": _has_exploded(coarse),
+			"fine_exploded": _has_exploded(fine),
+		})
+
+	differences = [point["height_under_load_relative_difference"] for point in points if point["height_under_load_relative_difference"] is not None]
+
+	return {
+		"experiment_series_name": experiment_series.experiment_series_name,
+		"generated_at": datetime.utcnow().isoformat(),
+		"geometry": {
+			"num_strands": experiment_series.num_strands,
+			"num_layers": experiment_series.num_layers,
+			"radius": experiment_series.radius,
+			"radius_taper": experiment_series.radius_taper,
+			"pitch": experiment_series.pitch,
+			"strand_radius": experiment_series.strand_radius,
+			"material_youngs_modulus": experiment_series.material_youngs_modulus,
+		},
+		"coarse_beam_segments": coarse_segments,
+		"fine_beam_segments": fine_segments,
+		"num_coarse_experiments": len(coarse_experiments),
+		"num_refined_experiments": len(points),
+		"max_height_under_load_relative_difference": max(differences) if differences else None,
+		"mean_height_under_load_relative_difference": sum(differences) / len(differences) if differences else None,
+		"explosion_disagreements": sum(1 for point in points if point["coarse_exploded"] != point["fine_exploded"]),
+		"points": points,
+	}
+
+
+def write_mesh_convergence_report(experiment_series_name, report):
+	path = os.path.join(get_path_with_experiment_series_name(experiment_series_name), MESH_CONVERGENCE_REPORT_FILENAME)
+	with open(path, "w") as file:
+		json.dump(report, file, indent=2)
+	return path
+
+
+def run_multi_fidelity_experiments(experiment_series, coarse_segments=COARSE_BEAM_SEGMENTS, fine_segments=FULL_BEAM_SEGMENTS, neighbours=1):
+	"""
+	Two stage sweep of an experiment series:
+	1. every experiment is run on a coarse mesh (`coarse_segments` beam elements per strand segment)
+	2. only the experiments around the target compression and the explosion boundary are rerun
+	   at full resolution, their fine rows replace the coarse ones
+
+	Every row is tagged with its fidelity, and a mesh-convergence report comparing the coarse
+	and fine results of the refined points is written next to the series assets.
+	"""
+	experiment_series_name = experiment_series.experiment_series_name
+	experiment_configs = create_experiment_configs(experiment_series, num_beam_segments=coarse_segments)
+	run_experiment_configs(experiment_series_name, experiment_configs, description="Coarse screening")
+
+	with scoped_session() as session:
+		coarse_experiments = select_all_experiments_by_series_name(session, experiment_series_name)
+		session.expunge_all()
+
+	refine_ids = select_experiments_to_refine(coarse_experiments, experiment_series.height_m, neighbours)
+	print(f"Refining {len(refine_ids)} of {len(experiment_configs)} experiments at {fine_segments} beam segments: {refine_ids}")
+
+	fine_configs = [
+		replace(config, num_beam_segments=fine_segments)
+		for config in experiment_configs
+		if config.experiment_id in refine_ids
+	]
+
+	if fine_configs:
+		with scoped_session() as session:
+			delete_experiments_by_series_name_and_ids(session, experiment_series_name, refine_ids)
+		run_experiment_configs(experiment_series_name, fine_configs, description="Fine confirmation")
+
+	with scoped_session() as session:
+		fine_experiments = [
+			experiment for experiment in select_all_experiments_by_series_name(session, experiment_series_name)
+			if experiment.experiment_id in refine_ids
+		]
+		report = build_mesh_convergence_report(experiment_series, coarse_experiments, fine_experiments, coarse_segments, fine_segments)
+
+	report_path = write_mesh_convergence_report(experiment_series_name, report)
+	print(f"Mesh convergence report written to {report_path}")
+
+	generate_graphs_after_experiments(experiment_series)
+
+	return report
@@ -0,0 +1,187 @@
+import os
+import time
+from dataclasses import dataclass, field, replace
+from typing import List, Optional
+
+from config import COARSE_BEAM_SEGMENTS, FULL_BEAM_SEGMENTS, DEFAULT_TIMESTEP, create_load_profile
+from database.queries.experiment_series_queries import experiment_series_snapshot
+from experiments.run_experiments import create_experiment_configs, simulate_experiment
+from experiments.worker_pool import get_worker_pool
+
+# Probes are short: long enough to see the structure blow up or start to settle
+PROBE_SIMULATION_SECONDS = 2.0
+# Smallest timestep the probe will fall back to before refusing the series
+MIN_PROBE_TIMESTEP = DEFAULT_TIMESTEP / 4
+# Number of bisection steps used to find the largest stable part of the force range
+FORCE_RANGE_BISECTION_STEPS = 3
+
+
+@dataclass
+class ProbeResult:
+	label: str
+	force_in_y_direction: float
+	timestep: float
+	exploded: bool
+	equilibrium_after_seconds: Optional[float]
+	simulated_seconds: float
+	wall_seconds: float
+
+	@property
+	def wall_seconds_per_simulated_second(self):
+		return self.wall_seconds / self.simulated_seconds if self.simulated_seconds else 0.0
+
+
+@dataclass
+class PreflightReport:
+	experiment_series_name: str
+	timestep: float = DEFAULT_TIMESTEP
+	force_range_scale: float = 1.0  # fraction of the initial → final force range that is run
+	probes: List[ProbeResult] = field(default_factory=list)
+	adjustments: List[str] = field(default_factory=list)
+	errors: List[str] = field(default_factory=list)
+	expected_equilibrium_seconds: Optional[float] = None
+	estimated_series_wall_seconds: Optional[float] = None
+
+	@property
+	def is_runnable(self):
+		return not self.errors
+
+	def summary(self):
+		lines = [f"Pre-flight probe for {self.experiment_series_name}:"]
+		for probe in self.probes:
+			status = "EXPLODED" if probe.exploded else "stable"
+			equilibrium = f"{probe.equilibrium_after_seconds:.2f} s" if probe.equilibrium_after_seconds is not None else "not reached"
+			lines.append(
+				f"  {probe.label:>8} force {probe.force_in_y_direction:10.3f} N, dt {probe.timestep:.4f} s: "
+				f"{status}, equilibrium {equilibrium}, {probe.wall_seconds:.1f} s wall"
+			)
+		for adjustment in self.adjustments:
+			lines.append(f"  adjusted: {adjustment}")
+		for error in self.errors:
+			lines.append(f"  refused: {error}")
+		if self.expected_equilibrium_seconds is not None:
+			lines.append(f"  expected equilibrium time: {self.expected_equilibrium_seconds:.2f} s")
+		if self.estimated_series_wall_seconds is not None:
+			lines.append(f"  estimated series wall time: {self.estimated_series_wall_seconds / 60:.1f} min")
+		return "\n".join(lines)
+
+
+def _probe_config(experiment_config, timestep):
+	return replace(
+		experiment_config,
+		num_beam_segments=COARSE_BEAM_SEGMENTS,
+		timestep=timestep,
+		max_simulation_time=min(experiment_config.max_simulation_time, PROBE_SIMULATION_SECONDS),
+		is_probe_run=True,
+		will_visualize=False,
+		will_record_video=False,
+		run_forever=False,
+	)
+
+
+def _run_probe(experiment_series, label, experiment_config):
+	start = time.perf_counter()
+	result = simulate_experiment(experiment_series, experiment_config)
+	return ProbeResult(
+		label=label,
+		force_in_y_direction=experiment_config.force_in_y_direction,
+		timestep=experiment_config.timestep,
+		exploded=result["exploded"],
+		equilibrium_after_seconds=result["equilibrium_after_seconds"],
+		simulated_seconds=result["simulated_seconds"],
+		wall_seconds=time.perf_counter() - start,
+	)
+
+
+def _run_probes(experiment_series, labelled_configs):
+	pool = get_worker_pool()
+	results = [pool.submit(_run_probe, experiment_series, label, config) for label, config in labelled_configs]
+	return [result.result() for result in results]
+
+
+def _estimate_series_wall_seconds(experiment_series, probes, expected_equilibrium_seconds):
+	"""Coarse probe cost scaled to full resolution and to the whole sweep on all cores"""
+	rates = [probe.wall_seconds_per_simulated_second for probe in probes if probe.simulated_seconds]
+	if not rates:
+		return None
+
+	simulated_seconds = experiment_series.max_simulation_time
+	if expected_equilibrium_seconds is not None:
+		release_seconds = create_load_profile(experiment_series).release_seconds or 0.0
+		simulated_seconds = min(simulated_seconds, release_seconds + expected_equilibrium_seconds)
+
+	resolution_factor = FULL_BEAM_SEGMENTS / COARSE_BEAM_SEGMENTS
+	waves = -(-experiment_series.num_experiments // (os.cpu_count() or 1))
+	return max(rates) * resolution_factor * simulated_seconds * waves
+
+
+def run_preflight_probe(experiment_series, narrow_force_range=False):
+	"""
+	Short, coarse, headless simulations at the lowest and highest force of the sweep.
+
+	- if the lowest force explodes, the timestep is reduced, and the series is refused
+	  when it still explodes at MIN_PROBE_TIMESTEP (bad geometry / material combination)
+	- if only the highest force explodes, the timestep is reduced first, then the series is
+	  refused naming that force, or with `narrow_force_range` the force range is narrowed
+	  to the largest part that stays stable
+	"""
+	experiment_series_name = experiment_series.experiment_series_name
+	report = PreflightReport(experiment_series_name=experiment_series_name)
+	snapshot = experiment_series_snapshot(experiment_series)
+
+	configs = create_experiment_configs(experiment_series)
+	lowest, highest = configs[0], configs[-1]
+
+	timestep = DEFAULT_TIMESTEP
+	while True:
+		probes = _run_probes(snapshot, [
+			("lowest", _probe_config(lowest, timestep)),
+			("highest", _probe_config(highest, timestep)),
+		])
+		report.probes.extend(probes)
+		if not any(probe.exploded for probe in probes) or timestep / 2 < MIN_PROBE_TIMESTEP:
+			break
+		timestep /= 2
+		report.adjustments.append(f"timestep reduced to {timestep:.4f} s")
+
+	report.timestep = timestep
+	lowest_probe, highest_probe = probes
+
+	if lowest_probe.exploded:
+		report.errors.append(
+			f"The structure explodes at the lowest force ({lowest.force_in_y_direction} N) even with a "
+			f"{timestep:.4f} s timestep, check the geometry and material of the series."
+		)
+		return report
+
+	if highest_probe.exploded and not narrow_force_range:
+		report.errors.append(
+			f"The structure explodes at the highest force ({highest.force_in_y_direction} N) even with a "
+			f"{timestep:.4f} s timestep, lower the final force of the series or let the probe narrow the force range."
+		)
+		return report
+
+	if highest_probe.exploded:
+		stable_scale, unstable_scale = 0.0, 1.0
+		for _ in range(FORCE_RANGE_BISECTION_STEPS):
+			scale = (stable_scale + unstable_scale) / 2
+			config = create_experiment_configs(experiment_series, timestep=timestep, force_range_scale=scale)[-1]
+			probe, = _run_probes(snapshot, [(f"{scale:.0%}", _probe_config(config, timestep))])
+			report.probes.append(probe)
+			if probe.exploded:
+				unstable_scale = scale
+			else:
+				stable_scale = scale
+
+		if stable_scale == 0.0:
+			report.errors.append("Only the lowest force is stable, narrow the force range of the series.")
+			return report
+
+		report.force_range_scale = stable_scale
+		report.adjustments.append(f"force range narrowed to {stable_scale:.0%} of initial → final")
+
+	equilibrium_times = [probe.equilibrium_after_seconds for probe in report.probes if not probe.exploded and probe.equilibrium_after_seconds is not None]
+	report.expected_equilibrium_seconds = max(equilibrium_times) if equilibrium_times else None
+	report.estimated_series_wall_seconds = _estimate_series_wall_seconds(experiment_series, report.probes, report.expected_equilibrium_seconds)
+
+	return report
@@ -0,0 +1,50 @@
+import time
+
+from database.queries.experiments_queries import add_experiment_records
+from database.queries.simulation_cache_queries import add_cached_results
+from database.session import scoped_session
+
+# Results are written at least this often, and as soon as this many are buffered
+FLUSH_INTERVAL_SECONDS = 5.0
+FLUSH_BATCH_SIZE = 64
+
+
+class ResultSink:
+	"""
+	Single writer for experiment results.
+
+	Workers run with `store_results=False` and return their records to the parent, which adds
+	them here. Buffered results are written in one transaction per flush, so the workers never
+	open the database and there is a single SQLite writer however many workers finish at once.
+	"""
+
+	def __init__(self, flush_interval_seconds=FLUSH_INTERVAL_SECONDS, flush_batch_size=FLUSH_BATCH_SIZE):
+		self.flush_interval_seconds = flush_interval_seconds
+		self.flush_batch_size = flush_batch_size
+		self.written = 0
+		self._buffer = []
+		self._last_flush = time.monotonic()
+
+	def add(self, result):
+		# An experiment stopped early (its visualization window was closed) returns no result
+		if result is None:
+			return
+		self._buffer.append(result)
+		if len(self._buffer) >= self.flush_batch_size or time.monotonic() - self._last_flush >= self.flush_interval_seconds:
+			self.flush()
+
+	def flush(self):
+		self._last_flush = time.monotonic()
+		if not self._buffer:
+			return
+		with scoped_session() as session:
+			add_experiment_records(session, self._buffer)
+			add_cached_results(session, self._buffer)
+		self.written += len(self._buffer)
+		self._buffer = []
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.flush()
@@ -1,23 +1,35 @@
-import os
-from multiprocessing import Pool
 from experiments.experiment import experiment_loop
+from experiments.worker_pool import get_worker_pool
 from tqdm import tqdm
-from database.queries.experiment_series_queries import select_experiment_series_by_name
+from database.queries.experiment_series_queries import select_experiment_series_by_name, experiment_series_snapshot
 from database.session import get_session, close_global_session
-from config import ExperimentConfig
+from dataclasses import replace
+from config import ExperimentConfig, FULL_BEAM_SEGMENTS, DEFAULT_TIMESTEP
 from graphs import generate_graphs_after_experiments
 
 
 def run_a_single_experiment(experiment_series_name, experiment_config: ExperimentConfig):
     session = get_session()
     experiment_series = select_experiment_series_by_name(session, experiment_series_name)
-    experiment_loop(experiment_series, experiment_config)
+    result = experiment_loop(experiment_series, experiment_config)
     close_global_session()
+    return result
 
 
-def run_experiments(experiment_series):
+def simulate_experiment(experiment_series, experiment_config: ExperimentConfig):
+    """
+    Worker side of a pooled run: simulates with a snapshot of the series (see experiment_series_snapshot)
+    and returns the result record instead of storing it, the parent writes it through a ResultSink
+    """
+    return experiment_loop(experiment_series, replace(experiment_config, store_results=False))
+
+
+def create_experiment_configs(experiment_series, num_beam_segments=FULL_BEAM_SEGMENTS, timestep=DEFAULT_TIMESTEP, force_range_scale=1.0):
+    """
+    One config per experiment of the series, with the forces interpolated from initial to final.
+    `force_range_scale` < 1 narrows the sweep towards the initial forces (see experiments.preflight).
+    """
     NUM_EXPERIMENTS = experiment_series.num_experiments
-    NUM_CONCURRENT_EXPERIMENTS = os.cpu_count()
 
     experiment_configs = []
 
@@ -33,7 +45,7 @@ def run_experiments(experiment_series):
 
     for i in range(NUM_EXPERIMENTS):
         denominator = NUM_EXPERIMENTS - 1 if NUM_EXPERIMENTS > 1 else 1 # Basically to avoid division by zero for the first experiment
-        step_ratio = i / denominator
+        step_ratio = i / denominator * force_range_scale
         config = ExperimentConfig(
             experiment_id=i + 1,
             will_visualize=True,
@@ -43,21 +55,41 @@ def run_experiments(experiment_series):
             force_in_y_direction=initial_y + (final_y - initial_y) * step_ratio,
             force_top_nodes_in_y_direction=initial_top_nodes_y + (final_top_nodes_y - initial_top_nodes_y) * step_ratio,
             force_in_x_direction=initial_x + (final_x - initial_x) * step_ratio,
-            force_in_z_direction=initial_z + (final_z - initial_z) * step_ratio
+            force_in_z_direction=initial_z + (final_z - initial_z) * step_ratio,
+            num_beam_segments=num_beam_segments,
+            timestep=timestep
         )
         
         experiment_configs.append(config)
 
-    with Pool(processes=NUM_CONCURRENT_EXPERIMENTS) as pool:
-        results = []
-        for experiment_config in experiment_configs:
-            result = pool.apply_async(run_a_single_experiment, args=(experiment_series.experiment_series_name, experiment_config))
-            results.append(result)
-        for result in tqdm(results, desc="Running experiments"):
-            result.get()
+    return experiment_configs
+
+
+def run_experiment_configs(experiment_series_name, experiment_configs, description="Running experiments"):
+    from experiments.result_sink import ResultSink
 
-    # Generate graphs after experiments complete
-    generate_graphs_after_experiments(experiment_series)
+    session = get_session()
+    experiment_series = experiment_series_snapshot(select_experiment_series_by_name(session, experiment_series_name))
+    close_global_session()
+
+    pool = get_worker_pool()
+    results = [pool.submit(simulate_experiment, experiment_series, experiment_config) for experiment_config in experiment_configs]
+    with ResultSink() as sink:
+        for result in tqdm(results, desc=description):
+            sink.add(result.result())
+
+
+def run_experiments(experiment_series, preflight_report=None, resume=False):
+    """
+    Run every experiment of the series in parallel and generate its graphs.
+    When a pre-flight report is given (see experiments.preflight), its timestep and force range are used.
+    With `resume`, experiments already stored for the same config fingerprint are not run again
+    and the simulation cache is used, without it every experiment is simulated again.
+    """
+    from experiments.scheduler import run_experiment_campaign
+
+    preflight_reports = {experiment_series.experiment_series_name: preflight_report} if preflight_report is not None else None
+    run_experiment_campaign([experiment_series], preflight_reports, on_series_complete=[generate_graphs_after_experiments], resume=resume, use_cache=resume)
 
 
 def run_non_experiment(experiment_series_name, will_visualize=True, will_record_video=False, is_non_experiment_run=True):
@@ -83,8 +115,25 @@ def run_non_experiment(experiment_series_name, will_visualize=True, will_record_
     )
     close_global_session()
 
-    with Pool(processes=1) as pool:
-        pool.apply(run_a_single_experiment, (experiment_series_name, experiment_config))
+    get_worker_pool().apply(run_a_single_experiment, (experiment_series_name, experiment_config))
+
+
+def run_stiffness_analysis(experiment_series_name):
+    """
+    Settles the structure without any force applied and measures its axial, lateral and
+    torsional tangent stiffness, which are stored on the experiment series
+    """
+    session = get_session()
+    experiment_series = select_experiment_series_by_name(session, experiment_series_name)
+
+    experiment_config = ExperimentConfig(
+        experiment_id=1,
+        is_stiffness_run=True,
+        max_simulation_time=experiment_series.max_simulation_time
+    )
+    close_global_session()
+
+    get_worker_pool().apply(run_a_single_experiment, (experiment_series_name, experiment_config))
 
 
 def run_visual_simulation_experiment(experiment_series, experiment):
@@ -101,5 +150,4 @@ def run_visual_simulation_experiment(experiment_series, experiment):
         max_simulation_time=float("inf")
     )
 
-    with Pool(processes=1) as pool:
-        pool.apply(run_a_single_experiment, (experiment_series.experiment_series_name, config))
+    get_worker_pool().apply(run_a_single_experiment, (experiment_series.experiment_series_name, config))
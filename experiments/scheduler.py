@@ -0,0 +1,190 @@
+from collections import Counter
+from dataclasses import dataclass
+
+from tqdm import tqdm
+
+from config import ExperimentConfig
+from database.queries.experiments_queries import select_experiment_fingerprints_by_series_name, delete_experiments_by_series_name_and_ids, insert_experiment_record
+from database.queries.series_summary_queries import refresh_series_summary
+from database.queries.simulation_cache_queries import select_cached_result, cached_result_as_record, evict_simulation_cache
+from database.session import scoped_session
+from experiments.fingerprint import experiment_fingerprint
+from database.queries.experiment_series_queries import experiment_series_snapshot
+from experiments.result_sink import ResultSink
+from experiments.run_experiments import create_experiment_configs, simulate_experiment
+from experiments.worker_pool import get_worker_pool
+from util import copy_final_screenshot
+
+
+@dataclass
+class ScheduledExperiment:
+	experiment_series_name: str
+	experiment_config: ExperimentConfig
+	estimated_cost: float
+
+
+def estimate_experiment_cost(experiment_series, experiment_config: ExperimentConfig):
+	"""
+	Relative cost of an experiment, used for longest-job-first ordering.
+	Proportional to the number of beam elements times the number of timesteps it can run for.
+	"""
+	num_beams = int(experiment_series.num_strands) * 2 * max(int(experiment_series.num_layers) - 1, 1)
+	num_elements = num_beams * experiment_config.num_beam_segments
+	num_timesteps = experiment_config.max_simulation_time / experiment_config.timestep
+	return num_elements * num_timesteps
+
+
+def select_experiments_to_resume(experiment_series, experiment_configs):
+	"""
+	Split a series for a resumed run into the configs that still have to run (missing, or stored
+	with a fingerprint that no longer matches) and the ids of the stored experiments to delete
+	(stale, or no longer part of the sweep).
+	"""
+	with scoped_session() as session:
+		stored_fingerprints = select_experiment_fingerprints_by_series_name(session, experiment_series.experiment_series_name)
+
+	to_run = [
+		experiment_config for experiment_config in experiment_configs
+		if stored_fingerprints.get(experiment_config.experiment_id) != experiment_fingerprint(experiment_series, experiment_config)
+	]
+	configured_ids = {experiment_config.experiment_id for experiment_config in experiment_configs}
+	rerun_ids = {experiment_config.experiment_id for experiment_config in to_run}
+	stale_ids = [
+		experiment_id for experiment_id in stored_fingerprints
+		if experiment_id not in configured_ids or experiment_id in rerun_ids
+	]
+	return to_run, sorted(stale_ids)
+
+
+@dataclass
+class SimulationCacheStats:
+	hits: int = 0
+	misses: int = 0
+	evicted: int = 0
+
+	@property
+	def hit_rate(self):
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+
+
+def serve_experiments_from_cache(experiment_series, experiment_configs, stats: SimulationCacheStats):
+	"""
+	Store the experiments whose physics inputs were already simulated (by any series) as copies of
+	the cached result, and return the configs that still have to be simulated.
+	"""
+	experiment_series_name = experiment_series.experiment_series_name
+	to_simulate = []
+	served = 0
+	with scoped_session() as session:
+		for experiment_config in experiment_configs:
+			entry = select_cached_result(session, experiment_fingerprint(experiment_series, experiment_config))
+			if entry is None:
+				stats.misses += 1
+				to_simulate.append(experiment_config)
+				continue
+
+			stats.hits += 1
+			served += 1
+			record, cycle_records = cached_result_as_record(entry, experiment_series_name, experiment_config.experiment_id)
+			source = (entry.source_experiment_series_name, entry.source_experiment_id)
+			insert_experiment_record(session, record, cycle_records, experiment_series_id=experiment_series.id)
+			copy_final_screenshot(*source, experiment_series_name, experiment_config.experiment_id)
+
+		# Once for all the copies, not once per copy
+		if served:
+			refresh_series_summary(session, experiment_series_name)
+
+	return to_simulate
+
+
+def schedule_experiments(experiment_series_list, preflight_reports=None, resume=False, use_cache=True):
+	"""
+	Flatten the experiments of all series into one queue, longest job first.
+	With `resume`, experiments already stored with the same fingerprint are skipped and stale ones are deleted.
+	With `use_cache`, experiments found in the simulation cache are stored right away instead of scheduled.
+	"""
+	preflight_reports = preflight_reports or {}
+	scheduled = []
+	cache_stats = SimulationCacheStats()
+
+	for experiment_series in experiment_series_list:
+		report = preflight_reports.get(experiment_series.experiment_series_name)
+		if report is not None:
+			experiment_configs = create_experiment_configs(experiment_series, timestep=report.timestep, force_range_scale=report.force_range_scale)
+		else:
+			experiment_configs = create_experiment_configs(experiment_series)
+
+		if resume:
+			num_configs = len(experiment_configs)
+			experiment_configs, stale_ids = select_experiments_to_resume(experiment_series, experiment_configs)
+			if stale_ids:
+				with scoped_session() as session:
+					delete_experiments_by_series_name_and_ids(session, experiment_series.experiment_series_name, stale_ids)
+			print(f"Resuming {experiment_series.experiment_series_name}: {num_configs - len(experiment_configs)} up to date, {len(experiment_configs)} to run ({len(stale_ids)} stale)")
+
+		if use_cache:
+			experiment_configs = serve_experiments_from_cache(experiment_series, experiment_configs, cache_stats)
+
+		for experiment_config in experiment_configs:
+			scheduled.append(ScheduledExperiment(
+				experiment_series_name=experiment_series.experiment_series_name,
+				experiment_config=experiment_config,
+				estimated_cost=estimate_experiment_cost(experiment_series, experiment_config)
+			))
+
+	if use_cache:
+		with scoped_session() as session:
+			cache_stats.evicted = evict_simulation_cache(session)
+		print(f"Simulation cache: {cache_stats.hits} hits, {cache_stats.misses} misses ({cache_stats.hit_rate:.0%}), {cache_stats.evicted} evicted")
+
+	scheduled.sort(key=lambda experiment: experiment.estimated_cost, reverse=True)
+	return scheduled
+
+
+def _run_scheduled_experiment(args):
+	experiment_series, experiment_config = args
+	return experiment_series.experiment_series_name, simulate_experiment(experiment_series, experiment_config)
+
+
+def run_experiment_campaign(experiment_series_list, preflight_reports=None, on_series_complete=None, resume=False, use_cache=True):
+	"""
+	Run the experiments of several series on the shared warm worker pool.
+
+	Every experiment goes into a single longest-job-first queue, so no core idles at the tail
+	of a series while other series still have work. `on_series_complete` hooks (for instance
+	graph generation) are called with the experiment series as soon as its last experiment
+	finishes, while the pool keeps working on the remaining series.
+	Workers return their results and only this process writes them, batched by a ResultSink.
+	With `resume`, only missing and stale experiments are run (see select_experiments_to_resume),
+	with `use_cache`, experiments already simulated by any series are copied from the simulation cache.
+	"""
+	on_series_complete = on_series_complete or []
+	series_by_name = {series.experiment_series_name: series for series in experiment_series_list}
+	scheduled = schedule_experiments(experiment_series_list, preflight_reports, resume, use_cache)
+	remaining = Counter(experiment.experiment_series_name for experiment in scheduled)
+
+	# Series without experiments are complete right away
+	for experiment_series_name, experiment_series in series_by_name.items():
+		if remaining[experiment_series_name] == 0:
+			for hook in on_series_complete:
+				hook(experiment_series)
+
+	if not scheduled:
+		return
+
+	snapshots = {name: experiment_series_snapshot(series) for name, series in series_by_name.items()}
+	results = get_worker_pool().imap_unordered(
+		_run_scheduled_experiment,
+		[(snapshots[experiment.experiment_series_name], experiment.experiment_config) for experiment in scheduled]
+	)
+	with ResultSink() as sink:
+		for experiment_series_name, result in tqdm(results, total=len(scheduled), desc="Running experiments"):
+			sink.add(result)
+			remaining[experiment_series_name] -= 1
+			if remaining[experiment_series_name] == 0:
+				# The hooks read the series from the database
+				sink.flush()
+				print(f"Completed {experiment_series_name}")
+				for hook in on_series_complete:
+					hook(series_by_name[experiment_series_name])
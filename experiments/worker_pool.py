@@ -0,0 +1,270 @@
+import atexit
+import collections
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future, as_completed
+
+# Modules imported once by the forkserver, every worker forked from it starts with them loaded
+PRELOADED_MODULES = [
+	"pychrono",
+	"pychrono.fea",
+	"os_specifics",
+	"physics_model",
+	"structure",
+	"forces",
+	"util",
+	"database.session",
+	"experiments.experiment",
+]
+if sys.platform != "darwin":
+	PRELOADED_MODULES.append("pychrono.pardisomkl")
+
+# A worker is replaced after this many tasks or when its resident memory grows above the threshold,
+# which bounds whatever the simulation library leaks between experiments
+MAX_TASKS_PER_WORKER = 50
+MAX_WORKER_MEMORY_MB = 2048
+
+# How often the pool checks for workers that died without reporting (e.g. a crash in the solver)
+WORKER_CHECK_INTERVAL_SECONDS = 1.0
+
+
+class WorkerCrashedError(RuntimeError):
+	pass
+
+
+class RemoteTaskError(RuntimeError):
+	"""An exception raised by a task in a worker, with the worker side traceback"""
+
+
+def _resident_memory_mb():
+	try:
+		with open("/proc/self/statm") as file:
+			resident_pages = int(file.read().split()[1])
+		return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+	except (OSError, ValueError, IndexError):
+		import resource
+		max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		# bytes on macOS, kilobytes on Linux
+		return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def _worker_loop(tasks, results, max_tasks, max_memory_mb):
+	completed = 0
+	while True:
+		task = tasks.get()
+		if task is None:
+			break
+
+		task_id, function, args, kwargs = task
+		try:
+			result, error = function(*args, **kwargs), None
+		except BaseException as exception:
+			result, error = None, f"{type(exception).__name__}: {exception}\n{traceback.format_exc()}"
+
+		# A retiring worker says so with its last result, so no further task is dispatched to it
+		completed += 1
+		retiring = completed >= max_tasks or _resident_memory_mb() > max_memory_mb
+		results.put(("done", os.getpid(), task_id, result, error, retiring))
+		if retiring:
+			break
+
+	results.put(("exit", os.getpid()))
+
+
+def _get_context():
+	if "forkserver" not in multiprocessing.get_all_start_methods():
+		return multiprocessing.get_context("spawn")
+
+	context = multiprocessing.get_context("forkserver")
+	context.set_forkserver_preload(PRELOADED_MODULES)
+	return context
+
+
+class WarmWorkerPool:
+	"""
+	Long-lived pool of simulation workers.
+
+	Workers are forked from a forkserver that has already imported pychrono, the solver and
+	the database engine, so a task does not pay the process start and import cost. Workers
+	are recycled after `max_tasks_per_worker` tasks or above `max_worker_memory_mb`, and a
+	worker that dies mid-task fails that task's future instead of hanging the pool.
+
+	Tasks wait in the pool and are dispatched one at a time to an idle worker's own queue,
+	so the pool knows which task every worker holds without the worker reporting it.
+	"""
+
+	def __init__(self, processes=None, max_tasks_per_worker=MAX_TASKS_PER_WORKER, max_worker_memory_mb=MAX_WORKER_MEMORY_MB):
+		self.processes = processes or os.cpu_count() or 1
+		self.max_tasks_per_worker = max_tasks_per_worker
+		self.max_worker_memory_mb = max_worker_memory_mb
+
+		self._context = _get_context()
+		# SimpleQueue writes synchronously, so the last result of a worker is not lost if it exits right after
+		self._results = self._context.SimpleQueue()
+		self._task_ids = itertools.count()
+		self._lock = threading.Lock()
+		self._futures = {}
+		self._pending = collections.deque()  # tasks not yet dispatched, in submission order
+		self._running = {}  # worker pid -> dispatched task id, None while idle
+		self._workers = {}  # worker pid -> process
+		self._worker_tasks = {}  # worker pid -> task queue of the worker
+		self._is_shutdown = False
+
+		with self._lock:
+			for _ in range(self.processes):
+				self._start_worker()
+
+		self._result_thread = threading.Thread(target=self._handle_results, daemon=True)
+		self._result_thread.start()
+		self._monitor_thread = threading.Thread(target=self._monitor_workers, daemon=True)
+		self._monitor_thread.start()
+
+	def submit(self, function, *args, **kwargs):
+		future = Future()
+		with self._lock:
+			if self._is_shutdown:
+				raise RuntimeError("The worker pool has been shut down.")
+			task_id = next(self._task_ids)
+			self._futures[task_id] = future
+			self._pending.append((task_id, function, args, kwargs))
+			self._dispatch()
+		return future
+
+	def apply(self, function, args=(), kwargs=None):
+		return self.submit(function, *args, **(kwargs or {})).result()
+
+	def imap_unordered(self, function, iterable):
+		"""
+		Submit every item at once (in order, so the queue order is kept) and yield results as they complete.
+		When the consumer stops early (a task raised, or the generator is closed), the tasks not yet
+		dispatched are cancelled instead of keeping the pool busy.
+		"""
+		futures = [self.submit(function, item) for item in iterable]
+		try:
+			for future in as_completed(futures):
+				yield future.result()
+		finally:
+			self.cancel(futures)
+
+	def cancel(self, futures):
+		"""Drop the tasks of the futures that are still waiting for a worker, the running ones finish"""
+		futures = set(futures)
+		with self._lock:
+			task_ids = {task_id for task_id, future in self._futures.items() if future in futures}
+			dispatched = set(self._running.values())
+			self._pending = collections.deque(task for task in self._pending if task[0] not in task_ids)
+			for task_id in task_ids - dispatched:
+				self._futures.pop(task_id).cancel()
+
+	def shutdown(self):
+		with self._lock:
+			if self._is_shutdown:
+				return
+			self._is_shutdown = True
+			workers = list(self._workers.values())
+			for tasks in self._worker_tasks.values():
+				tasks.put(None)
+		for worker in workers:
+			worker.join(timeout=5)
+			if worker.is_alive():
+				worker.terminate()
+
+	def _start_worker(self):
+		tasks = self._context.Queue()
+		worker = self._context.Process(
+			target=_worker_loop,
+			args=(tasks, self._results, self.max_tasks_per_worker, self.max_worker_memory_mb),
+			daemon=True
+		)
+		worker.start()
+		self._workers[worker.pid] = worker
+		self._worker_tasks[worker.pid] = tasks
+		self._running[worker.pid] = None
+		self._dispatch()
+
+	def _dispatch(self):
+		"""Hand the pending tasks to the idle workers, recording each claim before the worker gets it"""
+		if self._is_shutdown:
+			return
+		for pid, task_id in self._running.items():
+			if not self._pending:
+				break
+			if task_id is None:
+				task = self._pending.popleft()
+				self._running[pid] = task[0]
+				self._worker_tasks[pid].put(task)
+
+	def _replace_worker(self, pid, crashed):
+		worker = self._workers.pop(pid, None)
+		task_id = self._running.pop(pid, None)
+		tasks = self._worker_tasks.pop(pid, None)
+		if tasks is not None:
+			# Nothing reads it anymore, do not wait for the feeder thread to flush it at exit
+			tasks.cancel_join_thread()
+			tasks.close()
+		if worker is not None:
+			worker.join(timeout=1)
+		if crashed and task_id is not None:
+			future = self._futures.pop(task_id, None)
+			if future is not None:
+				future.set_exception(WorkerCrashedError(f"Worker {pid} died with exit code {worker.exitcode if worker else None}."))
+		if not self._is_shutdown:
+			self._start_worker()
+
+	def _handle_results(self):
+		while True:
+			kind, pid, *message = self._results.get()
+
+			with self._lock:
+				if kind == "done":
+					task_id, result, error, retiring = message
+					if pid in self._running:
+						if retiring:
+							del self._running[pid]
+						else:
+							self._running[pid] = None
+							self._dispatch()
+					future = self._futures.pop(task_id, None)
+					if future is None:
+						continue
+					if error is not None:
+						future.set_exception(RemoteTaskError(error))
+					else:
+						future.set_result(result)
+				elif kind == "exit":
+					self._replace_worker(pid, crashed=False)
+
+	def _monitor_workers(self):
+		while not self._is_shutdown:
+			time.sleep(WORKER_CHECK_INTERVAL_SECONDS)
+			with self._lock:
+				for pid, worker in list(self._workers.items()):
+					if not worker.is_alive() and worker.exitcode != 0:
+						self._replace_worker(pid, crashed=True)
+
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+	"""The process-wide warm worker pool, shared by the server and the meta scripts"""
+	global _worker_pool
+	with _worker_pool_lock:
+		if _worker_pool is None:
+			_worker_pool = WarmWorkerPool()
+			atexit.register(_worker_pool.shutdown)
+		return _worker_pool
+
+
+def shutdown_worker_pool():
+	global _worker_pool
+	with _worker_pool_lock:
+		if _worker_pool is not None:
+			_worker_pool.shutdown()
+			_worker_pool = None
@@ -1,17 +1,24 @@
-from flask import Flask, render_template, request, send_from_directory, redirect, url_for, flash, session, g
+from flask import Flask, render_template, request, send_from_directory, redirect, url_for, flash, session, g, jsonify
 import logging
+import mimetypes
 from pathlib import Path
 
-from experiments import run_experiments, run_non_experiment, run_visual_simulation_experiment
+from experiments import run_experiments, run_preflight_probe, run_multi_fidelity_experiments, run_non_experiment, run_stiffness_analysis, run_visual_simulation_experiment
 
 from database.queries.experiment_series_queries import select_all_experiment_series, select_all_experiment_series_grouped, select_experiment_series_by_name, is_experiment_series_name_unique, \
     insert_experiment_series_default, update_experiment_series, delete_experiment_series
 from database.queries.experiments_queries import select_all_experiments_by_series_name, delete_experiments_by_series_name, select_experiment_by_series_name_and_id
 from database.queries.graph_queries import get_strand_radius_vs_weight_chart_values, get_load_capacity_ratio_y_chart_values
-from database.session import SessionLocal
+from database.session import SessionLocal, ReadOnlySessionLocal
+from config import LOAD_PROFILES
 
 from util import delete_experiment_series_folder
+from util.images_and_recording import get_path_with_experiment_series_name
+from experiments.multi_fidelity import MESH_CONVERGENCE_REPORT_FILENAME
+from experiments.fingerprint import STRUCTURE_SERIES_FIELDS
 from graphs.generate_after_experiments import delete_relevant_graphs
+from graphs.graph_output import PLOTLY_JS_DIR, PLOTLY_JS_FILENAME, PLOTLY_JS_URL
+from graphs.chart_data import CHART_API_URL, CHART_API_VERSION, CLIENT_CHARTS, CLIENT_CHARTS_BY_NAME, get_chart_payload
 
 
 
@@ -22,9 +29,13 @@ app = Flask(__name__, template_folder="templates")
 
 app.secret_key = "this will never be deployed anywy to production so no harm in pushing the secret key"
 
+# The chart macro of analysis/chart.html draws these client-side, the other graphs as prebuilt plotly HTML
+app.jinja_env.globals.update(client_charts=CLIENT_CHARTS_BY_NAME, chart_api_url=CHART_API_URL)
+
 @app.before_request
 def create_session():
-	g.db = SessionLocal()
+	# Pages only read, on the read-only engine they are not held up by experiment results being written
+	g.db = ReadOnlySessionLocal() if request.method == "GET" else SessionLocal()
 
 @app.teardown_appcontext
 def teardown_session(exception=None):
@@ -60,11 +71,14 @@ def experiments_page(experiment_series_name):
     force_graph_path = f"series_{safe_name}_force.html"
     height_graph_path = f"series_{safe_name}_height.html"
     elastic_recovery_graph_path = f"series_{safe_name}_elastic_recovery.html"
+    hysteresis_graph_path = f"series_{safe_name}_hysteresis.html"
 
     graphs_dir = Path(__file__).parent / "assets" / "graphs"
     force_graph_exists = (graphs_dir / force_graph_path).exists()
     height_graph_exists = (graphs_dir / height_graph_path).exists()
     elastic_recovery_graph_exists = (graphs_dir / elastic_recovery_graph_path).exists()
+    hysteresis_graph_exists = (graphs_dir / hysteresis_graph_path).exists()
+    mesh_convergence_report_exists = (Path(get_path_with_experiment_series_name(experiment_series_name)) / MESH_CONVERGENCE_REPORT_FILENAME).exists()
 
     if experiment_series.is_experiments_outdated:
         flash(f"The experiments are outdated (experiment series config have been changed). Please run the experiments again.", "error")
@@ -73,25 +87,28 @@ def experiments_page(experiment_series_name):
         experiment_series=experiment_series,
         experiment_series_dict=experiment_series_dict,
         experiments=experiments,
+        load_profiles=LOAD_PROFILES,
         force_graph_path=force_graph_path,
         height_graph_path=height_graph_path,
         elastic_recovery_graph_path=elastic_recovery_graph_path,
+        hysteresis_graph_path=hysteresis_graph_path,
         force_graph_exists=force_graph_exists,
         height_graph_exists=height_graph_exists,
-        elastic_recovery_graph_exists=elastic_recovery_graph_exists
+        elastic_recovery_graph_exists=elastic_recovery_graph_exists,
+        hysteresis_graph_exists=hysteresis_graph_exists,
+        mesh_convergence_report_path=MESH_CONVERGENCE_REPORT_FILENAME,
+        mesh_convergence_report_exists=mesh_convergence_report_exists
     )
 
 @app.route("/aggregated_charts", methods=["GET"])
 def aggregated_charts_page():
-    from database.session import get_session
     from database.queries.graph_queries import get_models_meeting_target_count
 
     # Graph paths
     load_capacity_graph_path = "load_capacity_ratio_y.html"
 
     # Get target achievement statistics
-    session = get_session()
-    target_stats = get_models_meeting_target_count(session)
+    target_stats = get_models_meeting_target_count(g.db)
 
     return render_template(
         "analysis/aggregatedCharts.html",
@@ -184,12 +201,15 @@ def force_no_force_analysis_page():
 @app.route("/recommendations", methods=["GET"])
 def recommendations_page():
     from database.queries.recommendation_queries import get_design_recommendations
+    from database.queries.pareto_queries import get_pareto_recommendations
 
     recommendations = get_design_recommendations(g.db)
+    pareto = get_pareto_recommendations(g.db)
 
     return render_template(
         "analysis/recommendations.html",
-        recommendations=recommendations
+        recommendations=recommendations,
+        pareto=pareto
     )
 
 @app.route('/assets/<path:filename>')
@@ -198,8 +218,53 @@ def serve_assets(filename):
 
 @app.route('/graphs/<path:filename>')
 def serve_graphs(filename):
+    # Graphs are written with a gzip copy, sent as is to the browsers that accept it
+    compressed = Path(app.root_path) / 'assets' / 'graphs' / f"{filename}.gz"
+    if 'gzip' in request.headers.get('Accept-Encoding', '') and compressed.is_file():
+        response = send_from_directory('assets/graphs', f"{filename}.gz", mimetype=mimetypes.guess_type(filename)[0])
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
     return send_from_directory('assets/graphs', filename)
 
+@app.route(PLOTLY_JS_URL)
+def serve_plotly_js():
+    # The plotly.js of the installed plotly package, shared by all graphs and cached by the browser
+    return send_from_directory(PLOTLY_JS_DIR, PLOTLY_JS_FILENAME, max_age=7 * 24 * 3600)
+
+
+##########################################################################################
+# API Routes Recommendations
+##########################################################################################
+
+@app.route("/api/recommendations/pareto", methods=["GET"])
+def get_pareto_front_route():
+    from database.queries.pareto_queries import get_pareto_recommendations
+
+    return get_pareto_recommendations(g.db), 200
+
+
+##########################################################################################
+# API Routes Charts
+##########################################################################################
+
+@app.route(CHART_API_URL, methods=["GET"])
+def get_charts_route():
+    return {"version": CHART_API_VERSION, "charts": [chart.name for chart in CLIENT_CHARTS]}, 200
+
+@app.route(f"{CHART_API_URL}/<chart_name>", methods=["GET"])
+def get_chart_route(chart_name):
+    chart = CLIENT_CHARTS_BY_NAME.get(chart_name)
+    if chart is None:
+        return {"status": "error", "message": f"Unknown chart '{chart_name}'"}, 404
+
+    # The ETag follows the data version: the browser revalidates every time and gets 304 until new results are written
+    payload, etag = get_chart_payload(g.db, chart)
+    response = app.response_class(status=304) if request.if_none_match.contains(etag) else jsonify(payload)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 
 ##########################################################################################
 # API Routes Experiment Series
@@ -229,12 +294,19 @@ def create_experiment_series_route():
 def update_experiment_series_route(experiment_series_name):
     body = request.get_json()
     body["is_experiments_outdated"] = True
+    previous_series = select_experiment_series_by_name(g.db, experiment_series_name)
+    previous_structure = {field: getattr(previous_series, field) for field in STRUCTURE_SERIES_FIELDS} if previous_series else {}
     experiment_series, errors = update_experiment_series(g.db, experiment_series_name, body)
     if experiment_series is None:
         for message in errors:
             flash(message, "error")
         return {"status": "error", "message": errors[0]}, 400
 
+    # The measured stiffness is for the old geometry or material, it stays empty until the
+    # stiffness analysis (run_stiffness_analysis) is run again
+    if any(getattr(experiment_series, field) != value for field, value in previous_structure.items()):
+        update_experiment_series(g.db, experiment_series_name, {"axial_stiffness": None, "lateral_stiffness": None, "torsional_stiffness": None})
+
     g.db.commit()  # Ensure commit before passing to subprocess
     run_non_experiment(experiment_series_name)
 
@@ -261,13 +333,50 @@ def delete_experiment_series_route(experiment_series_name):
 
 @app.route("/api/experiments/all/<experiment_series_name>", methods=["POST"])
 def run_all_experiments_route(experiment_series_name):
-    delete_experiments_by_series_name(g.db, experiment_series_name) 
+    # Resume keeps the experiments already stored for the same config and only runs the missing or stale ones
+    resume = request.args.get("resume") == "1"
+    # Opt-in: a highest force that explodes narrows the sweep instead of refusing the series
+    narrow_force_range = request.form.get("narrow_force_range") == "1"
+    experiment_series = select_experiment_series_by_name(g.db, experiment_series_name)
+
+    # Probe the lowest and highest forces before fanning out the whole series
+    preflight_report = run_preflight_probe(experiment_series, narrow_force_range=narrow_force_range)
+    app.logger.info(preflight_report.summary())
+    if not preflight_report.is_runnable:
+        session.pop('_flashes', None)
+        for message in preflight_report.errors:
+            flash(f"Pre-flight probe refused to run the series: {message}", "error")
+        return redirect(url_for("experiments_page", experiment_series_name=experiment_series_name))
+
+    if not resume:
+        delete_experiments_by_series_name(g.db, experiment_series_name) 
 
     update_experiment_series(g.db, experiment_series_name, { "is_experiments_outdated": False })
     session.pop('_flashes', None)
 
     experiment_series = select_experiment_series_by_name(g.db, experiment_series_name)
-    run_experiments(experiment_series)
+    run_experiments(experiment_series, preflight_report, resume=resume)
+
+    for adjustment in preflight_report.adjustments:
+        flash(f"Pre-flight probe adjusted the run: {adjustment}", "success")
+
+    return redirect(url_for("experiments_page", experiment_series_name=experiment_series_name))
+
+@app.route("/api/experiments/multi_fidelity/<experiment_series_name>", methods=["POST"])
+def run_multi_fidelity_experiments_route(experiment_series_name):
+    delete_experiments_by_series_name(g.db, experiment_series_name)
+
+    update_experiment_series(g.db, experiment_series_name, { "is_experiments_outdated": False })
+    session.pop('_flashes', None)
+
+    experiment_series = select_experiment_series_by_name(g.db, experiment_series_name)
+    run_multi_fidelity_experiments(experiment_series)
+
+    return redirect(url_for("experiments_page", experiment_series_name=experiment_series_name))
+
+@app.route("/api/experiments/stiffness/<experiment_series_name>", methods=["POST"])
+def run_stiffness_analysis_route(experiment_series_name):
+    run_stiffness_analysis(experiment_series_name)
 
     return redirect(url_for("experiments_page", experiment_series_name=experiment_series_name))
 
@@ -0,0 +1,137 @@
+// Charts drawn with Chart.js from the chart data API (graphs/chart_data.py). Every
+// <div class="client-chart" data-chart-url="..."> is fetched and drawn once it scrolls into view.
+(function () {
+  // Plotly's qualitative palette, the colours of the prebuilt graphs
+  const COLORS = ['#636efa', '#EF553B', '#00cc96', '#ab63fa', '#FFA15A', '#19d3f3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52'];
+  const TARGET_COLOR = 'orange';
+
+  function groupLabel(chart, value) {
+    const shown = typeof value === 'number' ? Number(value.toPrecision(4)) : value;
+    return chart.group.label.replace('{}', shown);
+  }
+
+  function buildDatasets(chart) {
+    const columns = chart.columns;
+    const xs = columns[chart.x.column];
+    const ys = columns[chart.y.column];
+    const groups = chart.group ? columns[chart.group.column] : null;
+    const flags = chart.flag ? columns[chart.flag.column] : null;
+
+    const byGroup = new Map();
+    for (let i = 0; i < chart.length; i++) {
+      if (xs[i] === null || ys[i] === null) {
+        continue;
+      }
+      const key = groups ? groups[i] : chart.y.title;
+      if (!byGroup.has(key)) {
+        byGroup.set(key, []);
+      }
+      byGroup.get(key).push({ x: xs[i], y: ys[i], label: columns[chart.label][i], flagged: flags ? flags[i] : false });
+    }
+
+    const keys = Array.from(byGroup.keys()).sort((a, b) => (a < b ? -1 : a > b ? 1 : 0));
+    const datasets = keys.map((key, index) => {
+      const points = byGroup.get(key);
+      if (chart.line) {
+        points.sort((a, b) => a.x - b.x);
+      }
+      const color = COLORS[index % COLORS.length];
+      return {
+        label: groups ? groupLabel(chart, key) : chart.y.title,
+        data: points,
+        showLine: chart.line,
+        borderColor: color,
+        backgroundColor: color,
+        pointStyle: points.map((point) => (point.flagged ? 'crossRot' : 'circle')),
+        pointRadius: points.map((point) => (point.flagged ? 6 : 4)),
+      };
+    });
+
+    if (chart.target !== null && datasets.length > 0) {
+      const allX = datasets.flatMap((dataset) => dataset.data.map((point) => point.x));
+      datasets.push({
+        label: chart.target + '% Target',
+        data: [{ x: Math.min(...allX), y: chart.target }, { x: Math.max(...allX), y: chart.target }],
+        showLine: true,
+        borderColor: TARGET_COLOR,
+        borderDash: [6, 6],
+        pointRadius: 0,
+      });
+    }
+    return datasets;
+  }
+
+  function tooltipLabel(context) {
+    const point = context.raw;
+    const flagged = point.flagged ? ' (' + (context.chart.$chartData.flag.label || 'flagged') + ')' : '';
+    return (point.label || context.dataset.label) + ': (' + point.x + ', ' + point.y + ')' + flagged;
+  }
+
+  function draw(container, chart) {
+    const canvas = document.createElement('canvas');
+    container.replaceChildren(canvas);
+    const instance = new Chart(canvas, {
+      type: 'scatter',
+      data: { datasets: buildDatasets(chart) },
+      options: {
+        maintainAspectRatio: false,
+        animation: false,
+        scales: {
+          x: { title: { display: true, text: chart.x.title } },
+          y: { title: { display: true, text: chart.y.title } },
+        },
+        plugins: {
+          ...window.chartJsPlugins.plugins,
+          title: { display: true, text: chart.title },
+          legend: { display: Boolean(chart.group) || chart.target !== null },
+          tooltip: { callbacks: { label: tooltipLabel } },
+        },
+      },
+    });
+    instance.$chartData = chart;
+  }
+
+  function load(container) {
+    fetch(container.dataset.chartUrl)
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(response.status + ' ' + response.statusText);
+        }
+        return response.json();
+      })
+      .then((chart) => {
+        if (chart.length === 0) {
+          container.textContent = 'No data available for this chart.';
+          return;
+        }
+        draw(container, chart);
+      })
+      .catch((error) => {
+        container.textContent = 'Could not load the chart: ' + error.message;
+      });
+  }
+
+  function observe() {
+    const containers = document.querySelectorAll('.client-chart[data-chart-url]');
+    if (!('IntersectionObserver' in window)) {
+      containers.forEach(load);
+      return;
+    }
+    // Start loading a little before the chart is visible
+    const observer = new IntersectionObserver((entries) => {
+      entries.forEach((entry) => {
+        if (entry.isIntersecting) {
+          observer.unobserve(entry.target);
+          load(entry.target);
+        }
+      });
+    }, { rootMargin: '200px 0px' });
+    containers.forEach((container) => observer.observe(container));
+  }
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', observe);
+  } else {
+    observe();
+  }
+})();
@@ -1,2 +1,3 @@
-from forces.loads import apply_loads, reset_loads
-from forces.equilibrium import is_in_equilibrium, reset_equilibrium_state
\ No newline at end of file
+from forces.loads import apply_loads, reset_loads, attach_load_profile, compute_nodal_force
+from forces.equilibrium import is_in_equilibrium, reset_equilibrium_state
+from forces.stiffness import measure_tangent_stiffness, TangentStiffness
@@ -1,38 +1,42 @@
 import pychrono as chrono
-from config import ExperimentConfig
+from config import ExperimentConfig, LoadProfile
 
-def apply_loads(nodes, experiment_config: ExperimentConfig):
+def compute_nodal_force(node, is_top_layer, experiment_config: ExperimentConfig):
 	force_y = experiment_config.force_in_y_direction
 	force_top_y = experiment_config.force_top_nodes_in_y_direction
 	force_x = experiment_config.force_in_x_direction
 	force_z = experiment_config.force_in_z_direction
 	torsional = experiment_config.torsional_force
 
-	for layer_index, layer in enumerate(nodes):
-		for node in layer:
-			force = chrono.ChVector3d(0, 0, 0)
+	force = chrono.ChVector3d(0, 0, 0)
+
+	# Y force for all nodes
+	force += chrono.ChVector3d(0, force_y, 0)
+
+	# Lateral force
+	force += chrono.ChVector3d(force_x, 0, force_z)
 
-			# Y force for all nodes
-			force += chrono.ChVector3d(0, force_y, 0)
+	# Torsional force
+	center = chrono.ChVector3d(0, node.GetPos().y, 0)
+	r = node.GetPos() - center
+	r_mag = r.Length()
+	if r_mag > 0:
+		# tangential direction about +Y
+		tangential_direction = r.Cross(chrono.ChVector3d(0, 1, 0)).GetNormalized()
+		eps = 1e-6
+		force += tangential_direction * (torsional * r_mag / (r_mag * r_mag + eps))
 
-			# Lateral force
-			force += chrono.ChVector3d(force_x, 0, force_z)
+	# Add extra force to top layer
+	if is_top_layer:
+		force += chrono.ChVector3d(0, force_top_y, 0)
 
-			# Torsional force
-			center = chrono.ChVector3d(0, node.GetPos().y, 0)
-			r = node.GetPos() - center
-			r_mag = r.Length()
-			if r_mag > 0:
-				# tangential direction about +Y
-				tangential_direction = r.Cross(chrono.ChVector3d(0, 1, 0)).GetNormalized()
-				eps = 1e-6
-				force += tangential_direction * (torsional * r_mag / (r_mag * r_mag + eps))
+	return force
 
-			# Add extra force to top layer
-			if layer_index == len(nodes) - 1:
-				force += chrono.ChVector3d(0, force_top_y, 0)
 
-			node.SetForce(force)
+def apply_loads(nodes, experiment_config: ExperimentConfig):
+	for layer_index, layer in enumerate(nodes):
+		for node in layer:
+			node.SetForce(compute_nodal_force(node, layer_index == len(nodes) - 1, experiment_config))
 
 
 def reset_loads(nodes):
@@ -40,3 +44,39 @@ def reset_loads(nodes):
 		for node in layer:
 			node.SetForce(chrono.ChVector3d(0, 0, 0))
 			node.SetTorque(chrono.ChVector3d(0, 0, 0))
+
+
+def create_modulation_function(load_profile: LoadProfile):
+	"""Native piecewise-linear function of time evaluated by Chrono, see LoadProfile.breakpoints"""
+	modulation = chrono.ChFunctionInterp()
+	for time_seconds, scale in load_profile.breakpoints():
+		modulation.AddPoint(time_seconds, scale)
+	return modulation
+
+
+def attach_load_profile(system, nodes, experiment_config: ExperimentConfig, load_profile: LoadProfile):
+	"""
+	Attach the experiment forces to the system as loads in a ChLoadContainer.
+
+	Every nodal force shares the same modulation function, so the load schedule
+	(step, ramp, cyclic, hold-release) is evaluated by the solver itself and the
+	simulation loop never has to touch the nodes to change or remove the forces.
+
+	Returns the load container and the (node, unmodulated force) pairs that were attached.
+	"""
+	# api.projectchrono.org/loads.html
+	modulation = create_modulation_function(load_profile)
+	load_container = chrono.ChLoadContainer()
+	nodal_forces = []
+
+	for layer_index, layer in enumerate(nodes):
+		for node in layer:
+			force = compute_nodal_force(node, layer_index == len(nodes) - 1, experiment_config)
+			load = chrono.ChLoadNodeXYZRotForceAbs(node, force)
+			load.SetModulationFunction(modulation)
+			load_container.Add(load)
+			nodal_forces.append((node, force))
+
+	system.Add(load_container)
+
+	return load_container, nodal_forces
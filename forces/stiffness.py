@@ -0,0 +1,163 @@
+import pychrono as chrono
+from dataclasses import dataclass
+from math import atan2, pi
+from typing import Optional
+
+# Total perturbation load applied to the top layer. Small enough to stay in the linear range
+# of the settled braid, large enough to be well above the solver tolerance.
+PERTURBATION_FORCE_N = 0.05
+PERTURBATION_TORQUE_NM = 0.005
+
+
+@dataclass
+class TangentStiffness:
+	axial_stiffness: Optional[float] = None       # N/m, vertical load on the top layer
+	lateral_stiffness: Optional[float] = None     # N/m, horizontal (x) load on the top layer
+	torsional_stiffness: Optional[float] = None   # N·m/rad, torque about the vertical axis on the top layer
+
+	def to_dict(self):
+		return {
+			"axial_stiffness": self.axial_stiffness,
+			"lateral_stiffness": self.lateral_stiffness,
+			"torsional_stiffness": self.torsional_stiffness,
+		}
+
+
+def _node_state(nodes):
+	# Copies, GetPos/GetRot return references to the live node coordinates
+	return [(chrono.ChVector3d(node.GetPos()), chrono.ChQuaterniond(node.GetRot())) for node in nodes]
+
+
+def _restore_node_state(system, nodes, state):
+	for node, (position, rotation) in zip(nodes, state):
+		node.SetPos(position)
+		node.SetRot(rotation)
+		node.SetPosDt(chrono.ChVector3d(0, 0, 0))
+		node.SetAngVelLocal(chrono.ChVector3d(0, 0, 0))
+	system.Update()
+
+
+def _angle_about_vertical_axis(position):
+	return atan2(position.z, position.x)
+
+
+def _angle_difference(a, b):
+	difference = a - b
+	while difference > pi:
+		difference -= 2 * pi
+	while difference < -pi:
+		difference += 2 * pi
+	return difference
+
+
+def _create_perturbation(system, top_nodes, direction_of):
+	"""
+	Attach one load per top node, all sharing a constant modulation function that starts at 0.
+	Setting the constant to +1 or -1 applies the perturbation in either direction. Returns the
+	modulation function and the load container, to remove from the system once measured.
+	"""
+	modulation = chrono.ChFunctionConst(0.0)
+	load_container = chrono.ChLoadContainer()
+	for node in top_nodes:
+		load = chrono.ChLoadNodeXYZRotForceAbs(node, direction_of(node))
+		load.SetModulationFunction(modulation)
+		load_container.Add(load)
+	system.Add(load_container)
+	return modulation, load_container
+
+
+def _symmetric_response(system, nodes, modulation, measure):
+	"""
+	Linearized static solves around the settled state with +perturbation and -perturbation.
+	Returns the central difference of `measure` between both, or None when a solve fails.
+	"""
+	settled_state = _node_state(nodes)
+	responses = []
+
+	for sign in (1.0, -1.0):
+		modulation.SetConstant(sign)
+		solved = system.DoStaticLinear()
+		responses.append(measure(settled_state) if solved is not False else None)
+		modulation.SetConstant(0.0)
+		_restore_node_state(system, nodes, settled_state)
+
+	if None in responses:
+		return None
+	return (responses[0] - responses[1]) / 2
+
+
+def _mesh_nodes(nodes, beam_elements):
+	"""
+	Every node of the mesh: the crossing nodes and the intermediate nodes ChBuilderBeamEuler
+	creates along each beam. Shared nodes appear more than once, restoring them twice is harmless.
+	"""
+	return [node for layer in nodes for node in layer] + [
+		node for beam in beam_elements for node in (beam.GetNodeA(), beam.GetNodeB())
+	]
+
+
+def measure_tangent_stiffness(system, nodes, beam_elements):
+	"""
+	Tangent stiffness of the settled braid, measured on the top layer with small symmetric
+	perturbation loads and a linearized static solve for each of them.
+
+	Instead of sweeping dozens of forces and post-processing k = F/Δx, the response to
+	+δF and -δF is solved around the current (settled) state, the central difference
+	cancels the quadratic terms, and k = δF / Δx. Every node of the mesh is restored to the
+	settled state after each solve, so the solves do not start from each other's displacements.
+	"""
+	all_nodes = [node for layer in nodes for node in layer]
+	top_nodes = nodes[-1]
+	top_indices = range(len(all_nodes) - len(top_nodes), len(all_nodes))
+	# The top nodes keep their indices: the crossing nodes come first
+	mesh_nodes = _mesh_nodes(nodes, beam_elements)
+	force_per_node = PERTURBATION_FORCE_N / len(top_nodes)
+
+	def mean_displacement(axis):
+		def measure(settled_state):
+			return sum(
+				getattr(all_nodes[i].GetPos(), axis) - getattr(settled_state[i][0], axis)
+				for i in top_indices
+			) / len(top_nodes)
+		return measure
+
+	def mean_rotation(settled_state):
+		return sum(
+			_angle_difference(_angle_about_vertical_axis(all_nodes[i].GetPos()), _angle_about_vertical_axis(settled_state[i][0]))
+			for i in top_indices
+		) / len(top_nodes)
+
+	def tangential_force(node):
+		position = node.GetPos()
+		r = chrono.ChVector3d(position.x, 0, position.z)
+		r_mag = r.Length()
+		if r_mag == 0:
+			return chrono.ChVector3d(0, 0, 0)
+		# Tangential about the vertical axis, the stiffness only uses the magnitude of the response
+		tangential_direction = chrono.ChVector3d(0, 1, 0).Cross(r).GetNormalized()
+		return tangential_direction * (PERTURBATION_TORQUE_NM / len(top_nodes) / r_mag)
+
+	stiffness = TangentStiffness()
+
+	axial, axial_loads = _create_perturbation(system, top_nodes, lambda node: chrono.ChVector3d(0, -force_per_node, 0))
+	lateral, lateral_loads = _create_perturbation(system, top_nodes, lambda node: chrono.ChVector3d(force_per_node, 0, 0))
+	torsional, torsional_loads = _create_perturbation(system, top_nodes, tangential_force)
+
+	try:
+		axial_displacement = _symmetric_response(system, mesh_nodes, axial, mean_displacement("y"))
+		if axial_displacement:
+			stiffness.axial_stiffness = PERTURBATION_FORCE_N / abs(axial_displacement)
+
+		lateral_displacement = _symmetric_response(system, mesh_nodes, lateral, mean_displacement("x"))
+		if lateral_displacement:
+			stiffness.lateral_stiffness = PERTURBATION_FORCE_N / abs(lateral_displacement)
+
+		rotation = _symmetric_response(system, mesh_nodes, torsional, mean_rotation)
+		if rotation:
+			stiffness.torsional_stiffness = PERTURBATION_TORQUE_NM / abs(rotation)
+	finally:
+		for load_container in (axial_loads, lateral_loads, torsional_loads):
+			system.Remove(load_container)
+		system.Update()
+
+	return stiffness
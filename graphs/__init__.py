@@ -25,6 +25,7 @@ from .aggregate_graphs import (
 from .series_graphs import (
     generate_experiment_series_force_graph,
     generate_experiment_series_height_graph,
-    generate_experiment_series_elastic_recovery_graph
+    generate_experiment_series_elastic_recovery_graph,
+    generate_experiment_series_hysteresis_graph
 )
 from .generate_after_experiments import generate_graphs_after_experiments
@@ -1,22 +1,22 @@
+import argparse
+
 from database.session import scoped_session
 from database.queries.experiment_series_queries import select_all_experiment_series
-from graphs.generate_after_experiments import generate_graphs_after_experiments
-from graphs.aggregate_graphs import generate_aggregate_graphs_for_group
+from graphs.graph_build import build_series_graphs, build_aggregate_graphs
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the graphs whose input series changed since they were last generated")
+    parser.add_argument("--force", action="store_true", help="Generate every graph, even the up-to-date ones")
+    args = parser.parse_args()
+
     with scoped_session() as session:
         experiment_series_list = select_all_experiment_series(session)
 
-        # Track which groups we've processed
-        processed_groups = set()
-
-        for experiment_series in experiment_series_list:
-            # Generate series-specific graphs
-            generate_graphs_after_experiments(experiment_series)
+        print("Generating series graphs...")
+        generated_series, up_to_date_series = build_series_graphs(session, experiment_series_list, force=args.force)
 
-            # Generate aggregate graphs for this group (only once per group)
-            if experiment_series.group_name and experiment_series.group_name not in processed_groups:
-                generate_aggregate_graphs_for_group(session, experiment_series.group_name)
-                processed_groups.add(experiment_series.group_name)
+        print("Generating aggregate graphs...")
+        generated_graphs, up_to_date_graphs, _ = build_aggregate_graphs(session, force=args.force)
 
-        print("\nAll graphs generated successfully!")
+        print(f"\nSeries graphs: {len(generated_series)} series generated, {len(up_to_date_series)} up to date")
+        print(f"Aggregate graphs: {len(generated_graphs)} generated, {len(up_to_date_graphs)} up to date")
@@ -6,6 +6,7 @@ import numpy as np
 import plotly.graph_objects as go
 
 from database.queries.graph_queries import (
+    dataset_memo,
     get_strand_radius_vs_weight_chart_values,
     get_strand_radius_vs_force_chart_values,
     get_load_capacity_ratio_y_chart_values,
@@ -25,10 +26,12 @@ from database.queries.graph_queries import (
     get_force_no_force_stiffness_data,
     get_force_no_force_recovery_consistency_data,
     get_strand_count_stiffness_vs_compression_data,
+    get_strand_count_tangent_stiffness_data,
     get_strand_count_force_vs_displacement_data,
     get_load_bearing_parameter_importance_data
 )
 from database.queries.experiment_series_queries import select_experiment_series_by_name
+from graphs.graph_output import write_graph_html
 
 GRAPHS_DIR = Path(__file__).parent.parent / "experiments_server" / "assets" / "graphs"
 GRAPHS_DIR.mkdir(parents=True, exist_ok=True)
@@ -79,10 +82,6 @@ def generate_load_capacity_ratio_graph(session, force_direction='y'):
 
     df = pd.DataFrame(data)
 
-    # Add weight in kg for x-axis
-    from database.queries.graph_queries import get_weight_for_series
-    df['weight_kg'] = df['experiment_series_name'].apply(lambda name: get_weight_for_series(session, name))
-
     fig = px.scatter(
         df,
         x='weight_kg',
@@ -103,7 +102,7 @@ def generate_load_capacity_ratio_graph(session, force_direction='y'):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "load_capacity_ratio_{}.html".format(force_direction)
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "load_capacity_ratio_{}.html".format(force_direction)
 
@@ -161,7 +160,7 @@ def generate_strand_thickness_weight_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "strand_thickness_vs_weight.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "strand_thickness_vs_weight.html"
 
@@ -242,7 +241,7 @@ def generate_strand_thickness_force_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "strand_thickness_vs_force.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "strand_thickness_vs_force.html"
 
@@ -324,7 +323,7 @@ def generate_strand_thickness_efficiency_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "strand_thickness_vs_efficiency.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "strand_thickness_vs_efficiency.html"
 
@@ -396,7 +395,7 @@ def generate_thickness_height_reduction_vs_force_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "thickness_height_reduction_vs_force.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "thickness_height_reduction_vs_force.html"
 
@@ -479,7 +478,7 @@ def generate_strand_thickness_max_survivable_force_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "strand_thickness_max_survivable_force.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "strand_thickness_max_survivable_force.html"
 
@@ -537,7 +536,7 @@ def generate_layer_count_height_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "layer_count_vs_height.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "layer_count_vs_height.html"
 
@@ -617,7 +616,7 @@ def generate_layer_count_force_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "layer_count_vs_force.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "layer_count_vs_force.html"
 
@@ -697,7 +696,7 @@ def generate_layer_count_efficiency_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "layer_count_vs_efficiency.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "layer_count_vs_efficiency.html"
 
@@ -768,7 +767,7 @@ def generate_layer_height_reduction_vs_force_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "layer_height_reduction_vs_force.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "layer_height_reduction_vs_force.html"
 
@@ -842,7 +841,7 @@ def generate_strand_count_weight_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "strand_count_vs_weight.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "strand_count_vs_weight.html"
 
@@ -882,7 +881,7 @@ def generate_strand_count_force_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "strand_count_vs_force.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "strand_count_vs_force.html"
 
@@ -922,7 +921,7 @@ def generate_strand_count_efficiency_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "strand_count_vs_efficiency.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "strand_count_vs_efficiency.html"
 
@@ -995,7 +994,7 @@ def generate_strand_height_reduction_vs_force_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "strand_height_reduction_vs_force.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "strand_height_reduction_vs_force.html"
 
@@ -1058,7 +1057,7 @@ def generate_recovery_by_thickness_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "recovery_by_thickness.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "recovery_by_thickness.html"
 
@@ -1113,7 +1112,7 @@ def generate_recovery_by_layers_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "recovery_by_layers.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "recovery_by_layers.html"
 
@@ -1169,7 +1168,7 @@ def generate_recovery_by_strands_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "recovery_by_strands.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "recovery_by_strands.html"
 
@@ -1227,7 +1226,7 @@ def generate_recovery_heatmap_thickness_layers(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "recovery_heatmap_thickness_layers.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "recovery_heatmap_thickness_layers.html"
 
@@ -1292,7 +1291,7 @@ def generate_recovery_parameter_importance_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "recovery_parameter_importance.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "recovery_parameter_importance.html"
 
@@ -1349,7 +1348,7 @@ def generate_recovery_heatmap_strands_layers(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "recovery_heatmap_strands_layers.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "recovery_heatmap_strands_layers.html"
 
@@ -1407,7 +1406,7 @@ def generate_recovery_heatmap_strands_thickness(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "recovery_heatmap_strands_thickness.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "recovery_heatmap_strands_thickness.html"
 
@@ -1489,7 +1488,7 @@ def generate_equilibrium_time_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "equilibrium_time.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "equilibrium_time.html"
 
@@ -1569,7 +1568,7 @@ def generate_equilibrium_time_by_strands_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "equilibrium_time_by_strands.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "equilibrium_time_by_strands.html"
 
@@ -1614,7 +1613,7 @@ def generate_compression_validation_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "compression_validation.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "compression_validation.html"
 
@@ -1656,7 +1655,7 @@ def generate_stiffness_comparison_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "stiffness_comparison.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "stiffness_comparison.html"
 
@@ -1709,7 +1708,7 @@ def generate_recovery_consistency_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "recovery_consistency.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "recovery_consistency.html"
 
@@ -1741,6 +1740,24 @@ def generate_strand_stiffness_vs_compression_graph(session):
             hovertemplate='<b>{} strands</b><br>Compression: %{{x:.1f}}%<br>Stiffness: %{{y:.1f}} N/m<extra></extra>'.format(num_strands)
         ))
 
+    # Measured tangent stiffness of the settled (uncompressed) braid, from the stiffness analysis runs
+    tangent_data = get_strand_count_tangent_stiffness_data(session)
+    if tangent_data:
+        tangent_df = pd.DataFrame(tangent_data)
+        for i, num_strands in enumerate(strand_counts):
+            df_tangent = tangent_df[tangent_df['num_strands'] == num_strands]
+            if df_tangent.empty:
+                continue
+            color = colors[i % len(colors)]
+            fig.add_trace(go.Scatter(
+                x=[0.0] * len(df_tangent),
+                y=df_tangent['axial_stiffness'],
+                mode='markers',
+                name='{} strands (tangent)'.format(num_strands),
+                marker=dict(size=11, color=color, symbol='diamond', line=dict(width=1, color='black')),
+                hovertemplate='<b>{} strands</b><br>Tangent Stiffness: %{{y:.1f}} N/m<extra></extra>'.format(num_strands)
+            ))
+
     fig.update_layout(
         title='Apparent Stiffness vs. Compression (Non-Linear Spring Behavior)',
         xaxis_title='Compression (%)',
@@ -1753,7 +1770,7 @@ def generate_strand_stiffness_vs_compression_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "strand_stiffness_vs_compression.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "strand_stiffness_vs_compression.html"
 
@@ -1828,7 +1845,7 @@ def generate_strand_force_vs_displacement_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "strand_force_vs_displacement.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "strand_force_vs_displacement.html"
 
@@ -1878,7 +1895,7 @@ def generate_load_bearing_parameter_importance_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "load_bearing_parameter_importance.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "load_bearing_parameter_importance.html"
 
@@ -1928,7 +1945,7 @@ def generate_compression_parameter_importance_graph(session):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / "compression_parameter_importance.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return "compression_parameter_importance.html"
 
@@ -1996,9 +2013,11 @@ def generate_aggregate_graphs_for_group(session, group_name):
         return
 
     print("  Generating aggregate graphs for group '{}'...".format(group_name))
-    for graph_func in graphs:
-        try:
-            print("    - {}...".format(graph_func.__name__))
-            graph_func(session)
-        except Exception as e:
-            print("      Error generating {}: {}".format(graph_func.__name__, e))
+    # The graphs of a group read the same few datasets, each is computed once
+    with dataset_memo():
+        for graph_func in graphs:
+            try:
+                print("    - {}...".format(graph_func.__name__))
+                graph_func(session)
+            except Exception as e:
+                print("      Error generating {}: {}".format(graph_func.__name__, e))
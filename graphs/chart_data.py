@@ -0,0 +1,168 @@
+"""
+Chart data for the charts drawn in the browser with Chart.js (static/charts.js): the
+graph_queries dataset of a chart, as columns, with the description of how to draw it. Served by
+the experiments server under /api/v<CHART_API_VERSION>/charts, always current, no graph has to
+be generated first. The fitted models, heatmaps and 3D figures stay prebuilt plotly graphs.
+"""
+import hashlib
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from database.queries.data_version_queries import select_data_version
+from database.queries.graph_queries import (
+    get_layer_count_vs_efficiency_chart_values,
+    get_layer_count_vs_force_chart_values,
+    get_layer_count_vs_height_chart_values,
+    get_layer_height_reduction_vs_force_data,
+    get_load_capacity_ratio_y_chart_values,
+    get_strand_count_force_vs_displacement_data,
+    get_strand_count_stiffness_vs_compression_data,
+    get_strand_count_vs_efficiency_chart_values,
+    get_strand_count_vs_force_chart_values,
+    get_strand_count_vs_weight_chart_values,
+    get_strand_height_reduction_vs_force_data,
+    get_strand_radius_vs_efficiency_chart_values,
+    get_strand_radius_vs_force_chart_values,
+    get_strand_radius_vs_weight_chart_values,
+    get_strand_thickness_max_survivable_force_data,
+    get_thickness_height_reduction_vs_force_data
+)
+from graphs.graph_constants import TARGET_HEIGHT_REDUCTION_PERCENT
+from graphs.graph_output import round_significant
+
+# Bump when the payload changes, the URL changes with it
+CHART_API_VERSION = 1
+CHART_API_URL = "/api/v{}/charts".format(CHART_API_VERSION)
+
+LABEL_COLUMN = "experiment_series_name"
+MM_PER_M = 1000
+
+
+@dataclass(frozen=True)
+class ClientChart:
+    name: str  # the prebuilt graph is GRAPHS_DIR / f"{name}.html"
+    dataset: Callable  # graph_queries dataset, a list of records
+    title: str
+    x: str
+    x_title: str
+    y: str
+    y_title: str
+    group: Optional[str] = None  # one colour per value of this column
+    group_label: str = "{}"  # legend label of a group, "{}" is its value
+    flag: Optional[str] = None  # boolean column, its points are drawn as crosses
+    flag_label: Optional[str] = None
+    line: bool = False  # connect the points of a group in x order
+    target: Optional[float] = None  # horizontal reference line
+    scale: Dict[str, float] = field(default_factory=dict)  # column: factor, e.g. m to mm
+
+
+THICKNESS_MM = {"strand_radius": MM_PER_M}
+HEIGHT_REDUCTION = dict(x="force", x_title="Force in Y Direction (N)", y="height_reduction_pct", y_title="Height Reduction (%)",
+                        flag="exploded", flag_label="exploded", target=TARGET_HEIGHT_REDUCTION_PERCENT)
+
+CLIENT_CHARTS = [
+    ClientChart("load_capacity_ratio_y", get_load_capacity_ratio_y_chart_values, "Structural Efficiency: Specific Load Capacity vs. Weight",
+                x="weight_kg", x_title="Structure Weight (kg)", y="specific_load_capacity", y_title="Force / (Weight x g) where g=9.81 m/s^2"),
+
+    ClientChart("strand_thickness_vs_weight", get_strand_radius_vs_weight_chart_values, "Weight Scaling with Material Thickness",
+                x="strand_radius", x_title="Material Thickness (mm)", y="weight_kg", y_title="Weight (kg)", scale=THICKNESS_MM),
+    ClientChart("strand_thickness_vs_force", get_strand_radius_vs_force_chart_values, "Load-Bearing Capacity vs. Material Thickness",
+                x="strand_radius", x_title="Material Thickness (mm)", y="force", y_title="Force at 10% Height Reduction (N)", scale=THICKNESS_MM),
+    ClientChart("strand_thickness_vs_efficiency", get_strand_radius_vs_efficiency_chart_values, "Structural Efficiency vs. Material Thickness",
+                x="strand_radius", x_title="Material Thickness (mm)", y="specific_load_capacity", y_title="Specific Load Capacity (×own weight)", scale=THICKNESS_MM),
+    ClientChart("thickness_height_reduction_vs_force", get_thickness_height_reduction_vs_force_data, "Height Reduction vs. Force - All Material Thickness Configurations",
+                group="strand_radius", group_label="{} mm", scale=THICKNESS_MM, **HEIGHT_REDUCTION),
+    ClientChart("strand_thickness_max_survivable_force", get_strand_thickness_max_survivable_force_data, "Maximum Survivable Load vs. Material Thickness (Before Structural Failure)",
+                x="strand_radius", x_title="Material Thickness (mm)", y="max_force_survived", y_title="Maximum Force Survived (N)", scale=THICKNESS_MM),
+
+    ClientChart("layer_count_vs_height", get_layer_count_vs_height_chart_values, "Height vs. Layer Count Validation",
+                x="num_layers", x_title="Number of Layers", y="height_m", y_title="Height (m)"),
+    ClientChart("layer_count_vs_force", get_layer_count_vs_force_chart_values, "Load-Bearing Capacity vs. Layer Count",
+                x="num_layers", x_title="Number of Layers", y="force", y_title="Force at 10% Height Reduction (N)"),
+    ClientChart("layer_count_vs_efficiency", get_layer_count_vs_efficiency_chart_values, "Structural Efficiency vs. Layer Count",
+                x="num_layers", x_title="Number of Layers", y="specific_load_capacity", y_title="Specific Load Capacity (×own weight)"),
+    ClientChart("layer_height_reduction_vs_force", get_layer_height_reduction_vs_force_data, "Height Reduction vs. Force - All Layer Configurations",
+                group="num_layers", group_label="{} layers", **HEIGHT_REDUCTION),
+
+    ClientChart("strand_count_vs_weight", get_strand_count_vs_weight_chart_values, "Weight Scaling with Strand Count",
+                x="num_strands", x_title="Number of Strands", y="weight_kg", y_title="Weight (kg)"),
+    ClientChart("strand_count_vs_force", get_strand_count_vs_force_chart_values, "Load-Bearing Capacity vs. Strand Count",
+                x="num_strands", x_title="Number of Strands", y="force", y_title="Force at 10% Height Reduction (N)"),
+    ClientChart("strand_count_vs_efficiency", get_strand_count_vs_efficiency_chart_values, "Structural Efficiency vs. Strand Count",
+                x="num_strands", x_title="Number of Strands", y="specific_load_capacity", y_title="Specific Load Capacity (×own weight)"),
+    ClientChart("strand_height_reduction_vs_force", get_strand_height_reduction_vs_force_data, "Height Reduction vs. Force - All Strand Configurations",
+                group="num_strands", group_label="{} strands", **HEIGHT_REDUCTION),
+    ClientChart("strand_stiffness_vs_compression", get_strand_count_stiffness_vs_compression_data, "Apparent Stiffness vs. Compression (Non-Linear Spring Behavior)",
+                x="compression_pct", x_title="Compression (%)", y="stiffness", y_title="Apparent Stiffness k (N/m)",
+                group="num_strands", group_label="{} strands", line=True),
+    ClientChart("strand_force_vs_displacement", get_strand_count_force_vs_displacement_data, "Force vs. Displacement",
+                x="displacement", x_title="Displacement Δx (mm)", y="force", y_title="Force F (N)",
+                group="num_strands", group_label="{} strands", line=True, scale={"displacement": MM_PER_M}),
+]
+CLIENT_CHARTS_BY_NAME = {chart.name: chart for chart in CLIENT_CHARTS}
+
+# (database url, data version) and the payloads built for it, {chart name: payload}
+_cached_payloads = None
+
+
+def _column_value(value, factor):
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    value = value * factor
+    # Whole numbers stay ints (counts, ids), the rest are rounded like the prebuilt graphs
+    return value if isinstance(value, int) else float(round_significant(value))
+
+
+def columns_of(records, columns, scale=None):
+    """The records as {column: [values]}, NaN as None and floats rounded to the significant digits"""
+    scale = scale or {}
+    return {
+        column: [_column_value(record.get(column), scale.get(column, 1)) for record in records]
+        for column in columns
+    }
+
+
+def _chart_columns(chart):
+    columns = [LABEL_COLUMN, chart.x, chart.y, chart.group, chart.flag]
+    return list(dict.fromkeys(column for column in columns if column is not None))
+
+
+def build_chart_payload(session, chart):
+    records = chart.dataset(session)
+    return {
+        "version": CHART_API_VERSION,
+        "name": chart.name,
+        "title": chart.title,
+        "label": LABEL_COLUMN,
+        "x": {"column": chart.x, "title": chart.x_title},
+        "y": {"column": chart.y, "title": chart.y_title},
+        "group": {"column": chart.group, "label": chart.group_label} if chart.group else None,
+        "flag": {"column": chart.flag, "label": chart.flag_label} if chart.flag else None,
+        "line": chart.line,
+        "target": chart.target,
+        "length": len(records),
+        "columns": columns_of(records, _chart_columns(chart), chart.scale),
+    }
+
+
+def chart_etag(data_version, name):
+    """Changes with the data version and with the API version, the same for every server process"""
+    key = "{}:{}:{}".format(CHART_API_VERSION, data_version, name)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def get_chart_payload(session, chart):
+    """The payload of the chart and its ETag, built once per data version of the session's database"""
+    global _cached_payloads
+    database_url = str(session.get_bind().url)
+    data_version = select_data_version(session)
+    if _cached_payloads is None or _cached_payloads[:2] != (database_url, data_version):
+        _cached_payloads = (database_url, data_version, {})
+
+    payloads = _cached_payloads[2]
+    if chart.name not in payloads:
+        payloads[chart.name] = build_chart_payload(session, chart)
+    return payloads[chart.name], chart_etag(data_version, chart.name)
@@ -1,37 +1,55 @@
 from pathlib import Path
 import traceback
 
-from database.queries.experiments_queries import select_all_experiments_by_series_name
+from database.queries.experiments_queries import select_all_experiments_by_series_name, select_experiment_cycles_by_series_name
+from database.queries.graph_input_queries import select_series_input_fingerprints
 from database.session import SessionLocal
+from .graph_build import FINGERPRINT_SUFFIX, series_fingerprint_name, series_graphs_fingerprint, write_fingerprint
 from .series_graphs import (
     generate_experiment_series_force_graph,
     generate_experiment_series_height_graph,
-    generate_experiment_series_elastic_recovery_graph
+    generate_experiment_series_elastic_recovery_graph,
+    generate_experiment_series_hysteresis_graph
 )
 
 
+def safe_graph_name(experiment_series_name):
+    return experiment_series_name.replace('/', '_').replace(' ', '_')
+
+
 def generate_graphs_after_experiments(experiment_series):
-    safe_name = experiment_series.experiment_series_name.replace('/', '_').replace(' ', '_')
+    safe_name = safe_graph_name(experiment_series.experiment_series_name)
     delete_relevant_graphs(safe_name)
 
     session = SessionLocal()
     try:
-        experiments = select_all_experiments_by_series_name(session, experiment_series.experiment_series_name)
+        # Fingerprint of the inputs read below, python -m graphs skips the series while it does not change
+        input_fingerprints = select_series_input_fingerprints(session, [experiment_series.experiment_series_name])
+        generate_series_graphs(session, experiment_series, safe_name)
 
-        generate_experiment_series_force_graph(session, safe_name, experiments)
-        generate_experiment_series_height_graph(session, safe_name, experiments, experiment_series.height_m)
-        generate_experiment_series_elastic_recovery_graph(session, safe_name, experiments, experiment_series.reset_force_after_seconds, experiment_series.height_m)
+        if experiment_series.experiment_series_name in input_fingerprints:
+            write_fingerprint(series_fingerprint_name(safe_name), series_graphs_fingerprint(input_fingerprints[experiment_series.experiment_series_name]))
     finally:
         session.close()
 
 
+def generate_series_graphs(session, experiment_series, safe_name):
+    experiments = select_all_experiments_by_series_name(session, experiment_series.experiment_series_name)
+
+    generate_experiment_series_force_graph(session, safe_name, experiments)
+    generate_experiment_series_height_graph(session, safe_name, experiments, experiment_series.height_m)
+    generate_experiment_series_elastic_recovery_graph(session, safe_name, experiments, experiment_series.reset_force_after_seconds, experiment_series.height_m)
+    generate_experiment_series_hysteresis_graph(session, safe_name, select_experiment_cycles_by_series_name(session, experiment_series.experiment_series_name))
+
+
 def delete_relevant_graphs(safe_name):
     graphs_dir = Path(__file__).parent.parent / "experiments_server" / "assets" / "graphs"
 
     if graphs_dir.exists():
         # Delete only series-specific graphs
-        (graphs_dir / f"series_{safe_name}_force.html").unlink(missing_ok=True)
-        (graphs_dir / f"series_{safe_name}_height.html").unlink(missing_ok=True)
-        (graphs_dir / f"series_{safe_name}_elastic_recovery.html").unlink(missing_ok=True)
+        for graph_type in ("force", "height", "elastic_recovery", "hysteresis"):
+            (graphs_dir / f"series_{safe_name}_{graph_type}.html").unlink(missing_ok=True)
+            (graphs_dir / f"series_{safe_name}_{graph_type}.html.gz").unlink(missing_ok=True)
+        (graphs_dir / f"{series_fingerprint_name(safe_name)}{FINGERPRINT_SUFFIX}").unlink(missing_ok=True)
     else:
         graphs_dir.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
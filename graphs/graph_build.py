@@ -0,0 +1,287 @@
+"""
+Incremental graph generation: every graph declares the series it reads, the fingerprint of those
+inputs is stored next to its output file and the graph is only generated again when the
+fingerprint changed (or with force=True).
+
+The aggregate graphs are built as a DAG of datasets and figures: every dataset the stale graphs
+read is computed once, then the figures are rendered and written in parallel by a process pool,
+each from the datasets it declares.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from database.models.experiment_series_model import ExperimentSeries
+from database.queries.graph_input_queries import select_series_input_fingerprints, combine_fingerprints
+from database.queries.graph_queries import (
+    dataset_memo,
+    get_force_no_force_compression_data,
+    get_force_no_force_equilibrium_data,
+    get_force_no_force_recovery_consistency_data,
+    get_force_no_force_recovery_data,
+    get_force_no_force_stiffness_data,
+    get_layer_count_vs_efficiency_chart_values,
+    get_layer_count_vs_force_chart_values,
+    get_layer_count_vs_height_chart_values,
+    get_layer_height_reduction_vs_force_data,
+    get_load_bearing_parameter_importance_data,
+    get_load_capacity_ratio_y_chart_values,
+    get_strand_count_force_vs_displacement_data,
+    get_strand_count_stiffness_vs_compression_data,
+    get_strand_count_tangent_stiffness_data,
+    get_strand_count_vs_efficiency_chart_values,
+    get_strand_count_vs_force_chart_values,
+    get_strand_count_vs_weight_chart_values,
+    get_strand_height_reduction_vs_force_data,
+    get_strand_radius_vs_efficiency_chart_values,
+    get_strand_radius_vs_force_chart_values,
+    get_strand_radius_vs_weight_chart_values,
+    get_strand_thickness_max_survivable_force_data,
+    get_thickness_height_reduction_vs_force_data
+)
+from graphs.graph_constants import TARGET_HEIGHT_REDUCTION_PERCENT
+from graphs.graph_output import written_graph_sizes, print_graph_sizes
+from graphs.aggregate_graphs import (
+    GRAPHS_DIR,
+    generate_load_capacity_ratio_graph,
+    generate_strand_thickness_weight_graph,
+    generate_strand_thickness_force_graph,
+    generate_strand_thickness_efficiency_graph,
+    generate_thickness_height_reduction_vs_force_graph,
+    generate_strand_thickness_max_survivable_force_graph,
+    generate_layer_count_height_graph,
+    generate_layer_count_force_graph,
+    generate_layer_count_efficiency_graph,
+    generate_layer_height_reduction_vs_force_graph,
+    generate_strand_count_weight_graph,
+    generate_strand_count_force_graph,
+    generate_strand_count_efficiency_graph,
+    generate_strand_height_reduction_vs_force_graph,
+    generate_strand_stiffness_vs_compression_graph,
+    generate_strand_force_vs_displacement_graph,
+    generate_recovery_by_thickness_graph,
+    generate_recovery_by_layers_graph,
+    generate_recovery_by_strands_graph,
+    generate_recovery_heatmap_thickness_layers,
+    generate_recovery_heatmap_strands_layers,
+    generate_recovery_heatmap_strands_thickness,
+    generate_recovery_parameter_importance_graph,
+    generate_equilibrium_time_graph,
+    generate_equilibrium_time_by_strands_graph,
+    generate_compression_validation_graph,
+    generate_stiffness_comparison_graph,
+    generate_recovery_consistency_graph,
+    generate_load_bearing_parameter_importance_graph,
+    generate_compression_parameter_importance_graph
+)
+
+# Bump when a change to the graph code changes otherwise identical graphs, or run with --force
+GRAPH_CODE_VERSION = "1"
+FINGERPRINT_SUFFIX = ".fingerprint"
+
+
+@dataclass(frozen=True)
+class AggregateGraph:
+    output: str  # file name in GRAPHS_DIR
+    generate: Callable  # generate(session)
+    reads: Optional[str]  # part of the group names of the series it reads (group_name LIKE '%reads%'), None for all series
+    datasets: Tuple[Callable, ...]  # graph_queries datasets it reads, computed once per build
+
+
+AGGREGATE_GRAPHS = [
+    AggregateGraph("load_capacity_ratio_y.html", generate_load_capacity_ratio_graph, None, (get_load_capacity_ratio_y_chart_values,)),
+
+    AggregateGraph("strand_thickness_vs_weight.html", generate_strand_thickness_weight_graph, "strand_thickness", (get_strand_radius_vs_weight_chart_values,)),
+    AggregateGraph("strand_thickness_vs_force.html", generate_strand_thickness_force_graph, "strand_thickness", (get_strand_radius_vs_force_chart_values,)),
+    AggregateGraph("strand_thickness_vs_efficiency.html", generate_strand_thickness_efficiency_graph, "strand_thickness", (get_strand_radius_vs_efficiency_chart_values,)),
+    AggregateGraph("thickness_height_reduction_vs_force.html", generate_thickness_height_reduction_vs_force_graph, "strand_thickness", (get_thickness_height_reduction_vs_force_data,)),
+    AggregateGraph("strand_thickness_max_survivable_force.html", generate_strand_thickness_max_survivable_force_graph, "strand_thickness", (get_strand_thickness_max_survivable_force_data,)),
+
+    AggregateGraph("layer_count_vs_height.html", generate_layer_count_height_graph, "number_of_layers", (get_layer_count_vs_height_chart_values,)),
+    AggregateGraph("layer_count_vs_force.html", generate_layer_count_force_graph, "number_of_layers", (get_layer_count_vs_force_chart_values,)),
+    AggregateGraph("layer_count_vs_efficiency.html", generate_layer_count_efficiency_graph, "number_of_layers", (get_layer_count_vs_efficiency_chart_values,)),
+    AggregateGraph("layer_height_reduction_vs_force.html", generate_layer_height_reduction_vs_force_graph, "number_of_layers", (get_layer_height_reduction_vs_force_data,)),
+
+    AggregateGraph("strand_count_vs_weight.html", generate_strand_count_weight_graph, "number_of_strands", (get_strand_count_vs_weight_chart_values,)),
+    AggregateGraph("strand_count_vs_force.html", generate_strand_count_force_graph, "number_of_strands", (get_strand_count_vs_force_chart_values,)),
+    AggregateGraph("strand_count_vs_efficiency.html", generate_strand_count_efficiency_graph, "number_of_strands", (get_strand_count_vs_efficiency_chart_values,)),
+    AggregateGraph("strand_height_reduction_vs_force.html", generate_strand_height_reduction_vs_force_graph, "number_of_strands", (get_strand_height_reduction_vs_force_data,)),
+    AggregateGraph("strand_stiffness_vs_compression.html", generate_strand_stiffness_vs_compression_graph, "number_of_strands", (get_strand_count_stiffness_vs_compression_data, get_strand_count_tangent_stiffness_data)),
+    AggregateGraph("strand_force_vs_displacement.html", generate_strand_force_vs_displacement_graph, "number_of_strands", (get_strand_count_force_vs_displacement_data,)),
+
+    AggregateGraph("recovery_by_thickness.html", generate_recovery_by_thickness_graph, "force_no_force", (get_force_no_force_recovery_data,)),
+    AggregateGraph("recovery_by_layers.html", generate_recovery_by_layers_graph, "force_no_force", (get_force_no_force_recovery_data,)),
+    AggregateGraph("recovery_by_strands.html", generate_recovery_by_strands_graph, "force_no_force", (get_force_no_force_recovery_data,)),
+    AggregateGraph("recovery_heatmap_thickness_layers.html", generate_recovery_heatmap_thickness_layers, "force_no_force", (get_force_no_force_recovery_data,)),
+    AggregateGraph("recovery_heatmap_strands_layers.html", generate_recovery_heatmap_strands_layers, "force_no_force", (get_force_no_force_recovery_data,)),
+    AggregateGraph("recovery_heatmap_strands_thickness.html", generate_recovery_heatmap_strands_thickness, "force_no_force", (get_force_no_force_recovery_data,)),
+    AggregateGraph("recovery_parameter_importance.html", generate_recovery_parameter_importance_graph, "force_no_force", (get_force_no_force_recovery_data,)),
+    AggregateGraph("equilibrium_time.html", generate_equilibrium_time_graph, "force_no_force", (get_force_no_force_equilibrium_data,)),
+    AggregateGraph("equilibrium_time_by_strands.html", generate_equilibrium_time_by_strands_graph, "force_no_force", (get_force_no_force_equilibrium_data,)),
+    AggregateGraph("compression_validation.html", generate_compression_validation_graph, "force_no_force", (get_force_no_force_compression_data,)),
+    AggregateGraph("stiffness_comparison.html", generate_stiffness_comparison_graph, "force_no_force", (get_force_no_force_stiffness_data,)),
+    AggregateGraph("recovery_consistency.html", generate_recovery_consistency_graph, "force_no_force", (get_force_no_force_recovery_consistency_data,)),
+    AggregateGraph("load_bearing_parameter_importance.html", generate_load_bearing_parameter_importance_graph, "force_no_force", (get_load_bearing_parameter_importance_data,)),
+    AggregateGraph("compression_parameter_importance.html", generate_compression_parameter_importance_graph, "force_no_force", (get_force_no_force_compression_data,)),
+]
+AGGREGATE_GRAPHS_BY_OUTPUT = {graph.output: graph for graph in AGGREGATE_GRAPHS}
+
+
+def fingerprint_path(output, directory=GRAPHS_DIR):
+    return directory / f"{output}{FINGERPRINT_SUFFIX}"
+
+
+def read_fingerprint(output, directory=GRAPHS_DIR):
+    path = fingerprint_path(output, directory)
+    return path.read_text().strip() if path.exists() else None
+
+
+def write_fingerprint(output, fingerprint, directory=GRAPHS_DIR):
+    fingerprint_path(output, directory).write_text(fingerprint + "\n")
+
+
+def series_fingerprint_name(safe_name):
+    """The fingerprint of the series graphs is stored once for the four of them"""
+    return f"series_{safe_name}"
+
+
+def series_graphs_fingerprint(series_fingerprint):
+    return combine_fingerprints({"": series_fingerprint}, code_version=GRAPH_CODE_VERSION, target=TARGET_HEIGHT_REDUCTION_PERCENT)
+
+
+def aggregate_graph_fingerprint(graph, series_fingerprints, group_names):
+    """Fingerprint of the inputs of `graph`: the fingerprints of the series it reads and the graph settings"""
+    read = {
+        name: fingerprint for name, fingerprint in series_fingerprints.items()
+        if graph.reads is None or graph.reads in (group_names.get(name) or "")
+    }
+    return combine_fingerprints(read, output=graph.output, code_version=GRAPH_CODE_VERSION, target=TARGET_HEIGHT_REDUCTION_PERCENT)
+
+
+def _get_context():
+    # Forked children would inherit the parent's open database connections
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["graphs.graph_build"])
+    return context
+
+
+def _render_graph(output, datasets):
+    """Figure node: render and write one graph from its precomputed datasets, returns the seconds it took and the file sizes"""
+    from database.session import ReadOnlySessionLocal
+
+    start = time.perf_counter()
+    first_size = len(written_graph_sizes)
+    graph = AGGREGATE_GRAPHS_BY_OUTPUT[output]
+    # The session is only used if the graph reads a dataset it does not declare
+    session = ReadOnlySessionLocal()
+    try:
+        with dataset_memo(datasets):
+            graph.generate(session)
+    finally:
+        session.close()
+    return time.perf_counter() - start, written_graph_sizes[first_size:]
+
+
+def print_graph_timings(timings, wall_seconds):
+    """Per-node timings of a build, slowest first"""
+    if not timings:
+        return
+    print("  Timings ({:.2f} s wall, {:.2f} s in nodes):".format(wall_seconds, sum(timings.values())))
+    for node, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        print("    {:8.3f} s  {}".format(seconds, node))
+
+
+def build_aggregate_graphs(session, graphs=None, force=False, workers=None):
+    """
+    Generate the aggregate graphs whose inputs changed since they were last generated, on
+    `workers` processes (all cores by default, 1 renders in this process).
+    Returns the (generated, up to date) graph outputs and the seconds of every dataset and figure node.
+    """
+    graphs = AGGREGATE_GRAPHS if graphs is None else graphs
+    workers = workers or os.cpu_count() or 1
+    series_fingerprints = select_series_input_fingerprints(session)
+    group_names = dict(session.query(ExperimentSeries.experiment_series_name, ExperimentSeries.group_name).all())
+
+    fingerprints, up_to_date = {}, []
+    for graph in graphs:
+        fingerprint = aggregate_graph_fingerprint(graph, series_fingerprints, group_names)
+        if not force and read_fingerprint(graph.output) == fingerprint:
+            up_to_date.append(graph.output)
+        else:
+            fingerprints[graph.output] = fingerprint
+    stale = [graph for graph in graphs if graph.output in fingerprints]
+
+    # Dataset nodes: computed once here, shared by all the graphs that read them
+    build_start = time.perf_counter()
+    timings = {}
+    datasets = {}
+    for dataset in dict.fromkeys(dataset for graph in stale for dataset in graph.datasets):
+        start = time.perf_counter()
+        datasets[dataset.__name__] = dataset(session)
+        timings["dataset " + dataset.__name__] = time.perf_counter() - start
+
+    # Figure nodes: each depends on its datasets only
+    generated = []
+    sizes = []
+
+    def finished(graph, result=None, error=None):
+        if error is not None:
+            print("      Error generating {}: {}".format(graph.output, error))
+            return
+        print("    - {}...".format(graph.output))
+        timings["figure " + graph.output], graph_sizes = result
+        sizes.extend(graph_sizes)
+        write_fingerprint(graph.output, fingerprints[graph.output])
+        generated.append(graph.output)
+
+    def graph_datasets(graph):
+        return {dataset.__name__: datasets[dataset.__name__] for dataset in graph.datasets}
+
+    if workers == 1 or len(stale) <= 1:
+        for graph in stale:
+            try:
+                finished(graph, _render_graph(graph.output, graph_datasets(graph)))
+            except Exception as e:
+                finished(graph, error=e)
+    elif stale:
+        with ProcessPoolExecutor(max_workers=min(workers, len(stale)), mp_context=_get_context()) as pool:
+            futures = [(graph, pool.submit(_render_graph, graph.output, graph_datasets(graph))) for graph in stale]
+            for graph, future in futures:
+                try:
+                    finished(graph, future.result())
+                except Exception as e:
+                    finished(graph, error=e)
+
+    print_graph_timings(timings, time.perf_counter() - build_start)
+    print_graph_sizes(sizes)
+    return generated, up_to_date, timings
+
+
+def build_series_graphs(session, experiment_series_list, force=False):
+    """
+    Generate the graphs of the series whose inputs changed since they were last generated.
+    Returns the (generated, up to date) series names.
+    """
+    from graphs.generate_after_experiments import generate_graphs_after_experiments, safe_graph_name
+
+    series_fingerprints = select_series_input_fingerprints(session, [series.experiment_series_name for series in experiment_series_list])
+
+    first_size = len(written_graph_sizes)
+    generated, up_to_date = [], []
+    for experiment_series in experiment_series_list:
+        output = series_fingerprint_name(safe_graph_name(experiment_series.experiment_series_name))
+        fingerprint = series_graphs_fingerprint(series_fingerprints[experiment_series.experiment_series_name])
+        if not force and read_fingerprint(output) == fingerprint:
+            up_to_date.append(experiment_series.experiment_series_name)
+            continue
+
+        generate_graphs_after_experiments(experiment_series)
+        generated.append(experiment_series.experiment_series_name)
+    print_graph_sizes(written_graph_sizes[first_size:])
+    return generated, up_to_date
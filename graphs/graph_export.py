@@ -0,0 +1,160 @@
+"""
+Publication export: the series and aggregate figures as PDF, SVG and PNG files for the paper.
+
+Every figure is rendered by one kaleido renderer, a single headless Chrome kept open for the
+whole export with `workers` tabs rendering in parallel, fed in batches. Starting a renderer
+per image costs more than rendering it. Like the graph build, the figures of a graph are only
+exported again when the fingerprint of its inputs or of the export settings changed.
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+from database.models.experiment_series_model import ExperimentSeries
+from database.queries.experiment_series_queries import select_all_experiment_series
+from database.queries.graph_input_queries import select_series_input_fingerprints, combine_fingerprints
+from database.queries.graph_queries import dataset_memo
+from graphs.aggregate_graphs import GRAPHS_DIR
+from graphs.generate_after_experiments import generate_series_graphs, safe_graph_name
+from graphs.graph_build import (
+    AGGREGATE_GRAPHS,
+    aggregate_graph_fingerprint,
+    read_fingerprint,
+    series_fingerprint_name,
+    series_graphs_fingerprint,
+    write_fingerprint
+)
+from graphs.graph_output import capture_figures
+
+EXPORT_DIR = GRAPHS_DIR.parent / "figures"
+EXPORT_FORMATS = ("pdf", "svg", "png")
+# Layout pixels, the figures that set their own size keep it
+EXPORT_WIDTH = 1000
+EXPORT_HEIGHT = 600
+# The PNG copies are rendered at 3x for print, the vector formats do not need it
+PNG_SCALE = 3
+# Graphs whose figures are built and then rendered together, their fingerprints are written after every batch
+BATCH_SIZE = 16
+# Tabs of the renderer, Chrome does not get faster beyond a few
+MAX_RENDER_TABS = 8
+
+
+def export_fingerprint(graph_fingerprint, formats):
+    """The graph's input fingerprint combined with the export settings"""
+    return combine_fingerprints({"graph": graph_fingerprint}, formats=sorted(formats), width=EXPORT_WIDTH, height=EXPORT_HEIGHT, png_scale=PNG_SCALE)
+
+
+def figure_specs(name, fig, formats):
+    """The kaleido render specs of one figure, one per format"""
+    # Serialized by plotly, the typed arrays are decoded by the plotly.js of the renderer
+    figure = json.loads(fig.to_json())
+    width = fig.layout.width or EXPORT_WIDTH
+    height = fig.layout.height or EXPORT_HEIGHT
+    return [
+        {
+            "fig": figure,
+            "path": EXPORT_DIR / f"{name}.{export_format}",
+            "opts": {"format": export_format, "width": width, "height": height, "scale": PNG_SCALE if export_format == "png" else 1},
+        }
+        for export_format in formats
+    ]
+
+
+def _series_exports(session, experiment_series_list, series_fingerprints, formats):
+    """(fingerprint name, fingerprint, build) of the series graphs, build() generates their figures"""
+    exports = []
+    for experiment_series in experiment_series_list:
+        if experiment_series.experiment_series_name not in series_fingerprints:
+            continue
+        safe_name = safe_graph_name(experiment_series.experiment_series_name)
+        fingerprint = export_fingerprint(series_graphs_fingerprint(series_fingerprints[experiment_series.experiment_series_name]), formats)
+
+        def build(experiment_series=experiment_series, safe_name=safe_name):
+            generate_series_graphs(session, experiment_series, safe_name)
+
+        exports.append((series_fingerprint_name(safe_name), fingerprint, build))
+    return exports
+
+
+def _aggregate_exports(session, series_fingerprints, formats):
+    group_names = dict(session.query(ExperimentSeries.experiment_series_name, ExperimentSeries.group_name).all())
+    exports = []
+    for graph in AGGREGATE_GRAPHS:
+        fingerprint = export_fingerprint(aggregate_graph_fingerprint(graph, series_fingerprints, group_names), formats)
+
+        def build(graph=graph):
+            graph.generate(session)
+
+        exports.append((Path(graph.output).stem, fingerprint, build))
+    return exports
+
+
+def _render(specs):
+    """Render the specs on the running renderer, returns the file names that failed and why"""
+    import kaleido
+
+    errors = []
+    kaleido.write_fig_from_object_sync(specs, error_log=errors)
+    return {error.name: error for error in errors}
+
+
+def export_figures(session, formats=EXPORT_FORMATS, force=False, workers=None):
+    """
+    Export the figures of every series and aggregate graph whose inputs changed since the last
+    export to EXPORT_DIR, as `formats`, rendering on `workers` tabs of one renderer.
+    Returns the (exported, up to date) graph names.
+    """
+    import kaleido
+
+    workers = workers or min(os.cpu_count() or 1, MAX_RENDER_TABS)
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+
+    series_fingerprints = select_series_input_fingerprints(session)
+    exports = _series_exports(session, select_all_experiment_series(session), series_fingerprints, formats)
+    exports += _aggregate_exports(session, series_fingerprints, formats)
+
+    up_to_date = [name for name, fingerprint, _ in exports if not force and read_fingerprint(name, EXPORT_DIR) == fingerprint]
+    stale = [export for export in exports if export[0] not in up_to_date]
+    if not stale:
+        return [], up_to_date
+
+    exported = []
+    start = time.perf_counter()
+    # One renderer for the whole export, the sync calls below all go to it
+    kaleido.start_sync_server(n=workers, mathjax=False, silence_warnings=True)
+    try:
+        # The datasets of the aggregate graphs are computed once for all of them
+        with dataset_memo():
+            for first in range(0, len(stale), BATCH_SIZE):
+                batch = stale[first:first + BATCH_SIZE]
+                specs = {}
+                for name, _, build in batch:
+                    with capture_figures() as captured:
+                        try:
+                            build()
+                        except Exception as e:
+                            print("      Error building {}: {}".format(name, e))
+                            continue
+                    specs[name] = [spec for figure_name, fig in captured for spec in figure_specs(figure_name, fig, formats)]
+
+                # kaleido consumes the specs, the file names are kept to match its errors
+                files = {name: [spec["path"].name for spec in graph_specs] for name, graph_specs in specs.items()}
+                all_specs = [spec for graph_specs in specs.values() for spec in graph_specs]
+                failed = _render(all_specs) if all_specs else {}
+
+                for name, fingerprint, _ in batch:
+                    if name not in files:
+                        continue
+                    errors = [failed[file_name] for file_name in files[name] if file_name in failed]
+                    if errors:
+                        print("      Error exporting {}: {}".format(name, errors[0]))
+                        continue
+                    write_fingerprint(name, fingerprint, EXPORT_DIR)
+                    exported.append(name)
+                print("    {} / {} graphs ({} files) in {:.1f} s".format(
+                    min(first + BATCH_SIZE, len(stale)), len(stale), len(all_specs), time.perf_counter() - start))
+    finally:
+        kaleido.stop_sync_server(silence_warnings=True)
+
+    return exported, up_to_date
@@ -0,0 +1,150 @@
+"""
+Graph artifacts for offline serving: the HTML references one local plotly.js served by the
+experiments server (no CDN), the figure data is rounded and stored as typed arrays, and a
+gzip copy is written next to every file for the server to send as is.
+"""
+import gzip
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Served by experiments_server from the installed plotly package, so it matches the figure JSON
+PLOTLY_JS_DIR = Path(plotly.__file__).parent / "package_data"
+PLOTLY_JS_FILENAME = "plotly.min.js"
+PLOTLY_JS_URL = "/vendor/" + PLOTLY_JS_FILENAME
+
+GRAPH_CONFIG = {'displayModeBar': True, 'displaylogo': False}
+# Significant digits kept in the figure data, far below what a plot can show
+SIGNIFICANT_DIGITS = 6
+# plotly >= 6 writes numpy arrays as base64 typed arrays, older versions as lists
+TYPED_ARRAYS = int(plotly.__version__.split(".")[0]) >= 6
+FLOAT32_MAX = 3e38
+FLOAT32_MIN = 1e-30
+INT32_MAX = 2**31 - 1
+
+# Sizes of the graphs written by this process, see print_graph_sizes
+written_graph_sizes = []
+# [(graph name, figure)] while capture_figures is active
+_captured_figures = None
+
+
+def round_significant(values, digits=SIGNIFICANT_DIGITS):
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values) & (values != 0)
+    magnitude = np.floor(np.log10(np.abs(values, where=finite, out=np.ones_like(values))))
+    scale = 10.0 ** (digits - 1 - magnitude)
+    return np.where(finite, np.round(values * scale) / scale, values)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+def _numeric_array(value):
+    """The numbers of a (nested) list or array, None as NaN, as a compact numpy array. None if not all numeric."""
+    if not isinstance(value, np.ndarray):
+        if len(value) < 2:
+            return None
+        nested = isinstance(value[0], (list, tuple))
+        if nested and not all(isinstance(row, (list, tuple)) and len(row) == len(value[0]) for row in value):
+            return None
+        items = [item for row in value for item in row] if nested else value
+        if not all(item is None or _is_number(item) for item in items) or all(item is None for item in items):
+            return None
+        array = np.array([np.nan if item is None else item for item in items])
+        value = array.reshape(len(value), -1) if nested else array
+    if value.dtype.kind not in "iuf" or value.size < 2:
+        return None
+
+    if value.dtype.kind in "iu":
+        if TYPED_ARRAYS and np.abs(value).max() <= INT32_MAX:
+            return value.astype(np.int32)
+        return value
+
+    rounded = round_significant(value)
+    if not TYPED_ARRAYS:
+        return rounded
+    magnitudes = np.abs(rounded[np.isfinite(rounded) & (rounded != 0)])
+    # float32 keeps 7 significant digits, enough for the rounded values when they are in its range
+    if magnitudes.size == 0 or (magnitudes.max() < FLOAT32_MAX and magnitudes.min() > FLOAT32_MIN):
+        return rounded.astype(np.float32)
+    return rounded
+
+
+def compact_figure_data(value):
+    """
+    The trace data with numeric arrays rounded and converted to numpy arrays. Validating the
+    figure again turns the arrays of data attributes into typed arrays and the others into lists.
+    """
+    if isinstance(value, dict):
+        return {key: compact_figure_data(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        array = _numeric_array(value)
+        if array is not None:
+            return array
+        if isinstance(value, np.ndarray):
+            return value
+        return [compact_figure_data(item) for item in value]
+    if isinstance(value, (float, np.floating)):
+        return float(round_significant(value))
+    return value
+
+
+@contextmanager
+def capture_figures():
+    """Collect the figures the graph functions build instead of writing them, as (graph name, figure)"""
+    global _captured_figures
+    previous = _captured_figures
+    _captured_figures = []
+    try:
+        yield _captured_figures
+    finally:
+        _captured_figures = previous
+
+
+def write_graph_html(fig, output_path):
+    """Write the figure as HTML using the local plotly.js, with a gzip copy, returns the file sizes"""
+    output_path = Path(output_path)
+    if _captured_figures is not None:
+        _captured_figures.append((output_path.stem, fig))
+        return None
+    original_json_bytes = len(fig.to_json().encode("utf-8"))
+    figure = fig.to_dict()
+    figure["data"] = [compact_figure_data(trace) for trace in figure["data"]]
+    compact_fig = go.Figure(figure)
+
+    html = pio.to_html(compact_fig, include_plotlyjs=PLOTLY_JS_URL, config=GRAPH_CONFIG, full_html=True).encode("utf-8")
+    output_path.write_bytes(html)
+    # mtime=0: the same graph gives the same bytes
+    compressed = gzip.compress(html, compresslevel=9, mtime=0)
+    Path(f"{output_path}.gz").write_bytes(compressed)
+
+    sizes = {
+        "output": output_path.name,
+        "original_json": original_json_bytes,
+        "json": len(compact_fig.to_json().encode("utf-8")),
+        "html": len(html),
+        "gzip": len(compressed),
+    }
+    written_graph_sizes.append(sizes)
+    return sizes
+
+
+def print_graph_sizes(sizes):
+    """Size reduction of the written graphs: figure JSON before and after compaction, HTML and gzip"""
+    if not sizes:
+        return
+    original_json = sum(size["original_json"] for size in sizes)
+    json_bytes = sum(size["json"] for size in sizes)
+    html = sum(size["html"] for size in sizes)
+    compressed = sum(size["gzip"] for size in sizes)
+    plotly_js = (PLOTLY_JS_DIR / PLOTLY_JS_FILENAME).stat().st_size
+    print("  Sizes of {} graphs:".format(len(sizes)))
+    print("    figure JSON {:,} -> {:,} bytes ({:.0%} smaller)".format(original_json, json_bytes, 1 - json_bytes / original_json))
+    print("    HTML {:,} bytes, gzip {:,} bytes ({:.0%} smaller than the HTML)".format(html, compressed, 1 - compressed / html))
+    print("    shared {} {:,} bytes, instead of embedding it in every graph ({:,} bytes)".format(
+        PLOTLY_JS_FILENAME, plotly_js, plotly_js * len(sizes)))
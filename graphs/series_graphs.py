@@ -1,4 +1,5 @@
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -6,6 +7,7 @@ from sklearn.preprocessing import PolynomialFeatures
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score
 from graphs.graph_constants import TARGET_HEIGHT_REDUCTION_PERCENT
+from graphs.graph_output import write_graph_html
 
 GRAPHS_DIR = Path(__file__).parent.parent / "experiments_server" / "assets" / "graphs"
 GRAPHS_DIR.mkdir(parents=True, exist_ok=True)
@@ -89,7 +91,7 @@ def generate_experiment_series_force_graph(session, safe_name, experiments):
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / f"series_{safe_name}_force.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return f"series_{safe_name}_force.html"
 
@@ -174,7 +176,7 @@ def generate_experiment_series_height_graph(session, safe_name, experiments, ini
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / f"series_{safe_name}_height.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return f"series_{safe_name}_height.html"
 
@@ -251,6 +253,67 @@ def generate_experiment_series_elastic_recovery_graph(session, safe_name, experi
     apply_latex_font_theme(fig)
 
     output_path = GRAPHS_DIR / f"series_{safe_name}_elastic_recovery.html"
-    fig.write_html(str(output_path), include_plotlyjs='cdn', config={'displayModeBar': True, 'displaylogo': False})
+    write_graph_html(fig, output_path)
 
     return f"series_{safe_name}_elastic_recovery.html"
+
+
+def generate_experiment_series_hysteresis_graph(session, safe_name, experiment_cycles):
+    """Per-cycle dissipated energy and residual height of a cyclic load series, one line per experiment"""
+    if not experiment_cycles:
+        return None
+
+    df = pd.DataFrame([
+        {
+            'experiment_id': experiment.experiment_id,
+            'force': abs(experiment.force_in_y_direction or 0.0),
+            'cycle': cycle.cycle_index + 1,
+            'amplitude': cycle.amplitude,
+            'dissipated_energy': cycle.dissipated_energy,
+            'residual_height': cycle.residual_height,
+            'peak_compression': cycle.peak_compression
+        }
+        for experiment, cycle in experiment_cycles
+    ])
+
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=('Dissipated Energy per Cycle', 'Residual Height per Cycle')
+    )
+
+    for experiment_id, experiment_df in df.groupby('experiment_id'):
+        name = f"Experiment {experiment_id} ({experiment_df['force'].iloc[0]:.2f} N)"
+        fig.add_trace(go.Scatter(
+            x=experiment_df['cycle'],
+            y=experiment_df['dissipated_energy'],
+            mode='lines+markers',
+            name=name,
+            legendgroup=name,
+            customdata=experiment_df[['amplitude', 'peak_compression']],
+            hovertemplate='<b>Cycle %{x}</b><br>Dissipated Energy: %{y:.3e} J<br>Amplitude: %{customdata[0]:.2f}<br>Peak Compression: %{customdata[1]:.4f} m<extra></extra>'
+        ), row=1, col=1)
+        fig.add_trace(go.Scatter(
+            x=experiment_df['cycle'],
+            y=experiment_df['residual_height'],
+            mode='lines+markers',
+            name=name,
+            legendgroup=name,
+            showlegend=False,
+            hovertemplate='<b>Cycle %{x}</b><br>Residual Height: %{y:.4f} m<extra></extra>'
+        ), row=1, col=2)
+
+    fig.update_xaxes(title_text='Cycle', dtick=1)
+    fig.update_yaxes(title_text='Dissipated Energy (J)', row=1, col=1)
+    fig.update_yaxes(title_text='Residual Height (m)', row=1, col=2)
+    fig.update_layout(
+        title=f'Cyclic Loading Hysteresis - {safe_name}',
+        height=500,
+        hovermode='closest',
+        showlegend=True
+    )
+    apply_latex_font_theme(fig)
+
+    output_path = GRAPHS_DIR / f"series_{safe_name}_hysteresis.html"
+    write_graph_html(fig, output_path)
+
+    return f"series_{safe_name}_hysteresis.html"
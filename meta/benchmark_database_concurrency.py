@@ -0,0 +1,117 @@
+"""
+Reader latency while experiment results are written in batches, with the previous session setup
+(rollback journal, foreign_keys only) and with the tuned one (WAL, see database/session.py).
+
+    python -m meta.benchmark_database_concurrency
+
+Runs on a temporary copy of the schema, database.db is not touched.
+"""
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Experiment, ExperimentSeries
+from database.models.base import Base
+from database.queries.experiments_queries import select_experiment_by_series_name_and_id, select_experiment_series_ids
+from database.session import create_database_engine, SQLITE_PRAGMAS
+
+NUM_SERIES = 20
+NUM_BATCHES = 5
+BATCH_SIZE = 20000
+# Time the writer keeps each batch transaction open, like a flush of a long campaign
+BATCH_HOLD_SECONDS = 0.2
+NUM_READERS = 4
+# A read slower than this counts as a stall (the dashboard freezing)
+STALL_SECONDS = 0.25
+
+ROLLBACK_JOURNAL_PRAGMAS = {"journal_mode": "DELETE", "foreign_keys": "ON"}
+
+
+def _experiment(experiment_series_id, experiment_id):
+    return Experiment(
+        experiment_series_id=experiment_series_id, experiment_id=experiment_id,
+        force_in_y_direction=-float(experiment_id), force_top_nodes_in_y_direction=0.0, force_in_x_direction=0.0,
+        force_in_z_direction=0.0, torsional_force=0.0, height_under_load=0.1, final_height=0.1
+    )
+
+
+def _write_batches(Session, series_names):
+    next_ids = {name: 1 for name in series_names}
+    with Session() as session:
+        experiment_series_ids = select_experiment_series_ids(session, series_names)
+    for batch in range(NUM_BATCHES):
+        session = Session()
+        for i in range(BATCH_SIZE):
+            name = series_names[(batch + i) % len(series_names)]
+            session.add(_experiment(experiment_series_ids[name], next_ids[name]))
+            next_ids[name] += 1
+        session.flush()  # takes the write lock
+        time.sleep(BATCH_HOLD_SECONDS)
+        session.commit()
+        session.close()
+
+
+def _read_until(path, pragmas, series_names, stop, latencies):
+    """Reader process, like a request of the server"""
+    read_engine = create_database_engine(path, read_only=True, pragmas=pragmas)
+    session = sessionmaker(bind=read_engine)()
+    reader_latencies = []
+    i = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        select_experiment_by_series_name_and_id(session, series_names[i % len(series_names)], 1)
+        session.rollback()  # end the read transaction so the next query sees new batches
+        reader_latencies.append(time.perf_counter() - start)
+        i += 1
+    session.close()
+    latencies.put(reader_latencies)
+
+
+def run_benchmark(label, pragmas):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "benchmark.db")
+    write_engine = create_database_engine(path, pragmas=pragmas)
+    Base.metadata.create_all(write_engine)
+
+    WriteSession = sessionmaker(bind=write_engine)
+    series_names = [f"benchmark_{i}" for i in range(NUM_SERIES)]
+    with WriteSession() as session:
+        session.add_all([ExperimentSeries(experiment_series_name=name) for name in series_names])
+        session.commit()
+
+    # Readers in their own processes, so they do not compete with the writer for the GIL
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    latencies = context.Queue()
+    readers = [context.Process(target=_read_until, args=(path, pragmas, series_names, stop, latencies)) for _ in range(NUM_READERS)]
+    for reader in readers:
+        reader.start()
+    time.sleep(1.0)  # let the readers import and connect
+
+    start = time.perf_counter()
+    _write_batches(WriteSession, series_names)
+    write_seconds = time.perf_counter() - start
+
+    stop.set()
+    all_latencies = sorted(latency for _ in readers for latency in latencies.get())
+    for reader in readers:
+        reader.join()
+    write_engine.dispose()
+
+    p95 = all_latencies[int(len(all_latencies) * 0.95)]
+    stalls = sum(latency > STALL_SECONDS for latency in all_latencies)
+    print(
+        f"{label:>16}: {len(all_latencies):6d} reads, median {statistics.median(all_latencies) * 1000:7.2f} ms, "
+        f"p95 {p95 * 1000:7.2f} ms, max {all_latencies[-1] * 1000:7.2f} ms, {stalls} stalls, "
+        f"writes {NUM_BATCHES * BATCH_SIZE / write_seconds:8.0f} rows/s"
+    )
+
+
+if __name__ == '__main__':
+    print(f"{NUM_READERS} readers during {NUM_BATCHES} batches of {BATCH_SIZE} experiments, each held open {BATCH_HOLD_SECONDS} s")
+    run_benchmark("rollback journal", ROLLBACK_JOURNAL_PRAGMAS)
+    run_benchmark("WAL", SQLITE_PRAGMAS)
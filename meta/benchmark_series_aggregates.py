@@ -0,0 +1,125 @@
+"""
+Series summaries computed in Python over loaded experiments (compute_series_summaries) against
+the SQL aggregates with window functions (aggregate_series_summaries), on a synthetic database.
+
+    python -m meta.benchmark_series_aggregates
+
+Runs on a temporary database, database.db is not touched.
+"""
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Experiment, ExperimentSeries
+from database.models.base import Base
+from database.queries.series_summary_queries import compute_series_summaries, aggregate_series_summaries
+from database.session import create_database_engine
+
+NUM_SERIES = 2000
+EXPERIMENTS_PER_SERIES = 50
+GROUPS = ["strand_thickness", "number_of_layers", "number_of_strands", "force_no_force"]
+REPEATS = 3
+SEED = 0
+
+
+def _synthetic_experiments(rng, experiment_series_id, height_m):
+    """A force sweep: the height under load drops with the force, recovery plateaus, some explode at the end"""
+    stiffness = rng.uniform(50, 500)
+    explodes_after = rng.randint(EXPERIMENTS_PER_SERIES // 2, EXPERIMENTS_PER_SERIES * 2)
+    rows = []
+    for experiment_id in range(1, EXPERIMENTS_PER_SERIES + 1):
+        force = experiment_id * 0.2
+        height_under_load = max(height_m - force / stiffness + rng.gauss(0, height_m * 0.002), height_m * 0.2)
+        recovery = min(0.95, 0.5 + experiment_id * 0.01) * rng.uniform(0.97, 1.03)
+        exploded = experiment_id > explodes_after
+        rows.append({
+            "experiment_series_id": experiment_series_id,
+            "experiment_id": experiment_id,
+            "force_in_y_direction": -force,
+            "force_in_x_direction": rng.choice([None, force * 0.1]),
+            "force_in_z_direction": 0.0,
+            "force_top_nodes_in_y_direction": -force,
+            "torsional_force": force * 0.01,
+            "equilibrium_after_seconds": rng.randint(1, 5),
+            "time_to_bounding_box_explosion": rng.uniform(0.5, 2.0) if exploded else None,
+            "height_under_load": height_under_load,
+            "final_height": height_under_load + recovery * (height_m - height_under_load),
+        })
+    return rows
+
+
+def create_synthetic_database(path):
+    engine = create_database_engine(path)
+    Base.metadata.create_all(engine)
+    rng = random.Random(SEED)
+    with engine.begin() as connection:
+        connection.execute(insert(ExperimentSeries.__table__), [
+            {
+                "id": experiment_series_id,
+                "experiment_series_name": f"benchmark_{experiment_series_id}",
+                "group_name": GROUPS[experiment_series_id % len(GROUPS)],
+                "height_m": rng.uniform(0.05, 0.2),
+                "weight_kg": rng.uniform(0.01, 0.1),
+            }
+            for experiment_series_id in range(1, NUM_SERIES + 1)
+        ])
+        heights = dict(connection.execute(ExperimentSeries.__table__.select().with_only_columns(
+            ExperimentSeries.__table__.c.id, ExperimentSeries.__table__.c.height_m
+        )).all())
+        for experiment_series_id, height_m in heights.items():
+            connection.execute(insert(Experiment.__table__), _synthetic_experiments(rng, experiment_series_id, height_m))
+    return engine
+
+
+def _best_seconds(function):
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+
+def _max_difference(python_summaries, sql_summaries):
+    """Largest relative difference between the float metrics, None if any other metric differs"""
+    max_difference = 0.0
+    for experiment_series_id, python_summary in python_summaries.items():
+        for key, python_value in python_summary.items():
+            sql_value = sql_summaries[experiment_series_id][key]
+            if isinstance(python_value, float) and isinstance(sql_value, float):
+                max_difference = max(max_difference, abs(python_value - sql_value) / max(abs(python_value), 1e-300))
+            elif python_value != sql_value:
+                return None
+    return max_difference
+
+
+def run_benchmark(label, Session, series_filter, all_series=False):
+    with Session() as session:
+        series_by_id = {series.id: series for series in session.query(ExperimentSeries).filter(*series_filter).all()}
+        python_seconds, python_summaries = _best_seconds(lambda: compute_series_summaries(session, series_by_id))
+        sql_seconds, sql_summaries = _best_seconds(lambda: aggregate_series_summaries(session, series_by_id, all_series=all_series))
+        session.expunge_all()
+
+    max_difference = _max_difference(python_summaries, sql_summaries)
+    agreement = "MISMATCH" if max_difference is None else f"max relative difference {max_difference:.1e}"
+    print(
+        f"{label:>22}: {len(series_by_id):5d} series, python {python_seconds * 1000:8.1f} ms, "
+        f"sql {sql_seconds * 1000:8.1f} ms ({python_seconds / sql_seconds:4.1f}x), {agreement}"
+    )
+
+
+if __name__ == '__main__':
+    directory = tempfile.mkdtemp()
+    engine = create_synthetic_database(os.path.join(directory, "benchmark.db"))
+    Session = sessionmaker(bind=engine)
+    print(f"{NUM_SERIES} series of {EXPERIMENTS_PER_SERIES} experiments, best of {REPEATS}")
+
+    run_benchmark("all series", Session, [], all_series=True)
+    run_benchmark("strand_thickness group", Session, [ExperimentSeries.group_name.like('%strand_thickness%')])
+    run_benchmark("one series", Session, [ExperimentSeries.id == 1])
+    engine.dispose()
@@ -0,0 +1,17 @@
+import argparse
+
+from database.session import scoped_session
+from graphs.graph_export import EXPORT_DIR, EXPORT_FORMATS, export_figures
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export the series and aggregate figures for publication, the ones whose inputs changed since the last export")
+    parser.add_argument("--format", dest="formats", action="append", choices=EXPORT_FORMATS, help="Format to export, repeat for several (default: all)")
+    parser.add_argument("--force", action="store_true", help="Export every figure, even the up-to-date ones")
+    parser.add_argument("--workers", type=int, default=None, help="Tabs of the renderer rendering in parallel")
+    args = parser.parse_args()
+
+    with scoped_session() as session:
+        print(f"Exporting figures to {EXPORT_DIR}...")
+        exported, up_to_date = export_figures(session, formats=args.formats or EXPORT_FORMATS, force=args.force, workers=args.workers)
+
+        print(f"\n{len(exported)} graphs exported, {len(up_to_date)} up to date")
@@ -1,115 +1,15 @@
+import argparse
+
 from database.session import scoped_session
-from graphs.aggregate_graphs import (
-    generate_load_capacity_ratio_graph,
-    generate_strand_thickness_weight_graph,
-    generate_strand_thickness_force_graph,
-    generate_strand_thickness_efficiency_graph,
-    generate_thickness_height_reduction_vs_force_graph,
-    generate_strand_thickness_max_survivable_force_graph,
-    generate_layer_count_height_graph,
-    generate_layer_count_force_graph,
-    generate_layer_count_efficiency_graph,
-    generate_layer_height_reduction_vs_force_graph,
-    generate_strand_count_weight_graph,
-    generate_strand_count_force_graph,
-    generate_strand_count_efficiency_graph,
-    generate_strand_height_reduction_vs_force_graph,
-    generate_strand_stiffness_vs_compression_graph,
-    generate_strand_force_vs_displacement_graph,
-    generate_recovery_by_layers_graph,
-    generate_recovery_by_strands_graph,
-    generate_recovery_heatmap_strands_layers,
-    generate_recovery_parameter_importance_graph,
-    generate_equilibrium_time_graph,
-    generate_equilibrium_time_by_strands_graph,
-    generate_compression_validation_graph,
-    generate_stiffness_comparison_graph,
-    generate_recovery_consistency_graph,
-    generate_load_bearing_parameter_importance_graph,
-    generate_compression_parameter_importance_graph
-)
+from graphs.graph_build import build_aggregate_graphs
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate the aggregate graphs whose input series changed since they were last generated")
+    parser.add_argument("--force", action="store_true", help="Generate every aggregate graph, even the up-to-date ones")
+    args = parser.parse_args()
+
     with scoped_session() as session:
         print("Generating aggregate graphs...")
+        generated, up_to_date, _ = build_aggregate_graphs(session, force=args.force)
 
-        print("  - Load capacity ratio (y)...")
-        generate_load_capacity_ratio_graph(session, force_direction='y')
-
-        print("  - Material thickness vs. weight...")
-        generate_strand_thickness_weight_graph(session)
-
-        print("  - Material thickness vs. force...")
-        generate_strand_thickness_force_graph(session)
-
-        print("  - Material thickness vs. efficiency...")
-        generate_strand_thickness_efficiency_graph(session)
-
-        print("  - Thickness height reduction vs. force...")
-        generate_thickness_height_reduction_vs_force_graph(session)
-
-        print("  - Maximum survivable force vs. thickness...")
-        generate_strand_thickness_max_survivable_force_graph(session)
-
-        print("  - Layer count vs. height...")
-        generate_layer_count_height_graph(session)
-
-        print("  - Layer count vs. force...")
-        generate_layer_count_force_graph(session)
-
-        print("  - Layer count vs. efficiency...")
-        generate_layer_count_efficiency_graph(session)
-
-        print("  - Layer height reduction vs. force...")
-        generate_layer_height_reduction_vs_force_graph(session)
-
-        print("  - Strand count vs. weight...")
-        generate_strand_count_weight_graph(session)
-
-        print("  - Strand count vs. force...")
-        generate_strand_count_force_graph(session)
-
-        print("  - Strand count vs. efficiency...")
-        generate_strand_count_efficiency_graph(session)
-
-        print("  - Strand height reduction vs. force...")
-        generate_strand_height_reduction_vs_force_graph(session)
-
-        print("  - Strand stiffness vs. compression...")
-        generate_strand_stiffness_vs_compression_graph(session)
-
-        print("  - Strand force vs. displacement...")
-        generate_strand_force_vs_displacement_graph(session)
-
-        print("  - Recovery by layers...")
-        generate_recovery_by_layers_graph(session)
-
-        print("  - Recovery by strands...")
-        generate_recovery_by_strands_graph(session)
-
-        print("  - Recovery heatmap (strands × layers)...")
-        generate_recovery_heatmap_strands_layers(session)
-
-        print("  - Recovery parameter importance...")
-        generate_recovery_parameter_importance_graph(session)
-
-        print("  - Equilibrium time...")
-        generate_equilibrium_time_graph(session)
-        generate_equilibrium_time_by_strands_graph(session)
-
-        print("  - Compression validation...")
-        generate_compression_validation_graph(session)
-
-        print("  - Stiffness comparison...")
-        generate_stiffness_comparison_graph(session)
-
-        print("  - Recovery consistency...")
-        generate_recovery_consistency_graph(session)
-
-        print("  - Load-bearing parameter importance...")
-        generate_load_bearing_parameter_importance_graph(session)
-
-        print("  - Compression parameter importance...")
-        generate_compression_parameter_importance_graph(session)
-
-        print("\nAll aggregate graphs generated successfully!")
+        print(f"\n{len(generated)} aggregate graphs generated, {len(up_to_date)} up to date")
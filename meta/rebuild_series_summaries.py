@@ -0,0 +1,9 @@
+from database.queries.series_summary_queries import refresh_series_summaries
+from database.session import scoped_session
+
+# Recompute the series_summary table from the experiments, e.g. after the migration that adds it
+# or after a change to how the summary metrics are computed
+if __name__ == '__main__':
+    with scoped_session() as session:
+        refresh_series_summaries(session)
+    print("Series summaries rebuilt")
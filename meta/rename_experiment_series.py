@@ -1,7 +1,7 @@
 from pathlib import Path
 from database.session import SessionLocal
-from database.models.experiment_series_model import ExperimentSeries
-from database.models.experiment_model import Experiment
+from database.queries.experiment_series_queries import select_experiment_series_by_name, is_experiment_series_name_unique, \
+    rename_experiment_series as rename_experiment_series_by_name
 from sqlalchemy.exc import SQLAlchemyError
 
 
@@ -50,7 +50,7 @@ def rename_experiment_series_graphs(old_name, new_name):
     old_safe_name = old_name.replace('/', '_').replace(' ', '_')
     new_safe_name = new_name.replace('/', '_').replace(' ', '_')
 
-    graph_types = ['force', 'height', 'elastic_recovery']
+    graph_types = ['force', 'height', 'elastic_recovery', 'hysteresis']
     renamed_count = 0
 
     for graph_type in graph_types:
@@ -61,6 +61,10 @@ def rename_experiment_series_graphs(old_name, new_name):
             old_file.rename(new_file)
             print(f"Renamed graph: {old_file.name} -> {new_file.name}")
             renamed_count += 1
+            # gzip copy served by experiments_server
+            old_compressed = old_file.with_name(old_file.name + ".gz")
+            if old_compressed.exists():
+                old_compressed.rename(new_file.with_name(new_file.name + ".gz"))
         else:
             print(f"- Graph not found (skipping): {old_file.name}")
 
@@ -72,7 +76,7 @@ def rename_experiment_series_graphs(old_name, new_name):
 
 def rename_experiment_series(session, old_name, new_name):
     """
-    Rename an experiment series and all its associated experiments.
+    Rename an experiment series, its experiments reference it by id and follow.
 
     Args:
         session: Database session
@@ -83,53 +87,16 @@ def rename_experiment_series(session, old_name, new_name):
         True if successful, False otherwise
     """
     try:
-        # Check if old series exists
-        old_series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=old_name
-        ).first()
-
-        if not old_series:
+        if select_experiment_series_by_name(session, old_name) is None:
             print(f"Experiment series '{old_name}' not found")
             return False
 
-        # Check if new name already exists
-        existing_series = session.query(ExperimentSeries).filter_by(
-            experiment_series_name=new_name
-        ).first()
-
-        if existing_series:
+        if not is_experiment_series_name_unique(session, new_name):
             print(f"Experiment series '{new_name}' already exists")
             return False
 
         print(f"\nRenaming: '{old_name}' → '{new_name}'")
-
-        # Get all attributes from old series
-        old_attrs = {key: value for key, value in old_series.__dict__.items()
-                     if key != "_sa_instance_state" and key != "experiment_series_name"}
-
-        # Step 1: Create new series with new name (this must exist before we update experiments due to foreign key)
-        new_series = ExperimentSeries(experiment_series_name=new_name, **old_attrs)
-        session.add(new_series)
-        session.flush()  # Flush to make new series available for foreign key references
-        print(f"  ✓ Created new series '{new_name}'")
-
-        # Step 2: Update all experiments to reference the new series
-        experiments = session.query(Experiment).filter_by(
-            experiment_series_name=old_name
-        ).all()
-
-        print(f"  Updating {len(experiments)} experiment(s)...")
-        for experiment in experiments:
-            experiment.experiment_series_name = new_name
-        session.flush()
-        print(f"  ✓ Updated {len(experiments)} experiment(s)")
-
-        # Step 3: Delete old series (safe now since no experiments reference it)
-        session.delete(old_series)
-        print(f"  ✓ Deleted old series '{old_name}'")
-
-        # Commit all changes
-        session.commit()
+        rename_experiment_series_by_name(session, old_name, new_name)
         print(f"  ✓ Database update complete")
 
         # Rename graph files
@@ -2,9 +2,10 @@ if __name__ == "__main__":
     from database.queries.experiment_series_queries import select_all_experiment_series, update_experiment_series
     from database.queries.experiments_queries import delete_experiments_by_series_name
     from database.session import SessionLocal
-    from experiments import run_experiments
+    from experiments import run_preflight_probe
+    from experiments.scheduler import run_experiment_campaign
     from graphs.generate_after_experiments import generate_graphs_after_experiments
-    from graphs.aggregate_graphs import generate_aggregate_graphs_for_group
+    from graphs.graph_build import build_aggregate_graphs
 
 
     ###############################################
@@ -16,6 +17,14 @@ if __name__ == "__main__":
         "conical_structures"
     ]
 
+    # True: keep the experiments already stored for the same config and only run the missing or stale ones
+    # False: delete all experiments of a series and simulate them again, bypassing the simulation cache
+    RESUME = True
+
+    # True: a series whose highest force explodes in the pre-flight probe runs on the largest stable part of the force range
+    # False: the series is refused, naming the force that exploded
+    NARROW_FORCE_RANGE = False
+
 
     ###############################################
 
@@ -24,6 +33,9 @@ if __name__ == "__main__":
 
     all_experiment_series = select_all_experiment_series(session)
 
+    series_to_run = []
+    preflight_reports = {}
+
     for experiment_series in all_experiment_series:
         if experiment_series.experiment_series_name in experiment_series_not_to_run:
             print("Skipping experiment series:", experiment_series.experiment_series_name)
@@ -32,17 +44,25 @@ if __name__ == "__main__":
         experiment_series_name = experiment_series.experiment_series_name
         print(experiment_series_name)
 
-        delete_experiments_by_series_name(session, experiment_series_name)
+        preflight_report = run_preflight_probe(experiment_series, narrow_force_range=NARROW_FORCE_RANGE)
+        print(preflight_report.summary())
+        if not preflight_report.is_runnable:
+            print("Skipping experiment series refused by the pre-flight probe:", experiment_series_name)
+            continue
+
+        if not RESUME:
+            delete_experiments_by_series_name(session, experiment_series_name)
         update_experiment_series(session, experiment_series_name, { "is_experiments_outdated": False })
-        run_experiments(experiment_series)
-        print("Running experiments for series:", experiment_series_name)
 
-        # Generate series-specific graphs
-        print(f"\nGenerating graphs for {experiment_series_name}...")
-        generate_graphs_after_experiments(experiment_series)
+        series_to_run.append(experiment_series)
+        preflight_reports[experiment_series_name] = preflight_report
+
+    # All experiments of all series share one longest-job-first queue,
+    # the graphs of a series are generated as soon as its last experiment finishes
+    print(f"Running experiments for {len(series_to_run)} series")
+    run_experiment_campaign(series_to_run, preflight_reports, on_series_complete=[generate_graphs_after_experiments], resume=RESUME, use_cache=RESUME)
 
-        # Generate aggregate graphs for this group
-        if experiment_series.group_name:
-            generate_aggregate_graphs_for_group(session, experiment_series.group_name)
+    # Generate the aggregate graphs once all series have run, only the ones reading a series that changed
+    build_aggregate_graphs(session)
 
-        print(f"Completed {experiment_series_name}\n")
+    print(f"Completed {len(series_to_run)} series\n")
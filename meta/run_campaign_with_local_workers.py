@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+
+from database.session import get_session, close_global_session
+from database.models import ExperimentSeries
+from database.queries.experiment_series_queries import update_experiment_series
+from database.queries.experiments_queries import delete_experiments_by_series_name
+from experiments.preflight import run_preflight_probe
+from experiments.job_queue import enqueue_campaign, wait_for_campaign, RESULT_BUNDLES_DIR
+from graphs import generate_graphs_after_experiments
+
+###############################################
+# Config
+
+EXPERIMENT_SERIES_NAMES = [
+    "test_run_specific_script",
+]
+
+NUM_WORKERS = os.cpu_count()
+
+# True: workers drop result bundles in RESULT_BUNDLES_DIR which are ingested here
+# False: workers insert their results straight into the database
+USE_RESULT_BUNDLES = False
+
+# True: only enqueue the experiments that are missing or stale (their config fingerprint changed)
+# False: delete all experiments of a series and simulate them again, bypassing the simulation cache
+RESUME = True
+
+# True: a series whose highest force explodes in the pre-flight probe runs on the largest stable part of the force range
+# False: the series is refused, naming the force that exploded
+NARROW_FORCE_RANGE = False
+
+###############################################
+
+
+def start_workers(campaign_id, num_workers, results_dir):
+    command = [sys.executable, "-m", "experiments.job_worker", "--campaign", campaign_id]
+    if results_dir is not None:
+        command += ["--results-dir", results_dir]
+    return [
+        subprocess.Popen(command + ["--worker-id", f"local-{i + 1}"])
+        for i in range(num_workers)
+    ]
+
+
+def main():
+    session = get_session()
+
+    series_list = session.query(ExperimentSeries).filter(
+        ExperimentSeries.experiment_series_name.in_(EXPERIMENT_SERIES_NAMES)
+    ).all()
+
+    if not series_list:
+        print("ERROR: No valid experiment series found!")
+        close_global_session()
+        sys.exit(1)
+
+    preflight_reports = {}
+    for series in series_list:
+        preflight_report = run_preflight_probe(series, narrow_force_range=NARROW_FORCE_RANGE)
+        print(preflight_report.summary())
+        if not preflight_report.is_runnable:
+            print(f"Skipping {series.experiment_series_name}, refused by the pre-flight probe")
+            continue
+
+        if not RESUME:
+            delete_experiments_by_series_name(session, series.experiment_series_name)
+        update_experiment_series(session, series.experiment_series_name, { "is_experiments_outdated": False })
+        preflight_reports[series.experiment_series_name] = preflight_report
+
+    series_to_run = [series for series in series_list if series.experiment_series_name in preflight_reports]
+    campaign_id = enqueue_campaign(series_to_run, preflight_reports, resume=RESUME, use_cache=RESUME)
+
+    # The same worker command can be started on other hosts to join the campaign
+    results_dir = RESULT_BUNDLES_DIR if USE_RESULT_BUNDLES else None
+    workers = start_workers(campaign_id, NUM_WORKERS, results_dir)
+    try:
+        wait_for_campaign(
+            campaign_id,
+            series_to_run,
+            results_dir=results_dir,
+            on_series_complete=[generate_graphs_after_experiments],
+            is_alive=lambda: any(worker.poll() is None for worker in workers)
+        )
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+
+    close_global_session()
+    print(f"\n✅ Campaign {campaign_id} completed!")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -1,15 +1,18 @@
 import sys
-import time
 
 from database.session import get_session, close_global_session
 from database.models import ExperimentSeries
-from experiments.run_experiments import run_experiments
+from experiments.preflight import run_preflight_probe
+from experiments.scheduler import run_experiment_campaign
+from graphs import generate_graphs_after_experiments
 
 EXPERIMENT_SERIES_NAMES = [
     "test_run_specific_script",
 ]
 
-SLEEP_BETWEEN_SERIES_SECONDS = 90
+# True: a series whose highest force explodes in the pre-flight probe runs on the largest stable part of the force range
+# False: the series is refused, naming the force that exploded
+NARROW_FORCE_RANGE = False
 
 def main():
     if not EXPERIMENT_SERIES_NAMES:
@@ -44,19 +47,27 @@ def main():
         print(f"  - {s.experiment_series_name}")
     print()
 
-    # Run each series
+    # Probe each series, then run all of them on one shared longest-job-first queue
+    preflight_reports = {}
     for i, series in enumerate(series_list, 1):
         print(f"\n{'='*60}")
-        print(f"Running series {i}/{len(series_list)}: {series.experiment_series_name}")
+        print(f"Pre-flight probe {i}/{len(series_list)}: {series.experiment_series_name}")
         print(f"{'='*60}\n")
 
-        run_experiments(series)
+        preflight_report = run_preflight_probe(series, narrow_force_range=NARROW_FORCE_RANGE)
+        print(preflight_report.summary())
+        if not preflight_report.is_runnable:
+            print(f"Skipping {series.experiment_series_name}, refused by the pre-flight probe")
+            continue
 
-        print(f"\n⏸️  Sleeping for {SLEEP_BETWEEN_SERIES_SECONDS} seconds before next series...\n")
-        time.sleep(SLEEP_BETWEEN_SERIES_SECONDS)
+        preflight_reports[series.experiment_series_name] = preflight_report
+
+    series_to_run = [series for series in series_list if series.experiment_series_name in preflight_reports]
+    # Only the missing and stale experiments run, so an interrupted run continues where it stopped
+    run_experiment_campaign(series_to_run, preflight_reports, on_series_complete=[generate_graphs_after_experiments], resume=True)
 
     close_global_session()
-    print(f"\n✅ All {len(series_list)} series completed!")
+    print(f"\n✅ All {len(series_to_run)} series completed!")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,15 @@
+from database.queries.simulation_cache_queries import select_simulation_cache_statistics, evict_simulation_cache, delete_simulation_cache
+from database.session import scoped_session
+
+# Empty the cache, e.g. after a change to the simulation that is not reflected in SIMULATION_CODE_VERSION
+CLEAR = False
+
+if __name__ == '__main__':
+    with scoped_session() as session:
+        if CLEAR:
+            delete_simulation_cache(session)
+            print("Simulation cache cleared")
+        else:
+            evicted = evict_simulation_cache(session)
+            statistics = select_simulation_cache_statistics(session)
+            print(f"Simulation cache: {statistics['entries']}/{statistics['max_entries']} entries, {statistics['total_hits']} hits, {evicted} evicted")
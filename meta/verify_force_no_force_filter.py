@@ -0,0 +1,149 @@
+"""
+Checks the vectorized force_no_force filter against its sequential definition on random series.
+
+    python -m meta.verify_force_no_force_filter
+
+Each case is a random series (missing data, explosions, non-monotonic heights, recovery jumps,
+values right at the 1%, 70% and 10% thresholds). The selection of filter_force_no_force_experiments
+and of the batched filter_force_no_force_experiments_by_series must be the one of the loop below.
+"""
+import random
+import sys
+from types import SimpleNamespace
+
+from database.queries.graph_queries import filter_force_no_force_experiments, filter_force_no_force_experiments_by_series
+
+NUM_CASES = 20000
+SEED = 0
+
+
+def sequential_filter(experiments, initial_height):
+    """The filter as it was written before it was vectorized"""
+    if not experiments or not initial_height:
+        return []
+
+    sorted_experiments = sorted(experiments, key=lambda e: e.experiment_id)
+
+    valid_experiments = []
+    min_height_under_load = float('inf')
+    prev_recovery = None
+
+    for exp in sorted_experiments:
+        if (exp.time_to_bounding_box_explosion is not None or
+            exp.time_to_beam_strain_exceed_explosion is not None or
+            exp.time_to_node_velocity_spike_explosion is not None):
+            continue
+
+        if exp.height_under_load is None or exp.final_height is None:
+            continue
+
+        if exp.height_under_load > min_height_under_load * 1.01:
+            break
+
+        denominator = initial_height - exp.height_under_load
+        if denominator > 0:
+            recovery = (exp.final_height - exp.height_under_load) / denominator
+            if prev_recovery is not None and prev_recovery > 0.7:
+                if recovery > prev_recovery * 1.10:
+                    break
+            prev_recovery = recovery
+
+        height_loss = exp.final_height - initial_height
+        if height_loss > 0:
+            break
+
+        min_height_under_load = min(min_height_under_load, exp.height_under_load)
+        valid_experiments.append(exp)
+
+    return valid_experiments
+
+
+def _random_height(rng, initial_height, previous_height):
+    choice = rng.random()
+    if choice < 0.05:
+        return None
+    if choice < 0.1 and previous_height is not None:
+        return previous_height * 1.01  # right at the compression tolerance
+    if choice < 0.15:
+        return initial_height  # no compression, zero denominator
+    if choice < 0.2:
+        return initial_height * rng.uniform(1.0, 1.05)  # taller than the model
+    if previous_height is not None and choice < 0.85:
+        return previous_height * rng.uniform(0.95, 1.02)
+    return initial_height * rng.uniform(0.5, 1.0)
+
+
+def _random_final_height(rng, initial_height, height_under_load, previous_recovery):
+    choice = rng.random()
+    if choice < 0.05 or height_under_load is None:
+        return None if choice < 0.05 else initial_height * rng.uniform(0.9, 1.0)
+    if choice < 0.1:
+        return initial_height * rng.uniform(1.0, 1.02)  # gained height
+    denominator = initial_height - height_under_load
+    if choice < 0.2 and previous_recovery is not None:
+        return height_under_load + previous_recovery * 1.10 * denominator  # right at the recovery jump
+    if choice < 0.3:
+        return height_under_load + 0.7 * denominator  # right at the plateau
+    return height_under_load + rng.uniform(0.0, 1.05) * denominator
+
+
+def random_series(rng, experiment_series_id):
+    initial_height = rng.choice([None, 0.0, 0.1, 0.12, rng.uniform(0.05, 0.2)])
+    experiments = []
+    previous_height = None
+    previous_recovery = None
+    for experiment_id in rng.sample(range(1, 60), rng.randint(0, 25)):
+        reference_height = initial_height or 0.1
+        height_under_load = _random_height(rng, reference_height, previous_height)
+        final_height = _random_final_height(rng, reference_height, height_under_load, previous_recovery)
+        if height_under_load is not None and final_height is not None and reference_height > height_under_load:
+            previous_recovery = (final_height - height_under_load) / (reference_height - height_under_load)
+        previous_height = height_under_load if height_under_load is not None else previous_height
+
+        exploded = [None, None, None]
+        if rng.random() < 0.1:
+            exploded[rng.randrange(3)] = rng.uniform(0.1, 2.0)
+
+        experiments.append(SimpleNamespace(
+            experiment_series_id=experiment_series_id,
+            experiment_id=experiment_id,
+            height_under_load=height_under_load,
+            final_height=final_height,
+            time_to_bounding_box_explosion=exploded[0],
+            time_to_beam_strain_exceed_explosion=exploded[1],
+            time_to_node_velocity_spike_explosion=exploded[2]
+        ))
+    return initial_height, experiments
+
+
+def _ids(experiments):
+    return [exp.experiment_id for exp in experiments]
+
+
+if __name__ == '__main__':
+    rng = random.Random(SEED)
+    cases = [random_series(rng, experiment_series_id) for experiment_series_id in range(NUM_CASES)]
+
+    mismatches = 0
+    kept = 0
+    for initial_height, experiments in cases:
+        expected = _ids(sequential_filter(experiments, initial_height))
+        kept += len(expected)
+        if _ids(filter_force_no_force_experiments(experiments, initial_height)) != expected:
+            mismatches += 1
+
+    all_experiments = sorted(
+        (exp for _, experiments in cases for exp in experiments),
+        key=lambda exp: (exp.experiment_series_id, exp.experiment_id)
+    )
+    batched = filter_force_no_force_experiments_by_series(
+        all_experiments, {experiment_series_id: initial_height for experiment_series_id, (initial_height, _) in enumerate(cases)}
+    )
+    batched_mismatches = sum(
+        _ids(batched[experiment_series_id]) != _ids(sequential_filter(experiments, initial_height))
+        for experiment_series_id, (initial_height, experiments) in enumerate(cases)
+    )
+
+    print(f"{NUM_CASES} series, {len(all_experiments)} experiments, {kept} kept by the sequential filter")
+    print(f"Per series: {mismatches} mismatches, batched: {batched_mismatches} mismatches")
+    sys.exit(1 if mismatches or batched_mismatches else 0)
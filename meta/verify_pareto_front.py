@@ -0,0 +1,113 @@
+"""
+Checks the incremental Pareto front against a pairwise non-dominated sorting of the same designs.
+
+    python -m meta.verify_pareto_front
+
+Designs are added, changed and removed in random batches (with ties, missing objectives and
+minimized objectives); after each batch the ranks of ParetoFront must be the ones recomputed
+from scratch with the loop below. The recovery objective of the recommendations must rank a
+design by its distance from a full recovery, whichever way its height changed.
+"""
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+from database.queries.pareto_queries import PARETO_OBJECTIVES, _design
+from util.pareto import ParetoFront
+
+OBJECTIVES = (("a", True), ("b", True), ("c", False), ("d", True))
+NUM_BATCHES = 200
+SEED = 0
+
+
+# avg_height_loss (m) of designs that only differ in their recovery, and their expected ranks
+RECOVERY_HEIGHT_LOSSES = {"full": 0.0, "shorter": -0.01, "taller": 0.01, "much_shorter": -0.02, "much_taller": 0.02}
+RECOVERY_RANKS = {"full": 0, "shorter": 1, "taller": 1, "much_shorter": 2, "much_taller": 2}
+
+
+def dominates(first, second, objectives=OBJECTIVES):
+    better = False
+    for name, maximize in objectives:
+        first_value = first.get(name)
+        second_value = second.get(name)
+        if first_value is None:
+            if second_value is not None:
+                return False
+            continue
+        if second_value is None:
+            better = True
+            continue
+        if not maximize:
+            first_value, second_value = -first_value, -second_value
+        if first_value < second_value:
+            return False
+        better = better or first_value > second_value
+    return better
+
+
+def reference_ranks(designs, objectives=OBJECTIVES):
+    """Peels the non-dominated designs off one front at a time"""
+    ranks = {}
+    remaining = dict(designs)
+    rank = 0
+    while remaining:
+        front = [key for key, design in remaining.items()
+                 if not any(dominates(other, design, objectives) for other in remaining.values())]
+        for key in front:
+            ranks[key] = rank
+            del remaining[key]
+        rank += 1
+    return ranks
+
+
+def random_design(rng):
+    return {name: None if rng.random() < 0.1 else float(rng.randint(0, 8)) for name, _ in OBJECTIVES}
+
+
+def recovery_mismatches():
+    """Names of the recovery designs whose rank on the front of PARETO_OBJECTIVES is not the expected one"""
+    series = SimpleNamespace(num_strands=6, num_layers=2, strand_radius=0.001, weight_kg=0.1)
+    designs = {
+        name: _design(series, SimpleNamespace(target_force_in_y_direction=5.0, max_compression_pct=20.0, avg_height_loss=height_loss))
+        for name, height_loss in RECOVERY_HEIGHT_LOSSES.items()
+    }
+    front = ParetoFront(PARETO_OBJECTIVES)
+    front.update(designs)
+    expected = reference_ranks(designs, PARETO_OBJECTIVES)
+    return [name for name, rank in RECOVERY_RANKS.items() if front.rank(name) != rank or expected[name] != rank]
+
+
+if __name__ == '__main__':
+    rng = random.Random(SEED)
+    front = ParetoFront(OBJECTIVES)
+    designs = {}
+    next_key = 0
+    mismatches = 0
+    start = time.perf_counter()
+    for _ in range(NUM_BATCHES):
+        removed = rng.sample(sorted(designs), min(len(designs), rng.randint(0, 3)))
+        for key in removed:
+            del designs[key]
+        front.remove(removed)
+
+        batch = {}
+        for key in rng.sample(sorted(designs), min(len(designs), rng.randint(0, 3))):
+            batch[key] = random_design(rng)
+        for _ in range(rng.randint(0, 6)):
+            batch[next_key] = random_design(rng)
+            next_key += 1
+        designs.update(batch)
+        front.update(batch)
+
+        expected = reference_ranks(designs)
+        if sorted(front.keys) != sorted(designs) or any(front.rank(key) != rank for key, rank in expected.items()):
+            mismatches += 1
+
+    print(f"{NUM_BATCHES} batches, {len(designs)} designs at the end, {front.ranks.max() + 1 if len(front) else 0} fronts, "
+          f"{time.perf_counter() - start:.2f} s")
+    print(f"{mismatches} mismatches")
+
+    recovery = recovery_mismatches()
+    print(f"{len(recovery)} recovery objective mismatches" + (f": {', '.join(recovery)}" if recovery else ""))
+    sys.exit(1 if mismatches or recovery else 0)
@@ -1 +1 @@
-from os_specifics.os_specifics import setup_solver
\ No newline at end of file
+from os_specifics.os_specifics import setup_solver, get_solver_name
\ No newline at end of file
@@ -6,6 +6,11 @@ def is_Mac():
     return sys.platform == 'darwin'
 
 
+def get_solver_name():
+    """Name of the linear solver setup_solver uses on this machine, part of the experiment fingerprint"""
+    return "ChSolverSparseLU" if is_Mac() else "ChSolverPardisoMKL"
+
+
 def setup_solver(system):
     """
     The MKL Paradiso solver is more precise for finite element analysis (FEA)
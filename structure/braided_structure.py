@@ -1,11 +1,12 @@
 import pychrono as chrono
 import pychrono.fea as fea
 import math
+from config.experiment_config import FULL_BEAM_SEGMENTS
 
-def create_braid_structure(braid_mesh, braid_material, tape_material, experiment_series):
+def create_braid_structure(braid_mesh, braid_material, tape_material, experiment_series, num_beam_segments=FULL_BEAM_SEGMENTS):
 	nodes = generate_nodes(braid_mesh, experiment_series)
 	node_pairs = define_connectivity(nodes, experiment_series)
-	beams, joints = create_beam_elements(braid_mesh, node_pairs, braid_material, tape_material)
+	beams, joints = create_beam_elements(braid_mesh, node_pairs, braid_material, tape_material, num_beam_segments)
 	node_positions = [node.GetPos() for layer in nodes for node in layer]
 	return nodes, node_positions, beams
 
@@ -63,7 +64,7 @@ def define_connectivity(nodes, config):
 	return node_pairs
 
 
-def create_beam_elements(braid_mesh, node_pairs, braid_material, tape_material):
+def create_beam_elements(braid_mesh, node_pairs, braid_material, tape_material, num_beam_segments=FULL_BEAM_SEGMENTS):
 	for pair in node_pairs:
 		assert isinstance(pair, tuple), f"Not a tuple: {pair}"
 		assert len(pair) in (2, 3), f"Unexpected pair length: {pair}"
@@ -71,8 +72,6 @@ def create_beam_elements(braid_mesh, node_pairs, braid_material, tape_material):
 	beams = []
 	joints = []
 
-	num_beam_segments = 10
-
 	for pair_type, *nodes in node_pairs:
 		if pair_type == 'beam':
 			node_a, node_b = nodes[0]
@@ -1,3 +1,5 @@
 from util.structural_integrity import calculate_has_exploded, compute_bounding_box, reset_structural_integrity_state
 from util.weight_and_height import calculate_model_weight, calculate_model_height
-from util.images_and_recording import delete_experiment_series_folder, take_model_screenshot, take_final_screenshot, take_video_screenshot, make_video_from_frames
+from util.images_and_recording import delete_experiment_series_folder, take_model_screenshot, take_final_screenshot, copy_final_screenshot, take_video_screenshot, make_video_from_frames
+from util.hysteresis import CyclicLoadTracker, CycleResult
+from util.design_space_index import DesignSpaceIndex, DESIGN_PARAMETERS
@@ -0,0 +1,77 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Geometry parameters that define a design, in the order of the index coordinates
+DESIGN_PARAMETERS = ("num_strands", "num_layers", "strand_radius", "radius", "pitch", "radius_taper")
+# Relative importance of each parameter in the distance, the strand count matters most
+DESIGN_PARAMETER_WEIGHTS = {"num_strands": 2.0, "num_layers": 1.5, "strand_radius": 1.0, "radius": 1.0, "pitch": 1.0, "radius_taper": 0.5}
+
+
+def _parameter(design, parameter):
+	value = design.get(parameter) if isinstance(design, dict) else getattr(design, parameter, None)
+	return np.nan if value is None else float(value)
+
+
+class DesignSpaceIndex:
+	"""
+	Nearest-neighbour index (k-d tree) over designs in the normalized design space.
+
+	Every parameter is scaled to [0, 1] over the indexed designs and multiplied by its weight, so
+	the distance does not depend on the units (a strand against metres of radius). A parameter
+	that all indexed designs share is scaled by its magnitude instead. Designs are series or
+	dicts with the DESIGN_PARAMETERS as attributes or keys, a missing parameter counts as the
+	middle of its range.
+	"""
+
+	def __init__(self, keys, designs, parameters=DESIGN_PARAMETERS, weights=None):
+		weights = weights or DESIGN_PARAMETER_WEIGHTS
+		self.keys = list(keys)
+		self.parameters = tuple(parameters)
+		self.weights = np.array([weights.get(parameter, 1.0) for parameter in self.parameters])
+
+		points = np.array([[_parameter(design, parameter) for parameter in self.parameters] for design in designs], dtype=float)
+		points = points.reshape(len(self.keys), len(self.parameters))
+		# A parameter without any value (or without designs) gets the range [0, 1], one with a
+		# single value is relative to that value, so it stays unitless
+		known = ~np.isnan(points)
+		self.minimums = np.nan_to_num(np.min(points, axis=0, initial=np.inf, where=known), posinf=0.0)
+		maximums = np.nan_to_num(np.max(points, axis=0, initial=-np.inf, where=known), neginf=1.0)
+		magnitudes = np.where(np.abs(self.minimums) > 0, np.abs(self.minimums), 1.0)
+		self.ranges = np.where(maximums > self.minimums, maximums - self.minimums, magnitudes)
+		self._tree = cKDTree(self._normalize(points)) if len(points) else None
+
+	@classmethod
+	def from_series(cls, experiment_series_list, **kwargs):
+		"""Index of series keyed by experiment_series_name"""
+		experiment_series_list = list(experiment_series_list)
+		return cls([series.experiment_series_name for series in experiment_series_list], experiment_series_list, **kwargs)
+
+	def __len__(self):
+		return len(self.keys)
+
+	def _normalize(self, points):
+		normalized = (np.atleast_2d(points) - self.minimums) / self.ranges
+		normalized = np.where(np.isnan(normalized), 0.5, normalized)
+		return normalized * self.weights
+
+	def _point(self, design):
+		return self._normalize([_parameter(design, parameter) for parameter in self.parameters])[0]
+
+	def nearest(self, design, k=1):
+		"""The k nearest designs as (key, distance) pairs, closest first"""
+		if self._tree is None:
+			return []
+		k = min(k, len(self.keys))
+		distances, indices = self._tree.query(self._point(design), k=k)
+		distances, indices = np.atleast_1d(distances), np.atleast_1d(indices)
+		return [(self.keys[index], float(distance)) for distance, index in zip(distances, indices)]
+
+	def within(self, design, distance):
+		"""Designs within `distance` as (key, distance) pairs, closest first"""
+		if self._tree is None:
+			return []
+		point = self._point(design)
+		# In index order, so designs at the same distance keep the order they were indexed in
+		indices = sorted(self._tree.query_ball_point(point, distance))
+		matches = [(self.keys[index], float(np.linalg.norm(self._tree.data[index] - point))) for index in indices]
+		return sorted(matches, key=lambda match: match[1])
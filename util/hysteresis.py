@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from util.weight_and_height import calculate_model_height
+
+# The node positions and the model height are sampled this often per load cycle, and at every
+# turning point of the load schedule, instead of on every timestep
+SAMPLES_PER_CYCLE = 100
+
+
+@dataclass
+class CycleResult:
+	cycle_index: int
+	amplitude: float
+	peak_force: float
+	min_height: float
+	peak_compression: float
+	residual_height: Optional[float] = None
+	dissipated_energy: float = 0.0
+
+
+class CyclicLoadTracker:
+	"""
+	Measures every load/unload cycle of a cyclic load profile during a single simulation.
+
+	Per cycle it records the peak compression (relative to the height at the start of the
+	experiment), the residual height at the end of the cycle and the dissipated energy,
+	which is the area of the force/displacement hysteresis loop. The energy is the net work
+	done by the nodal loads: sum over nodes and samples of (scale(t) * F_node) · Δx_node.
+
+	The structure is sampled SAMPLES_PER_CYCLE times per cycle and at the turning points of the
+	load (the breakpoints of the schedule), where the peak compression and residual height are.
+	"""
+
+	def __init__(self, load_profile, loaded_nodes, base_forces, beam_elements):
+		self.load_profile = load_profile
+		self.loaded_nodes = loaded_nodes
+		self.base_forces = np.array([(force.x, force.y, force.z) for force in base_forces], dtype=float).reshape(-1, 3)
+		self.beam_elements = beam_elements
+
+		self.reference_height = calculate_model_height(beam_elements)
+		self.total_vertical_force = abs(self.base_forces[:, 1].sum())
+		self.cycles: List[CycleResult] = []
+
+		self._sample_times = self._create_sample_times()
+		self._next_sample = 0
+		self._previous_positions = self._node_positions()
+		self._previous_time = 0.0
+		self._current_cycle = None
+
+	def update(self, time_passed):
+		cycle_index = self.load_profile.cycle_index_at(time_passed)
+		sample_due = self._advance_samples(time_passed)
+		# A cycle boundary is always sampled, its residual height belongs to the finished cycle
+		if not sample_due and cycle_index == self._current_cycle:
+			return
+
+		positions = self._node_positions()
+
+		if cycle_index != self._current_cycle:
+			self._finish_current_cycle()
+			if cycle_index is not None:
+				self._start_cycle(cycle_index)
+
+		if self._current_cycle is not None:
+			cycle = self.cycles[-1]
+			# Every breakpoint is a sample time, so the scale is linear between two samples
+			scale = self.load_profile.scale_at((time_passed + self._previous_time) / 2)
+
+			cycle.dissipated_energy += scale * float(np.sum(self.base_forces * (positions - self._previous_positions)))
+
+			height = calculate_model_height(self.beam_elements)
+			if height < cycle.min_height:
+				cycle.min_height = height
+				cycle.peak_compression = self.reference_height - height
+
+		self._previous_positions = positions
+		self._previous_time = time_passed
+
+	def finish(self):
+		self._finish_current_cycle()
+		return self.cycles
+
+	def last_cycle_min_height(self):
+		return self.cycles[-1].min_height if self.cycles else None
+
+	def _start_cycle(self, cycle_index):
+		amplitude = self.load_profile.cycle_amplitude(cycle_index)
+		height = calculate_model_height(self.beam_elements)
+		self.cycles.append(CycleResult(
+			cycle_index=cycle_index,
+			amplitude=amplitude,
+			peak_force=amplitude * self.total_vertical_force,
+			min_height=height,
+			peak_compression=self.reference_height - height,
+		))
+		self._current_cycle = cycle_index
+
+	def _finish_current_cycle(self):
+		if self._current_cycle is None:
+			return
+		self.cycles[-1].residual_height = calculate_model_height(self.beam_elements)
+		self._current_cycle = None
+
+	def _create_sample_times(self):
+		"""Sorted sample times: SAMPLES_PER_CYCLE per cycle and the breakpoints of the schedule"""
+		sample_times = {time_seconds for time_seconds, _ in self.load_profile.breakpoints()}
+		for cycle_index in range(self.load_profile.num_cycles):
+			cycle_start, cycle_end = self.load_profile.cycle_bounds(cycle_index)
+			sample_times.update(np.linspace(cycle_start, cycle_end, SAMPLES_PER_CYCLE, endpoint=False).tolist())
+		return sorted(sample_times)
+
+	def _advance_samples(self, time_passed):
+		"""Whether a sample time was reached since the last call"""
+		sample_due = False
+		while self._next_sample < len(self._sample_times) and self._sample_times[self._next_sample] <= time_passed:
+			self._next_sample += 1
+			sample_due = True
+		return sample_due
+
+	def _node_positions(self):
+		positions = [node.GetPos() for node in self.loaded_nodes]
+		return np.array([(position.x, position.y, position.z) for position in positions], dtype=float).reshape(-1, 3)
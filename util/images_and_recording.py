@@ -35,6 +35,14 @@ def take_final_screenshot(visualization, experiment_series_name, experiment_id):
 	file_path = _get_image_path(experiment_series_name, filename)
 	visualization.WriteImageToFile(file_path)
 
+def copy_final_screenshot(source_experiment_series_name, source_experiment_id, experiment_series_name, experiment_id):
+	"""Reuse the final screenshot of another experiment with the same result (see the simulation cache)"""
+	source_path = _get_image_path(source_experiment_series_name, f"{source_experiment_series_name}_{source_experiment_id}.jpg")
+	path = _get_image_path(experiment_series_name, f"{experiment_series_name}_{experiment_id}.jpg")
+	# The cached result can be the experiment's own earlier run
+	if os.path.exists(source_path) and os.path.abspath(source_path) != os.path.abspath(path):
+		shutil.copyfile(source_path, path)
+
 def take_video_screenshot(visualization, experiment_series_name):
 	global frame_count
 	path = get_path_with_experiment_series_name(experiment_series_name)
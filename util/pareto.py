@@ -0,0 +1,104 @@
+import numpy as np
+
+
+def dominance_matrix(values, others=None):
+	"""
+	dominates[i, j]: design i of `values` is at least as good as design j of `others` on every
+	objective and better on one. Rows are designs, columns objectives, all maximized.
+	"""
+	others = values if others is None else others
+	at_least_as_good = (values[:, None, :] >= others[None, :, :]).all(axis=2)
+	better = (values[:, None, :] > others[None, :, :]).any(axis=2)
+	return at_least_as_good & better
+
+
+def dominance_ranks(dominates):
+	"""
+	Non-dominated sorting of a dominance matrix: rank 0 is the Pareto front, rank r the front
+	of the designs left once the ranks below r are removed
+	"""
+	ranks = np.full(len(dominates), -1)
+	dominated_by = dominates.sum(axis=0)
+	rank = 0
+	while (ranks < 0).any():
+		front = (ranks < 0) & (dominated_by == 0)
+		ranks[front] = rank
+		dominated_by = dominated_by - dominates[front].sum(axis=0)
+		rank += 1
+	return ranks
+
+
+class ParetoFront:
+	"""
+	Dominance ranks of designs over several objectives, kept up to date as designs are added,
+	changed or removed: only the rows and columns of the dominance matrix of the changed designs
+	are compared again.
+
+	`objectives` are (name, maximize) pairs, a design is {objective name: value}. A missing
+	value (None or NaN) is worse than any other, the design can not dominate on that objective.
+	"""
+
+	def __init__(self, objectives):
+		self.objectives = [name for name, _ in objectives]
+		self._signs = np.array([1.0 if maximize else -1.0 for _, maximize in objectives])
+		self.keys = []
+		self._positions = {}
+		self._values = np.empty((0, len(self.objectives)))
+		self._dominates = np.zeros((0, 0), dtype=bool)
+		self.ranks = np.empty(0, dtype=int)
+
+	def __len__(self):
+		return len(self.keys)
+
+	def __contains__(self, key):
+		return key in self._positions
+
+	def _oriented(self, design):
+		values = np.array([np.nan if design.get(name) is None else design[name] for name in self.objectives], dtype=float)
+		return np.where(np.isnan(values), -np.inf, values * self._signs)
+
+	def update(self, designs):
+		"""Add or replace designs, {key: design}"""
+		if not designs:
+			return
+		changed = []
+		new_rows = []
+		for key, design in designs.items():
+			if key in self._positions:
+				self._values[self._positions[key]] = self._oriented(design)
+				changed.append(self._positions[key])
+			else:
+				self._positions[key] = len(self.keys)
+				changed.append(self._positions[key])
+				new_rows.append(self._oriented(design))
+				self.keys.append(key)
+
+		if new_rows:
+			self._values = np.vstack([self._values, new_rows])
+			size = len(self.keys)
+			dominates = np.zeros((size, size), dtype=bool)
+			dominates[:len(self._dominates), :len(self._dominates)] = self._dominates
+			self._dominates = dominates
+
+		changed = np.array(changed)
+		self._dominates[changed, :] = dominance_matrix(self._values[changed], self._values)
+		self._dominates[:, changed] = dominance_matrix(self._values, self._values[changed])
+		self.ranks = dominance_ranks(self._dominates)
+
+	def remove(self, keys):
+		removed = {self._positions[key] for key in keys if key in self._positions}
+		if not removed:
+			return
+		kept = np.array([position not in removed for position in range(len(self.keys))])
+		self.keys = [key for key, keep in zip(self.keys, kept) if keep]
+		self._positions = {key: position for position, key in enumerate(self.keys)}
+		self._values = self._values[kept]
+		self._dominates = self._dominates[kept][:, kept]
+		self.ranks = dominance_ranks(self._dominates)
+
+	def rank(self, key):
+		return int(self.ranks[self._positions[key]])
+
+	def front(self):
+		"""Keys of the non-dominated designs"""
+		return [key for key, rank in zip(self.keys, self.ranks) if rank == 0]